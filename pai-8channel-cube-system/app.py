@@ -1,14 +1,66 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Dict, List, Literal, MutableMapping, Optional, Any, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+import asyncio
+import base64
+import json
+import os
+import threading
 import time
 import hashlib
+import sys
 import uuid
 
-app = FastAPI(title="PAI 8-Channel -> Meta Cube System (MVP)")
+import numpy as np
+
+try:
+    import orjson  # 선택 의존성 — 있으면 큐브 응답 인코딩에 사용
+except ImportError:
+    orjson = None
+
+import export
+from extractors import ExtractorRegistry
+from jobs import BuildQueue, QueueFull
+from journal import Journal
+from metrics import Registry, SamplingProfiler
+from records import ChannelMeta, RawRecord
+from retention import RetentionManager, RetentionPolicy
+from segmenter import Segmenter, Window, format_ts, parse_ts
+from signals import SIGNAL_EXTRACTORS
+from storage import BlobStore, LRUCache, ShardLocks, hold_exclusive, json_default, open_backend
+from timeline import TimelineRollup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _check_single_worker()
+    # 인덱스 도입 이전의 영속 저장소 — 큐브는 있는데 인덱스가 비어 있으면 한 번 채운다
+    if len(CUBE_INDEX) == 0 and len(CUBE_STORE):
+        for seu_id in CUBE_STORE:
+            _index_cube(seu_id, CUBE_STORE[seu_id])
+    # 보존 정책 힙은 메모리에만 — 영속 역색인에서 다시 만든다
+    RETENTION.rebuild((seu_id, r["policy"], r["at"], r["gen"]) for seu_id, r in
+                      ((k, SEU_RECORDS.get(k)) for k in SEU_RECORDS) if r is not None and not r.get("evicted"))
+    RETENTION.start()
+    if SINGLE_WORKER:
+        SEGMENTER.start()
+    await run_in_threadpool(EXTRACTORS.warm)
+    yield
+    # 열린 윈도는 버리지 않고 봉인해 SEU로 남긴다
+    SEGMENTER.stop()
+    await run_in_threadpool(lambda: _seal_windows(SEGMENTER.flush()))
+    RETENTION.stop()
+    BUILD_QUEUE.shutdown()
+    EXTRACTORS.shutdown()
+    PROFILER.stop()
+    STORE.close()
+
+app = FastAPI(title="PAI 8-Channel -> Meta Cube System (MVP)", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,12 +80,267 @@ CHANNELS = ["CH1", "CH2", "CH3", "CH4", "CH5", "CH6", "CH7", "CH8"]
 # CH7 — User Mode / Context (현재 사용자 모드·세션 컨텍스트)
 # CH8 — Environmental Meta  (온도·조도·소음레벨·공간정보 등 환경 메타)
 
-RAW_STORE:     Dict[str, Dict[str, Any]] = {}
-RAW_BY_SEU:    Dict[str, Dict[str, str]] = {}
-FEATURE_STORE: Dict[str, Dict[str, Any]] = {}
-META_STORE:    Dict[str, Dict[str, Any]] = {}
-CUBE_STORE:    Dict[str, Dict[str, Any]] = {}
-EVENT_BUS:     List[Dict[str, Any]]      = []
+# 저장소 백엔드: PAI_STORE_BACKEND=memory(기본) | sqlite (PAI_STORE_PATH, WAL + LRU 캐시)
+# PAI_SHARED_STATE_DIR를 주면 여러 워커 프로세스가 그 디렉터리의 SQLite 파일과 샤드 잠금 파일을 공유한다
+# — 프로세스별 읽기 캐시는 끄고, 샤드 잠금을 풀 때마다 쓰기를 커밋한다.
+# 메모리 백엔드에 PAI_STATE_DIR를 주면 스냅숏 + 저널로 상태를 남기고, 기동 시(여기서) 스냅숏 + 저널 꼬리로 복구한다
+# — 저널은 PAI_JOURNAL_BATCH건 또는 PAI_JOURNAL_FSYNC_MS마다 fsync, 스냅숏은 PAI_SNAPSHOT_INTERVAL_S초 또는
+#   PAI_SNAPSHOT_RECORDS건마다. 복구 소요 시간·재생 속도는 GET /store/stats의 recovery
+SHARED_STATE_DIR = os.environ.get("PAI_SHARED_STATE_DIR")
+if SHARED_STATE_DIR:
+    os.makedirs(SHARED_STATE_DIR, exist_ok=True)
+# 공유 상태 모드에서도 프로세스 메모리에만 있는 것 — 비동기 빌드 작업 테이블, 스트림 세그먼터의 열린 윈도,
+# 보존 정책 힙(max_seus 계수). 워커가 여럿이면 다른 워커로 간 요청은 그 상태를 보지 못하므로(작업 404, 윈도 분할,
+# 워커별 상한) PAI_SHARED_SINGLE_WORKER=1일 때만 켠다. 그때는 기동 시 상태 디렉터리의 잠금 파일로 워커 하나를 강제한다.
+SINGLE_WORKER = not SHARED_STATE_DIR or os.environ.get("PAI_SHARED_SINGLE_WORKER", "0") == "1"
+_SINGLE_WORKER_LOCK = None
+
+def _check_single_worker() -> None:
+    global _SINGLE_WORKER_LOCK
+    if not SHARED_STATE_DIR:
+        return
+    if not SINGLE_WORKER:
+        bounded = sorted(n for n, p in RETENTION.policies.items() if p.bounded)
+        if bounded:
+            raise RuntimeError(f"retention policies {bounded} keep per-process state; "
+                               "set PAI_SHARED_SINGLE_WORKER=1 and run one worker with PAI_SHARED_STATE_DIR")
+        return
+    if _SINGLE_WORKER_LOCK is None:
+        _SINGLE_WORKER_LOCK = hold_exclusive(os.path.join(SHARED_STATE_DIR, "single-worker.lock"))
+        if _SINGLE_WORKER_LOCK is None:
+            raise RuntimeError("PAI_SHARED_SINGLE_WORKER=1 but another worker already holds "
+                               f"{SHARED_STATE_DIR}/single-worker.lock — run a single worker")
+
+def _require_single_worker(feature: str) -> None:
+    if not SINGLE_WORKER:
+        raise HTTPException(409, detail=f"{feature} keeps per-process state and is disabled with "
+                                        "PAI_SHARED_STATE_DIR; set PAI_SHARED_SINGLE_WORKER=1 and run one worker")
+STORE_KIND = "sqlite" if SHARED_STATE_DIR else os.environ.get("PAI_STORE_BACKEND", "memory")
+STATE_DIR  = os.environ.get("PAI_STATE_DIR") if STORE_KIND == "memory" else None
+STORE = open_backend(STORE_KIND,
+                     os.path.join(SHARED_STATE_DIR, "pai_store.db") if SHARED_STATE_DIR
+                     else os.environ.get("PAI_STORE_PATH", "pai_store.db"),
+                     journal=Journal(STATE_DIR, batch=int(os.environ.get("PAI_JOURNAL_BATCH", "1024")),
+                                     interval=int(os.environ.get("PAI_JOURNAL_FSYNC_MS", "50")) / 1000.0)
+                     if STATE_DIR else None,
+                     snapshot_interval=float(os.environ.get("PAI_SNAPSHOT_INTERVAL_S", "300")),
+                     snapshot_records=int(os.environ.get("PAI_SNAPSHOT_RECORDS", "250000")),
+                     cache_seus=0 if SHARED_STATE_DIR else int(os.environ.get("PAI_STORE_CACHE_SEUS", "1024")),
+                     batch_size=int(os.environ.get("PAI_STORE_BATCH", "256")),
+                     flush_interval=int(os.environ.get("PAI_STORE_FLUSH_MS", "500")) / 1000.0)
+
+# seu_id 해시 샤드별 잠금 — 한 SEU의 복합 쓰기(raw+인덱스, 메타, 큐브)를 직렬화
+SHARDS = ShardLocks(int(os.environ.get("PAI_SHARDS", "64")),
+                    lock_dir=os.path.join(SHARED_STATE_DIR, "locks") if SHARED_STATE_DIR else None,
+                    on_release=STORE.flush)
+
+# 값은 통째로 교체해서 쓴다(중첩 dict 제자리 수정 금지) — 영속 백엔드에서도 쓰기가 반영되도록
+# raw·채널 메타는 __slots__ 레코드(records.py) — SQLite 행은 이전과 같은 JSON 모양
+RAW_STORE:     MutableMapping[str, RawRecord] = STORE.table("raw_store", entries_per_seu=len(CHANNELS), record=RawRecord)
+RAW_BY_SEU:    MutableMapping[str, Dict[str, str]] = STORE.table("raw_by_seu")
+FEATURE_STORE: MutableMapping[str, Dict[str, Any]] = STORE.table("feature_store", entries_per_seu=len(CHANNELS))
+META_STORE:    MutableMapping[str, ChannelMeta] = STORE.table("meta_store", entries_per_seu=len(CHANNELS),
+                                                              record=ChannelMeta)
+CUBE_STORE:    MutableMapping[str, Dict[str, Any]] = STORE.table("cube_store")
+# 큰 raw 페이로드는 내용 주소(sha256) 블롭으로 — 레코드에는 raw_ref="blob://<hash>"만 남는다.
+# PUT /blob으로 스트리밍 업로드하거나, PAI_BLOB_INLINE_MAX자를 넘는 인라인 raw_ref는 등록 시 자동으로 옮긴다.
+BLOB_PREFIX     = "blob://"
+BLOB_INLINE_MAX = int(os.environ.get("PAI_BLOB_INLINE_MAX", "4096"))
+BLOBS = BlobStore(os.path.join(SHARED_STATE_DIR, "blobs") if SHARED_STATE_DIR
+                  else os.environ.get("PAI_BLOB_DIR", "pai_blobs"))
+
+# POST /seu로 받은 device_id·시간 창 (SEU 레지스트리)
+SEU_STORE:     MutableMapping[str, Dict[str, Any]] = STORE.table("seu_store")
+
+# SEU별 역색인 — 이 SEU가 만든 모든 raw_id(대체된 것 포함)·참조한 블롭·보존 정책(policy, at, gen).
+# feature/meta 키는 seu_id::채널, 큐브·SEU 레코드·인덱스는 seu_id로 정해지므로 SEU 하나를 O(1)에 지운다.
+SEU_RECORDS:   MutableMapping[str, Dict[str, Any]] = STORE.table("seu_records")
+# 블롭 참조 수 (raw 레코드 단위) — 마지막 참조가 축출되면 파일을 지운다.
+# 공유 상태 모드에서는 프로세스 사이 참조 수를 맞출 수 없어 세지도 지우지도 않는다.
+BLOB_REFS:     MutableMapping[str, int] = STORE.table("blob_refs")
+BLOB_GC        = not SHARED_STATE_DIR
+BLOB_REFS_LOCK = threading.Lock()
+
+# 큐브 보조 인덱스 — (ts_start, seu_id) 정렬, device_id·cognitive_mode 및 그 조합별. 큐브 저장 시 갱신
+CUBE_INDEX = STORE.index("cube_index", ("device_id", "cognitive_mode"))
+# 디바이스별 타임라인 롤업 상태 (timeline.TimelineRollup)
+DEVICE_TIMELINE: MutableMapping[str, Dict[str, Any]] = STORE.table("device_timeline")
+
+# 디바이스 잠금 — 여러 SEU가 한 디바이스 상태를 갱신. 항상 SEU 샤드 잠금 안쪽에서만 잡는다(순서 고정 → 교착 없음)
+DEVICE_LOCKS = ShardLocks(int(os.environ.get("PAI_SHARDS", "64")),
+                          lock_dir=os.path.join(SHARED_STATE_DIR, "device_locks") if SHARED_STATE_DIR else None,
+                          on_release=STORE.flush)
+
+
+# ── 이벤트 버스 ──────────────────────────────
+class EventBus:
+    """
+    고정 용량 링 버퍼 이벤트 버스.
+    이벤트마다 단조 증가 seq를 부여하고, 용량을 넘으면 가장 오래된 이벤트를 덮어쓴다(dropped).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.dropped  = 0
+        self._buf: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._next = 1
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def first_seq(self) -> int:
+        return max(1, self._next - self.capacity)
+
+    @property
+    def last_seq(self) -> int:
+        return self._next - 1
+
+    def __len__(self) -> int:
+        return self._next - self.first_seq
+
+    def append(self, event: Dict[str, Any]) -> int:
+        with self._lock:
+            seq = self._next
+            if seq > self.capacity:
+                self.dropped += 1
+            event["seq"] = seq
+            self._buf[seq % self.capacity] = event
+            self._next = seq + 1
+            waiters, self._waiters = self._waiters, []
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:  # 구독 루프가 이미 닫힘
+                pass
+        return seq
+
+    def _at(self, seq: int) -> Optional[Dict[str, Any]]:
+        # 복구 뒤에는 빈 seq가 있을 수 있다(크래시로 저널에 못 내려간 이벤트) — 빈 칸·이전 바퀴 이벤트는 None
+        event = self._buf[seq % self.capacity]
+        return event if event is not None and event["seq"] == seq else None
+
+    def read(self, after: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        after 다음 seq부터 최대 limit개. 버퍼에서 밀려나 읽을 수 없는 개수를 함께 반환.
+        빈 seq는 앞쪽이면 missed에 더하고, 이벤트 뒤면 거기서 끊는다 — missed는 항상 반환 이벤트 앞의 구간이다.
+        """
+        with self._lock:
+            start  = max(after + 1, self.first_seq)
+            missed = start - (after + 1)
+            end    = min(self._next, start + max(limit, 0))
+            events: List[Dict[str, Any]] = []
+            for s in range(start, end):
+                event = self._at(s)
+                if event is not None:
+                    events.append(event)
+                elif events:
+                    break
+                else:
+                    missed += 1
+            return events, missed
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            start  = max(self.first_seq, self._next - max(limit, 0))
+            events = (self._at(s) for s in range(start, self._next))
+            return [e for e in events if e is not None]
+
+    async def wait(self, after: int, timeout: float) -> bool:
+        """after 이후 이벤트가 생길 때까지 대기 — 타임아웃이면 False."""
+        loop  = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        with self._lock:
+            if self._next - 1 > after:
+                return True
+            self._waiters.append((loop, ready))
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if (loop, ready) in self._waiters:
+                    self._waiters.remove((loop, ready))
+
+    # ── 스냅숏·저널 (STORE.register_state) ──
+    def dump(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"next": self._next, "events": [self._buf[s % self.capacity]
+                                                   for s in range(self.first_seq, self._next)]}
+
+    def load(self, state: Dict[str, Any]) -> None:
+        for event in state["events"]:
+            self.restore(event)
+        with self._lock:
+            self._next   = max(self._next, state["next"])
+            self.dropped = max(0, self._next - 1 - self.capacity)
+
+    def restore(self, event: Dict[str, Any]) -> None:
+        # 저널 재생 — seq 자리에 넣는다. emit()은 seq 부여(버스 잠금)와 저널 기록(STORE 잠금)이 따로라
+        # 동시 emit이면 저널 순서가 seq 순서와 다를 수 있다. 창(최근 capacity개) 밖으로 밀려난 것만 버린다
+        with self._lock:
+            seq   = event["seq"]
+            nxt   = max(self._next, seq + 1)
+            if seq < nxt - self.capacity:
+                return
+            self._buf[seq % self.capacity] = event
+            self._next   = nxt
+            self.dropped = max(0, nxt - 1 - self.capacity)
+
+    def stats(self) -> Dict[str, int]:
+        return {"capacity": self.capacity, "size": len(self), "first_seq": self.first_seq,
+                "last_seq": self.last_seq, "dropped": self.dropped}
+
+
+EVENT_BUS = EventBus(int(os.environ.get("PAI_EVENT_BUS_CAPACITY", "10000")))
+STORE.register_state("events", EVENT_BUS.dump, EVENT_BUS.load, EVENT_BUS.restore)
+
+
+# ── 계측 (/metrics) ───────────────────────────
+# 라벨별 히스토그램은 미리 꺼내 두고 핫패스에서는 perf_counter 차이만 observe 한다.
+# 1단계(extract_signal)는 채널별 pai_extract_seconds, 2~5단계는 pai_stage_seconds{stage}.
+METRICS = Registry()
+STAGE_SECONDS   = METRICS.histogram("pai_stage_seconds", "Pipeline stage latency in seconds", ("stage",))
+EXTRACT_SECONDS = METRICS.histogram("pai_extract_seconds", "Per-channel extract_signal latency in seconds", ("channel",))
+SIGNAL_TYPES    = METRICS.counter("pai_signal_type", "Extracted signals by channel and signal_type",
+                                  ("channel", "signal_type"))
+COGNITIVE_MODES = METRICS.counter("pai_cognitive_mode", "Cubes written by cognitive_mode", ("mode",))
+EXTRACT_FALLBACKS = METRICS.counter("pai_extractor_fallback", "Extractions that fell back to the keyword heuristic",
+                                    ("channel", "reason"))
+_STAGE   = {s: STAGE_SECONDS.labels(s) for s in ("meta", "axes", "mode", "cube", "emit")}
+_EXTRACT = {ch: EXTRACT_SECONDS.labels(ch) for ch in CHANNELS}
+
+# 저장소 크기는 스크레이프 시점에 읽는다
+METRICS.gauge("pai_store_entries", "Entries per store", ("store",), lambda: {
+    ("raw",): len(RAW_STORE), ("feature",): len(FEATURE_STORE),
+    ("meta",): len(META_STORE), ("cube",): len(CUBE_STORE)})
+METRICS.gauge("pai_event_bus", "Event bus ring buffer state", ("field",), lambda: {
+    ("size",): len(EVENT_BUS), ("capacity",): EVENT_BUS.capacity,
+    ("last_seq",): EVENT_BUS.last_seq, ("dropped",): EVENT_BUS.dropped})
+METRICS.gauge("pai_memo_entries", "Signal/meta memo cache size", ("memo",), lambda: {
+    ("signal",): len(SIGNAL_MEMO), ("meta",): len(META_MEMO)})
+METRICS.gauge("pai_build_queue", "Async cube build queue state", ("field",), lambda: {
+    (k,): v for k, v in BUILD_QUEUE.stats().items()})
+METRICS.gauge("pai_segmenter", "Streaming segmenter frames, windows and seals", ("field",), lambda: {
+    (k,): v for k, v in SEGMENTER.stats().items() if k not in ("mode", "carry")})
+METRICS.gauge("pai_retention_evicted", "SEUs evicted by retention policy and reason", ("policy", "reason"),
+              lambda: {(p, r): n for (p, r), n in RETENTION.evicted.items()})
+METRICS.gauge("pai_retention_reclaimed_bytes", "Bytes reclaimed by retention eviction per store", ("store",),
+              lambda: {(st,): n for st, n in RETENTION.reclaimed.items()})
+METRICS.gauge("pai_journal", "Journal, snapshot and startup recovery state (memory backend with PAI_STATE_DIR)",
+              ("section", "field"), lambda: {
+    (sec, k): v for sec in ("journal", "snapshot", "recovery")
+    for k, v in (STORE.stats().get(sec) or {}).items() if isinstance(v, (int, float)) and not isinstance(v, bool)})
+METRICS.gauge("pai_shard_lock_contended", "Shard lock acquisitions that had to wait", (), lambda: {
+    (): SHARDS.contended})
+
+# 샘플링 프로파일러 — PAI_PROFILE_INTERVAL_MS>0이면 기동 시 켜고, POST /metrics/profiler로 켜고 끈다
+PROFILER = SamplingProfiler(os.path.dirname(os.path.abspath(__file__)))
+METRICS.gauge("pai_profile_samples", "Sampling profiler hits per function (innermost frame in this package)",
+              ("frame",), lambda: {(f,): n for f, n in PROFILER.snapshot()})
+if int(os.environ.get("PAI_PROFILE_INTERVAL_MS", "0")) > 0:
+    PROFILER.start(int(os.environ["PAI_PROFILE_INTERVAL_MS"]) / 1000.0)
 
 
 # ── 유틸 ─────────────────────────────────────
@@ -50,10 +357,19 @@ def ensure_seu(seu_id: str) -> None:
     if seu_id not in RAW_BY_SEU:
         RAW_BY_SEU[seu_id] = {}
 
+def blob_hash(raw_ref: str) -> Optional[str]:
+    return raw_ref[len(BLOB_PREFIX):] if raw_ref.startswith(BLOB_PREFIX) else None
+
+def raw_text(raw: RawRecord, limit: Optional[int] = None) -> str:
+    # 블롭 raw는 mmap 버퍼에서 디코드 (limit: 앞부분 바이트 수만)
+    ref = raw.raw_ref
+    h   = blob_hash(ref)
+    return ref if h is None else BLOBS.read_text(h, limit)
+
 def all_channels_present(seu_id: str) -> bool:
     return all(ch in RAW_BY_SEU.get(seu_id, {}) for ch in CHANNELS)
 
-def get_raw(seu_id: str, channel_id: str) -> Dict[str, Any]:
+def get_raw(seu_id: str, channel_id: str) -> RawRecord:
     raw_id = RAW_BY_SEU.get(seu_id, {}).get(channel_id)
     if not raw_id:
         raise HTTPException(404, detail=f"missing raw for {channel_id}")
@@ -61,25 +377,7 @@ def get_raw(seu_id: str, channel_id: str) -> Dict[str, Any]:
 
 
 # ── 1단계: 원신호 분석 ────────────────────────
-POSITIVE_KW = ["기대","활기","만족","편안","집중","몰입","호기심","즐거움","에너지","가볍",
-               "ready","focus","calm","satisfied","curious","energized","positive","motivated"]
-NEGATIVE_KW = ["긴장","피로","불안","스트레스","부담","어려움","혼란",
-               "tension","stress","fatigue","anxiety","tired","overwhelmed","nervous"]
-HIGH_INTENT_KW = ["완수","달성","목표","핵심","실행","완료","중요","전략",
-                  "achieve","complete","goal","critical","execute","strategy","key","priority"]
-SOCIAL_KW = ["팀","동료","회의","대화","협력","공유","눈인사","반응","함께",
-             "team","colleague","meeting","conversation","collaborate","share","together"]
-RELAX_KW  = ["이완","휴식","편안","가볍","회복","rest","relax","recover","comfortable","calm"]
-TENSE_KW  = ["긴장","바른","유지","집중","upright","tense","maintain","alert","posture"]
-
-def score_kw(text: str, pos: List[str], neg: List[str], default: float = 0.5) -> float:
-    t = text.lower()
-    p = sum(1 for kw in pos if kw in t)
-    n = sum(1 for kw in neg if kw in t)
-    if p + n == 0:
-        return round(min(len(t) / 30.0, 1.0) * 0.3 + default * 0.7, 3)
-    return round(min((p / (p + n)) * 0.6 + 0.4, 1.0), 3)
-
+# 채널 휴리스틱은 signals.py — import 부작용이 없어 프로세스 풀 워커가 app.py(STORE·저널·스레드)를 다시 읽지 않는다
 def extract_signal(ch: str, raw_ref: str) -> Dict[str, Any]:
     """
     백서 #06 기준 채널 정의:
@@ -87,206 +385,152 @@ def extract_signal(ch: str, raw_ref: str) -> Dict[str, Any]:
     CH4: Biometric     CH5: Text Input    CH6: Device Interactions
     CH7: Metadata      CH8: Environmental Attributes
     """
-    import re as _re
-    t = raw_ref.strip()
-    tl = t.lower()
-
-    if ch == "CH1":  # Video Frames - 시각 장면 복잡도
-        scene_kw = ["rgb","depth","조명","lighting","화면","screen","창","window","밝","bright","어두","dark","카페","cafe","사무실"]
-        richness = sum(1 for k in scene_kw if k in tl)
-        act = min(0.3 + richness * 0.08 + len(t)/100.0 * 0.3, 1.0)
-        stype = "scene_complex" if richness > 3 else ("scene_moderate" if richness > 1 else "scene_sparse")
-
-    elif ch == "CH2":  # Audio Stream - 음향 분류
-        if any(k in tl for k in ["음악","music","jazz","bgm","melody","재즈"]):
-            act, stype = 0.65, "music"
-        elif any(k in tl for k in ["목소리","voice","발표","speaker","대화","conversation","다수","multiple"]):
-            act, stype = 0.85, "speech_active"
-        elif any(k in tl for k in ["방송","announcement","안내"]):
-            act, stype = 0.55, "broadcast"
-        elif any(k in tl for k in ["조용","quiet","silent","silence","없음","none"]):
-            act, stype = 0.05, "silent"
-        else:
-            db_m = _re.search(r"(\d+)\s*db", tl)
-            if db_m:
-                db = int(db_m.group(1))
-                act = min(db / 100.0, 1.0)
-                stype = "noise_high" if db > 65 else ("noise_moderate" if db > 45 else "noise_low")
-            else:
-                act, stype = 0.40, "ambient"
-
-    elif ch == "CH3":  # Spatial-Temporal - 이동성
-        moving_kw = ["이동","moving","subway","지하철","walking","걷","bus","버스","train","이동 중"]
-        static_kw = ["카페","cafe","사무실","office","자택","home","거실","회의실","meeting room"]
-        if any(k in tl for k in moving_kw):
-            act, stype = 0.80, "mobile"
-        elif any(k in tl for k in static_kw):
-            act, stype = 0.30, "static_indoor"
-        else:
-            gps = _re.search(r"\d+\.\d+\s*,\s*\d+\.\d+", tl)
-            act = 0.60 if gps else 0.40
-            stype = "gps_fixed" if gps else "spatial_general"
-
-    elif ch == "CH4":  # Biometric - 생리적 각성
-        hr_m = _re.search(r"(\d+)\s*bpm", tl)
-        if hr_m:
-            hr = int(hr_m.group(1))
-            if hr < 65:   act, stype = 0.20, "bio_resting"
-            elif hr < 75: act, stype = 0.45, "bio_calm"
-            elif hr < 85: act, stype = 0.70, "bio_focused"
-            else:         act, stype = 0.90, "bio_aroused"
-        else:
-            relax_kw = ["이완","relax","편안","comfortable","무거","heavy"]
-            tense_kw = ["긴장","tense","활발","active","alert","응시"]
-            if any(k in tl for k in relax_kw):   act, stype = 0.20, "bio_relaxed"
-            elif any(k in tl for k in tense_kw): act, stype = 0.75, "bio_alert"
-            else:                                 act, stype = 0.50, "bio_neutral"
-
-    elif ch == "CH5":  # Text Input - 언어 의미 신호
-        if not t or "(none)" in tl or "(없음)" in tl or "(입력 없음)" in tl:
-            act, stype = 0.0, "text_absent"
-        else:
-            act = score_kw(t, HIGH_INTENT_KW, [], 0.5)
-            stype = "text_task" if act > 0.6 else ("text_note" if len(t) > 10 else "text_brief")
-
-    elif ch == "CH6":  # Device Interactions - 상호작용 강도
-        min_m = _re.search(r"(\d+)\s*(분|min)", tl)
-        sec_m = _re.search(r"(\d+)\s*(초|sec\b)", tl)
-        if any(k in tl for k in ["없음","none","터치 없","no touch","idle"]):
-            act, stype = 0.05, "device_idle"
-        elif min_m:
-            mins = int(min_m.group(1))
-            act = min(0.3 + mins/20.0, 1.0)
-            stype = "device_sustained"
-        elif sec_m:
-            secs = int(sec_m.group(1))
-            act = min(0.2 + secs/60.0, 0.8)
-            stype = "device_brief"
-        else:
-            act = min(len(t) / 40.0, 1.0) * 0.5 + 0.2
-            stype = "device_active"
-
-    elif ch == "CH7":  # User Mode / Context — 현재 사용자 상태·모드 (가장 직접적 신호)
-        if any(k in tl for k in ["회복","recovery","휴식","rest","이완 모드","recovery mode","쉬는","쉬고","쉼"]):
-            act, stype = 0.92, "mode_recovery"
-        elif any(k in tl for k in ["학습","study","learn","공부","이해","지식","읽으며","정리 중"]):
-            act, stype = 0.88, "mode_learning"
-        elif any(k in tl for k in ["집중","focus","deep","깊은","몰입","완전 집중"]):
-            act, stype = 0.88, "mode_focus"
-        elif any(k in tl for k in ["회의","meeting","발표","presentation","토론","discussion","논의"]):
-            act, stype = 0.85, "mode_social"
-        elif any(k in tl for k in ["완수","달성","목표","goal","실행","execute","완료","complete","업무 완수","핵심"]):
-            act, stype = 0.85, "mode_task"
-        elif any(k in tl for k in ["출근","commute","이동","transit","준비","prepare","가는","향하는"]):
-            act, stype = 0.72, "mode_transit"
-        else:
-            act = score_kw(t, HIGH_INTENT_KW + POSITIVE_KW, NEGATIVE_KW, 0.5)
-            stype = "mode_general"
-
-    elif ch == "CH8":  # Environmental Attributes - 환경 적합성
-        lux_m  = _re.search(r"(\d+)\s*lux", tl)
-        db_m   = _re.search(r"(\d+)\s*db", tl)
-        temp_m = _re.search(r"(\d+)\s*[°c℃]", tl)
-        score = 0.5
-        if lux_m:
-            lux = int(lux_m.group(1))
-            score += 0.15 if 200 <= lux <= 600 else -0.10
-        if db_m:
-            db = int(db_m.group(1))
-            score += 0.20 if db < 45 else (0.0 if db < 65 else -0.15)
-        if temp_m:
-            temp = int(temp_m.group(1))
-            score += 0.10 if 18 <= temp <= 24 else -0.05
-        act = round(max(0.1, min(score, 1.0)), 3)
-        stype = "env_optimal" if act > 0.7 else ("env_moderate" if act > 0.4 else "env_suboptimal")
-    else:
-        act, stype = 0.50, "unknown"
-
+    t0 = time.perf_counter()
+    t  = raw_ref.strip()
+    fn = SIGNAL_EXTRACTORS.get(ch)
+    act, stype = fn(t, t.lower()) if fn else (0.50, "unknown")
+    if fn:
+        _EXTRACT[ch].observe(time.perf_counter() - t0)
     return {"activation": round(act, 3), "signal_type": stype, "raw": t}
 
+# 추출기 레지스트리 — 기본은 signals.py의 휴리스틱(inline). PAI_EXTRACTORS로 채널별 추출기·정책·타임아웃을 바꾼다:
+#   PAI_EXTRACTORS="CH1=pkg.video:extract@process:2.5,CH2=pkg.audio:extract@thread:1"
+# 풀 작업이 타임아웃·예외면 그 채널의 휴리스틱으로 대신한다.
+EXTRACTORS = ExtractorRegistry(SIGNAL_EXTRACTORS,
+                               threads=int(os.environ.get("PAI_EXTRACT_THREADS", "8")),
+                               processes=int(os.environ.get("PAI_EXTRACT_PROCESSES", "2")),
+                               mp_context=os.environ.get("PAI_EXTRACT_MP_CONTEXT", "spawn"),
+                               default_timeout=float(os.environ.get("PAI_EXTRACT_TIMEOUT", "5.0")))
+EXTRACTORS.load_spec(os.environ.get("PAI_EXTRACTORS", ""))
+
+def extract_signals(jobs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """[(channel, 원문)] → signal 목록. 채널들을 레지스트리 정책대로 동시에 추출한다."""
+    texts = [(ch, raw_ref.strip()) for ch, raw_ref in jobs]
+    out   = []
+    for (ch, t), ((act, stype), fallback, secs) in zip(texts, EXTRACTORS.run_many(texts)):
+        _EXTRACT[ch].observe(secs)
+        sig = {"activation": round(act, 3), "signal_type": stype, "raw": t}
+        if fallback:
+            EXTRACT_FALLBACKS.labels(ch, fallback).inc()
+            sig["fallback"] = fallback
+        out.append(sig)
+    return out
+
 
-def build_features_from_raw(raw: Dict[str, Any]) -> Dict[str, Any]:
-    signal = extract_signal(raw["channel_id"], raw.get("raw_ref", ""))
+# ── 2단계: 채널 메타 (raw_ref 기준 메모) ─────
+# 같은 (channel_id, raw_ref) 페이로드는 추출·메타 생성을 건너뛴다. 키는 서버가 실제로 읽는 값 —
+# 인라인이면 원문 자체, 블롭이면 서버가 검증한 내용 주소(blob://sha256). 클라이언트가 보낸 raw_hash는 검증하지 않으므로
+# 키로 쓰지 않는다(다른 SEU의 signal·원문이 돌아갈 수 있다). 메타는 evidence에 raw_hash를 실으므로 메타 키에만 더한다.
+# 캐시된 signal/meta dict는 여러 SEU가 공유하므로 제자리 수정 금지.
+MEMO_SIZE   = int(os.environ.get("PAI_MEMO_SIZE", "4096"))
+SIGNAL_MEMO = LRUCache(MEMO_SIZE)
+META_MEMO   = LRUCache(MEMO_SIZE)
+
+def _signal_memo_key(raw: RawRecord) -> Tuple[str, str]:
+    return raw.channel_id, raw.raw_ref
+
+def _meta_memo_key(channel_id: str, raw_ref: str, raw_hash: Optional[str]) -> Tuple[str, str, Optional[str]]:
+    return channel_id, raw_ref, raw_hash
+
+def signals_for_raws(raws: List[RawRecord]) -> List[Dict[str, Any]]:
+    # 메모에 없는 raw만 모아 한 번에(동시에) 추출. 휴리스틱으로 대체된 결과는 메모하지 않는다(다음에 재시도)
+    keys    = [_signal_memo_key(r) for r in raws]
+    signals = [SIGNAL_MEMO.get(k) for k in keys]
+    misses  = [n for n, sig in enumerate(signals) if sig is None]
+    if misses:
+        fresh = extract_signals([(raws[n].channel_id, raw_text(raws[n])) for n in misses])
+        for n, sig in zip(misses, fresh):
+            if raws[n].raw_ref.startswith(BLOB_PREFIX):  # 원문 사본 대신 블롭 참조만 보관
+                sig = {**sig, "raw": raws[n].raw_ref}
+            if "fallback" not in sig:
+                SIGNAL_MEMO.put(keys[n], sig)
+            signals[n] = sig
+    return signals
+
+def build_features_from_raw(raw: RawRecord, signal: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if signal is None:
+        signal = signals_for_raws([raw])[0]
+    SIGNAL_TYPES.labels(raw.channel_id, signal["signal_type"]).inc()
     return {
-        "feature_ref":   f"feature://{raw['channel_id']}/{raw['seu_id']}",
-        "raw_ref":       raw["raw_ref"],
-        "raw_hash":      raw["raw_hash"],
-        "quality_flags": raw.get("quality_flags", []),
+        "feature_ref":   f"feature://{raw.channel_id}/{raw.seu_id}",
+        "raw_ref":       raw.raw_ref,
+        "raw_hash":      raw.raw_hash,
+        "quality_flags": raw.quality_flags,
         "signal":        signal,
     }
 
-def build_channel_meta(channel_id: str, features: Dict[str, Any]) -> Dict[str, Any]:
+def build_channel_meta(channel_id: str, features: Dict[str, Any]) -> ChannelMeta:
+    t0       = time.perf_counter()
+    memo_key = _meta_memo_key(channel_id, features["raw_ref"], features.get("raw_hash"))
+    memoable = memo_key[2] and "fallback" not in features.get("signal", {})
+    meta     = META_MEMO.get(memo_key) if memoable else None
+    if meta is None:
+        meta = _channel_meta(channel_id, features)
+        if memoable:
+            META_MEMO.put(memo_key, meta)
+    _STAGE["meta"].observe(time.perf_counter() - t0)
+    return meta
+
+def _channel_meta(channel_id: str, features: Dict[str, Any]) -> ChannelMeta:
+    # summary·source_channels·evidence_refs는 ChannelMeta가 필드에서 만든다
     sig  = features.get("signal", {})
     act  = sig.get("activation", 0.5)
     stype = sig.get("signal_type", "unknown")
     conf = round(act * 0.7 + 0.3 * (0.8 if stype != "unknown" else 0.4), 3)
-    return {
-        "channel_id":    channel_id,
-        "confidence":    conf,
-        "activation":    act,
-        "signal_type":   stype,
-        "summary":       f"{channel_id}:{stype}@{act:.2f}",
-        "source_channels": [channel_id],
-        "evidence_refs": [
-            {"kind": "raw_ref",    "ref": features["raw_ref"]},
-            {"kind": "raw_hash",   "ref": features["raw_hash"]},
-            {"kind": "signal",     "ref": stype},
-            {"kind": "activation", "ref": str(act)},
-        ],
-    }
+    return ChannelMeta(channel_id, conf, act, stype, features["raw_ref"], features["raw_hash"])
 
 def merge_evidence(metas: Dict, ch_list: List[str]) -> List[Dict]:
     out = []
     for ch in ch_list:
-        out.extend(metas[ch].get("evidence_refs", []))
+        out.extend(metas[ch].evidence_refs)
     return out
 
 
 # ── 3단계: T·C·I·E 축 합성 ───────────────────
-def syn_t(t_raw: Dict) -> Dict:
+def syn_t(t_raw: RawRecord) -> Dict:
     return {
-        "ts_start":    t_raw.get("ts_start", ""),
-        "ts_end":      t_raw.get("ts_end", ""),
-        "duration_ms": t_raw.get("extra", {}).get("duration_ms"),
-        "value":       t_raw.get("ts_start", "")[:19],
+        "ts_start":    t_raw.ts_start,
+        "ts_end":      t_raw.ts_end,
+        "duration_ms": t_raw.extra.get("duration_ms"),
+        "value":       t_raw.ts_start[:19],
     }
 
 def syn_c(metas: Dict, raws: Dict) -> Dict:
     srcs = ["CH1","CH6","CH8"]
     v1   = raws.get("CH1","")[:15]
-    m8   = metas["CH8"]["signal_type"]
+    m8   = metas["CH8"].signal_type
     ctx  = []
     if v1:    ctx.append(v1)
-    if "social"    in metas["CH6"]["signal_type"]: ctx.append("social")
+    if "social"    in metas["CH6"].signal_type: ctx.append("social")
     if "focus"     in m8: ctx.append("focus-context")
     elif "recovery" in m8: ctx.append("rest-context")
     elif "learning" in m8: ctx.append("learning-context")
     return {
         "value":           " | ".join(ctx) if ctx else "ambient-context",
-        "confidence":      round(sum(metas[c]["confidence"] for c in srcs)/3, 3),
+        "confidence":      round(sum(metas[c].confidence for c in srcs)/3, 3),
         "source_channels": srcs,
         "evidence_refs":   merge_evidence(metas, srcs),
     }
 
 def syn_i(metas: Dict, raws: Dict) -> Dict:
     srcs    = ["CH3","CH7","CH2"]
-    ia      = metas["CH7"]["activation"]
-    la      = metas["CH3"]["activation"]
+    ia      = metas["CH7"].activation
+    la      = metas["CH3"].activation
     combined = round(ia*0.6 + la*0.4, 3)
     level   = "high-intent" if combined > 0.7 else ("moderate-intent" if combined > 0.5 else "low-intent")
     raw7    = raws.get("CH7","")[:20]
     return {
         "value":           f"{level}: {raw7}" if raw7 else level,
         "intensity":       combined,
-        "confidence":      round(sum(metas[c]["confidence"] for c in srcs)/3, 3),
+        "confidence":      round(sum(metas[c].confidence for c in srcs)/3, 3),
         "source_channels": srcs,
         "evidence_refs":   merge_evidence(metas, srcs),
     }
 
 def syn_e(metas: Dict, raws: Dict) -> Dict:
     srcs    = ["CH4","CH5"]
-    valence = metas["CH4"]["activation"]
-    body    = metas["CH5"]["signal_type"]
+    valence = metas["CH4"].activation
+    body    = metas["CH5"].signal_type
     if   valence > 0.7 and "relax" in body: label = "calm-positive"
     elif valence > 0.7:                      label = "energized-positive"
     elif valence > 0.5:                      label = "mild-positive"
@@ -298,7 +542,7 @@ def syn_e(metas: Dict, raws: Dict) -> Dict:
         "value":           f"{label}: {raw4}" if raw4 else label,
         "valence":         round(valence, 3),
         "body_state":      body,
-        "confidence":      round(sum(metas[c]["confidence"] for c in srcs)/2, 3),
+        "confidence":      round(sum(metas[c].confidence for c in srcs)/2, 3),
         "source_channels": srcs,
         "evidence_refs":   merge_evidence(metas, srcs),
     }
@@ -315,83 +559,162 @@ MODES = {
     "ambient":        {"label": "Ambient",         "label_ko": "배경 모드",   "color": "#3A5060"},
 }
 
-def synthesize_m(t, c, i, e, metas, raws) -> Dict:
-    act = {ch: metas[ch]["activation"]  for ch in CHANNELS}
-    sig = {ch: metas[ch]["signal_type"] for ch in CHANNELS}
-
-    intent  = i.get("intensity", 0.5)
-    valence = e.get("valence",   0.5)
-    m8      = sig["CH8"]
-    audio   = sig["CH2"]
-    # 환경 조용함 여부 (CH8 환경 + CH2 음성)
-    db_quiet = act["CH8"] > 0.5 or "silent" in audio or "music" in audio
-
-    # CH7 = User Mode (가장 직접적인 사용자 모드 신호)
-    ch7 = sig["CH7"]
-    is_recovery = "recovery" in ch7
-    is_learning  = "learning" in ch7
-    is_focus     = "focus"    in ch7
-    is_social    = "social"   in ch7
-    is_task      = "task"     in ch7
-    is_transit   = "transit"  in ch7
-    ch7_known    = any([is_recovery, is_learning, is_focus, is_social, is_task, is_transit])
-
-    # 백서 #06 기준: CH7(사용자모드)=1차 결정자, 나머지 7채널=보조 신호
-    # CH7이 명확할수록 해당 모드에 압도적 가중치
-    scores: Dict[str, float] = {
-        # 깊은 집중: CH7=focus(1차) + CH4생체각성 + CH6기기지속 + CH5텍스트 + CH3정적
-        "deep_focus":     (0.92 if is_focus else 0.0 if is_recovery else 0.08) * 0.55
-            + act["CH4"]*0.15 + act["CH6"]*0.15 + act["CH5"]*0.10 + (1-act["CH3"])*0.05,
-        # 사회 활성: CH7=social(1차) + CH2음성 + CH6기기
-        "active_social":  (0.92 if is_social else 0.0 if is_recovery else 0.08) * 0.55
-            + (0.85 if "speech" in audio else 0.1)*0.25 + act["CH6"]*0.20,
-        # 학습: CH7=learning(1차) + CH5텍스트 + CH1영상 + CH3정적
-        "learning":       (0.92 if is_learning else 0.0 if is_recovery else 0.08) * 0.55
-            + act["CH5"]*0.20 + act["CH1"]*0.15 + (1-act["CH3"])*0.10,
-        # 휴식·회복: CH7=recovery(1차) + CH4이완 + CH2음악/무음 + CH6비활성
-        "rest_recovery":  (0.92 if is_recovery else 0.0 if ch7_known else 0.08) * 0.55
-            + (1-act["CH4"])*0.20 + (0.85 if "music" in audio or "silent" in audio else 0.1)*0.15 + (1-act["CH6"])*0.10,
-        # 과제 실행: CH7=task(1차) + CH5텍스트 + CH6기기
-        "task_execution": (0.92 if is_task else 0.0 if is_recovery else 0.08) * 0.55
-            + act["CH5"]*0.25 + act["CH6"]*0.20,
-        # 경계 대기: CH4고각성 + CH8환경불량 + CH3이동 (CH7 미지정 시)
-        "alert_standby":  (0.0 if ch7_known else 1.0) * (
-            act["CH4"]*0.40 + (1-act["CH8"])*0.35 + (0.8 if "mobile" in sig["CH3"] else 0.1)*0.25),
-        # 배경: CH7 미지정 + 전체 활성 낮음
-        "ambient":        (0.0 if ch7_known else 1.0) *
-            max(0.0, 0.55 - sum(act.values())/len(act)) * 1.5,
-    }
-
-    best  = max(scores, key=lambda k: scores[k])
-    info  = MODES[best]
-    avg_a = sum(act.values()) / len(act)
-
-    # 한/영 서술 생성
-    narr  = _narrative(best, act, sig, intent, valence)
+MODE_KEYS = list(MODES)
+
+# 모드 점수 = CH7 1차 결정항 + 가중치 행렬(특징 × 모드) · 특징 행렬(N × 특징)
+# 특징: CH1..CH8 활성, 반전 활성(1-x), 신호형 마스크가 고른 수준값(음성 / 음악·무음 / 이동)
+MODE_FEATURES = CHANNELS + ["inv_CH3", "inv_CH4", "inv_CH6", "inv_CH8", "speech", "calm_audio", "mobile"]
+_MODE_TERMS: Dict[str, Dict[str, float]] = {
+    # 깊은 집중: CH4생체각성 + CH6기기지속 + CH5텍스트 + CH3정적
+    "deep_focus":     {"CH4": 0.15, "CH6": 0.15, "CH5": 0.10, "inv_CH3": 0.05},
+    # 사회 활성: CH2음성 + CH6기기
+    "active_social":  {"speech": 0.25, "CH6": 0.20},
+    # 학습: CH5텍스트 + CH1영상 + CH3정적
+    "learning":       {"CH5": 0.20, "CH1": 0.15, "inv_CH3": 0.10},
+    # 휴식·회복: CH4이완 + CH2음악/무음 + CH6비활성
+    "rest_recovery":  {"inv_CH4": 0.20, "calm_audio": 0.15, "inv_CH6": 0.10},
+    # 과제 실행: CH5텍스트 + CH6기기
+    "task_execution": {"CH5": 0.25, "CH6": 0.20},
+    # 경계 대기: CH4고각성 + CH8환경불량 + CH3이동 (CH7 미지정 시에만)
+    "alert_standby":  {"CH4": 0.40, "inv_CH8": 0.35, "mobile": 0.25},
+    # 배경: 선형항 없음 — CH7 미지정 + 평균 활성 기반 (score_modes 참고)
+    "ambient":        {},
+}
+MODE_WEIGHTS = np.array([[_MODE_TERMS[m].get(f, 0.0) for m in MODE_KEYS] for f in MODE_FEATURES])
+# 행렬곱 대신 모드별 항을 정의 순서대로 누적 → 스칼라 계산과 비트 단위로 같은 결과
+_MODE_TERM_IDX = [[(MODE_FEATURES.index(f), float(MODE_WEIGHTS[MODE_FEATURES.index(f), j])) for f in _MODE_TERMS[m]]
+                  for j, m in enumerate(MODE_KEYS)]
+
+# CH7 1차 결정항: 자기 모드면 0.92, 차단 조건(회복 / 회복 모드는 CH7 지정)이면 0.0, 아니면 0.08 (× 0.55)
+CH7_FLAGS = ["recovery", "learning", "focus", "social", "task", "transit"]
+_CH7_OWN  = {"deep_focus": "focus", "active_social": "social", "learning": "learning",
+             "rest_recovery": "recovery", "task_execution": "task"}
+_CH7_OWN_MODES = [MODE_KEYS.index(m) for m in _CH7_OWN]
+_CH7_OWN_COLS  = [len(MODE_FEATURES) + CH7_FLAGS.index(f) for f in _CH7_OWN.values()]
+_ALERT, _AMBIENT, _REST = (MODE_KEYS.index(m) for m in ("alert_standby", "ambient", "rest_recovery"))
+_RECOVERY_IDX = len(MODE_FEATURES) + CH7_FLAGS.index("recovery")
+
+
+def _mode_row(metas: Dict[str, Dict]) -> List[float]:
+    act   = [metas[ch].activation for ch in CHANNELS]
+    audio = metas["CH2"].signal_type
+    ch7   = metas["CH7"].signal_type
+    return act + [1 - act[2], 1 - act[3], 1 - act[5], 1 - act[7],
+                  0.85 if "speech" in audio else 0.1,
+                  0.85 if "music" in audio or "silent" in audio else 0.1,
+                  0.8 if "mobile" in metas["CH3"].signal_type else 0.1] + [f in ch7 for f in CH7_FLAGS]
+
+def score_modes(metas_batch: List[Dict[str, Dict]]) -> Dict[str, np.ndarray]:
+    """
+    N개 SEU의 채널 메타를 한 번에 점수화한다.
+    반환: act (N×8), scores (N×7, MODE_KEYS 순), best (N), avg (N), social_active (N)
+    """
+    n    = len(metas_batch)
+    rows = np.array([_mode_row(metas) for metas in metas_batch], dtype=float).reshape(n, len(MODE_FEATURES) + len(CH7_FLAGS))
+    cols = list(rows.T)
+    act  = rows[:, :len(CHANNELS)]
+    known    = rows[:, len(MODE_FEATURES):].any(axis=1)
+    recovery = cols[_RECOVERY_IDX] > 0
+
+    # CH7 1차 결정항 (모드 × N) — 자기 모드 / 차단 / 기본
+    scores = np.zeros((len(MODE_KEYS), n))
+    block  = np.repeat(recovery[None, :], len(_CH7_OWN_MODES), axis=0)
+    block[_CH7_OWN_MODES.index(_REST)] = known
+    scores[_CH7_OWN_MODES] = np.where(rows.T[_CH7_OWN_COLS] > 0, 0.92, np.where(block, 0.0, 0.08)) * 0.55
+    for j, terms in enumerate(_MODE_TERM_IDX):
+        s = scores[j]
+        for fi, w in terms:
+            s = s + cols[fi] * w
+        scores[j] = s
+
+    # 평균 활성 — 채널 순 누적합 (sum()/len()과 동일)
+    total = cols[0].copy()
+    for j in range(1, len(CHANNELS)):
+        total += cols[j]
+    avg = total / len(CHANNELS)
+    scores[_ALERT]   = np.where(known, 0.0, scores[_ALERT])
+    scores[_AMBIENT] = np.where(known, 0.0, np.maximum(0.0, 0.55 - avg) * 1.5)
+    scores = scores.T
+
+    # 점수가 스칼라 계산과 비트 단위로 같으므로 반올림 없이 argmax — 동점이면 MODE_KEYS 앞쪽 모드(max()와 같다)
+    return {"act": act, "scores": scores, "best": scores.argmax(axis=1),
+            "avg": avg, "social_active": act[:, CHANNELS.index("CH6")] > 0.6}
+
+def _score_one(metas: Dict[str, Dict]) -> Tuple[List[float], int, float, bool]:
+    """SEU 하나 — score_modes와 같은 항·같은 누적 순서를 순수 파이썬으로 (배열 생성 비용 없이) → (scores, best, avg, social)."""
+    row      = _mode_row(metas)
+    known    = any(row[len(MODE_FEATURES):])
+    recovery = row[_RECOVERY_IDX]
+    scores   = [0.0] * len(MODE_KEYS)
+    for j, col in zip(_CH7_OWN_MODES, _CH7_OWN_COLS):
+        blocked   = known if j == _REST else recovery
+        scores[j] = (0.92 if row[col] else (0.0 if blocked else 0.08)) * 0.55
+    for j, terms in enumerate(_MODE_TERM_IDX):
+        s = scores[j]
+        for fi, w in terms:
+            s = s + row[fi] * w
+        scores[j] = s
+    total = row[0]
+    for j in range(1, len(CHANNELS)):
+        total += row[j]
+    avg = total / len(CHANNELS)
+    scores[_ALERT]   = 0.0 if known else scores[_ALERT]
+    scores[_AMBIENT] = 0.0 if known else max(0.0, 0.55 - avg) * 1.5
+    best = max(range(len(MODE_KEYS)), key=scores.__getitem__)
+    return scores, best, avg, row[CHANNELS.index("CH6")] > 0.6
+
+
+def synthesize_m_batch(metas_batch: List[Dict[str, Dict]], i_batch: List[Dict], e_batch: List[Dict]) -> List[Dict]:
+    t0 = time.perf_counter()
+    if len(metas_batch) == 1:
+        # 단일 SEU(/cube/build 등)는 배열을 만들지 않는 스칼라 경로 — 결과는 배치 경로와 같다
+        one = _score_one(metas_batch[0])
+        scores, best_idx, avgs, social = [one[0]], [one[1]], [one[2]], [one[3]]
+    else:
+        scored = score_modes(metas_batch)
+        scores, best_idx = scored["scores"].tolist(), scored["best"].tolist()
+        avgs, social     = scored["avg"].tolist(), scored["social_active"].tolist()
+    out = []
+    for n, (metas, i, e) in enumerate(zip(metas_batch, i_batch, e_batch)):
+        act = {ch: metas[ch].activation  for ch in CHANNELS}
+        sig = {ch: metas[ch].signal_type for ch in CHANNELS}
+        intent  = i.get("intensity", 0.5)
+        valence = e.get("valence",   0.5)
+        best  = MODE_KEYS[best_idx[n]]
+        info  = MODES[best]
+        avg_a = avgs[n]
+        mode_scores = {k: round(v, 3) for k, v in zip(MODE_KEYS, scores[n])}
+
+        out.append({
+            "status":               "synthesized",
+            "cognitive_mode":       best,
+            "mode_label":           info["label"],
+            "mode_label_ko":        info["label_ko"],
+            "mode_color":           info["color"],
+            "mode_score":           mode_scores[best],
+            "mode_scores":          mode_scores,
+            "channel_activations":  {ch: {"activation": act[ch], "signal_type": sig[ch]} for ch in CHANNELS},
+            # 한/영 서술 생성
+            "narrative":            _narrative(best, act, sig, intent, valence, avg_a),
+            "source":               "all_8_channels",
+            "synthesis_basis": {
+                "intent_intensity": intent,
+                "emotion_valence":  valence,
+                "social_active":    social[n],
+                "body_state":       sig["CH5"],
+                "audio_type":       sig["CH2"],
+                "meta_context":     sig["CH8"],
+                "avg_activation":   round(avg_a, 3),
+            },
+        })
+    _STAGE["mode"].observe(time.perf_counter() - t0)
+    return out
 
-    return {
-        "status":               "synthesized",
-        "cognitive_mode":       best,
-        "mode_label":           info["label"],
-        "mode_label_ko":        info["label_ko"],
-        "mode_color":           info["color"],
-        "mode_score":           round(scores[best], 3),
-        "mode_scores":          {k: round(v, 3) for k, v in scores.items()},
-        "channel_activations":  {ch: {"activation": act[ch], "signal_type": sig[ch]} for ch in CHANNELS},
-        "narrative":            narr,
-        "source":               "all_8_channels",
-        "synthesis_basis": {
-            "intent_intensity": intent,
-            "emotion_valence":  valence,
-            "social_active":    act["CH6"] > 0.6,
-            "body_state":       sig["CH5"],
-            "audio_type":       audio,
-            "meta_context":     m8,
-            "avg_activation":   round(avg_a, 3),
-        },
-    }
+def synthesize_m(t, c, i, e, metas, raws) -> Dict:
+    # 백서 #06 기준: CH7(사용자모드)=1차 결정자, 나머지 7채널=보조 신호 — 단일 SEU는 배치 1건(스칼라 경로)
+    return synthesize_m_batch([metas], [i], [e])[0]
 
-def _narrative(mode, act, sig, intent, valence) -> Dict[str, str]:
+def _narrative(mode, act, sig, intent, valence, avg) -> Dict[str, str]:
     a = act
     s = sig
     T = {
@@ -414,14 +737,17 @@ def _narrative(mode, act, sig, intent, valence) -> Dict[str, str]:
             "en": f"Negative valence ({valence:.2f}) with body tension ({s['CH5']}). Low intent ({intent:.2f}) suggests unresolved state.",
             "ko": f"부정 감정(valence={valence:.2f}), 신체 긴장({s['CH5']}). 낮은 의도({intent:.2f}) — 미해결 상태."},
         "ambient":        {
-            "en": f"All channels below threshold (avg={sum(act.values())/len(act):.2f}). No dominant mode. Background processing.",
-            "ko": f"전채널 활성 임계 이하(avg={sum(act.values())/len(act):.2f}). 우세 모드 없음. 배경 처리 상태."},
+            "en": f"All channels below threshold (avg={avg:.2f}). No dominant mode. Background processing.",
+            "ko": f"전채널 활성 임계 이하(avg={avg:.2f}). 우세 모드 없음. 배경 처리 상태."},
     }
     return T.get(mode, {"en": "Unknown mode.", "ko": "알 수 없는 모드."})
 
 
 # ── 5단계: 전체 큐브 합성 ────────────────────
-def synthesize_cube(seu_id: str) -> Dict:
+# 축별 의존 채널 — 이 채널 중 하나라도 바뀌면 해당 축을 다시 합성 (M축은 항상)
+AXIS_SOURCES = {"t": ["CH4"], "c": ["CH1","CH6","CH8"], "i": ["CH3","CH7","CH2"], "e": ["CH4","CH5"]}
+
+def _cube_axes(seu_id: str, prev: Optional[Dict] = None, dirty: Optional[set] = None):
     metas = {}
     for ch in CHANNELS:
         k = key(seu_id, ch)
@@ -429,38 +755,196 @@ def synthesize_cube(seu_id: str) -> Dict:
             raise HTTPException(400, detail=f"missing channel meta for {ch}")
         metas[ch] = META_STORE[k]
 
-    raws = {ch: get_raw(seu_id, ch).get("raw_ref","") for ch in CHANNELS}
-    t_raw = get_raw(seu_id, "CH4")
-
-    t = syn_t(t_raw)
-    c = syn_c(metas, raws)
-    i = syn_i(metas, raws)
-    e = syn_e(metas, raws)
-    m = synthesize_m(t, c, i, e, metas, raws)
-
+    raw_recs = {ch: get_raw(seu_id, ch) for ch in CHANNELS}
+    raws     = {ch: raw_text(r, limit=256) for ch, r in raw_recs.items()}  # 축 값은 앞 20자 이내만 사용
+    versions = {ch: r.version for ch, r in raw_recs.items()}
+
+    # 이전 큐브가 있으면 의존 채널이 바뀐 축만 다시 합성
+    redo = [a for a, srcs in AXIS_SOURCES.items() if prev is None or dirty is None or dirty.intersection(srcs)]
+    t0 = time.perf_counter()
+    t = syn_t(raw_recs["CH4"])   if "t" in redo else prev["t"]
+    c = syn_c(metas, raws)       if "c" in redo else prev["c"]
+    i = syn_i(metas, raws)       if "i" in redo else prev["i"]
+    e = syn_e(metas, raws)       if "e" in redo else prev["e"]
+    _STAGE["axes"].observe(time.perf_counter() - t0)
+    return metas, versions, t, c, i, e, redo + ["m"]
+
+def _assemble_cube(seu_id: str, metas: Dict, versions: Dict, t: Dict, c: Dict, i: Dict, e: Dict, m: Dict) -> Dict:
     return {
         "seu_id": seu_id,
         "t": t, "c": c, "i": i, "e": e, "m": m,
         "channel_metas": {
             ch: {
-                "activation":  metas[ch]["activation"],
-                "confidence":  metas[ch]["confidence"],
-                "signal_type": metas[ch]["signal_type"],
+                "activation":  metas[ch].activation,
+                "confidence":  metas[ch].confidence,
+                "signal_type": metas[ch].signal_type,
             } for ch in CHANNELS
         },
         "pai": {
-            "created_at":      now_iso(),
-            "pipeline_status": "cube_written",
-            "cognitive_mode":  m["cognitive_mode"],
-            "mode_label":      m["mode_label"],
-            "mode_label_ko":   m["mode_label_ko"],
+            "created_at":       now_iso(),
+            "pipeline_status":  "cube_written",
+            "cognitive_mode":   m["cognitive_mode"],
+            "mode_label":       m["mode_label"],
+            "mode_label_ko":    m["mode_label_ko"],
+            "channel_versions": versions,
         },
     }
 
+def _synthesize(seu_ids: List[str], prevs: Optional[List[Optional[Dict]]] = None,
+                dirties: Optional[List[Optional[set]]] = None) -> List[Tuple[Dict, List[str]]]:
+    # T·C·I·E는 SEU별(변경된 축만), M축은 배치 전체를 한 번에 점수화
+    t0      = time.perf_counter()
+    prevs   = prevs   or [None] * len(seu_ids)
+    dirties = dirties or [None] * len(seu_ids)
+    axes = [_cube_axes(seu_id, p, d) for seu_id, p, d in zip(seu_ids, prevs, dirties)]
+    ms   = synthesize_m_batch([a[0] for a in axes], [a[4] for a in axes], [a[5] for a in axes])
+    out  = [(_assemble_cube(seu_id, *a[:6], m), a[6]) for seu_id, a, m in zip(seu_ids, axes, ms)]
+    _STAGE["cube"].observe(time.perf_counter() - t0)
+    return out
+
+def synthesize_cubes(seu_ids: List[str]) -> List[Dict]:
+    return [cube for cube, _ in _synthesize(seu_ids)]
+
+def synthesize_cube(seu_id: str) -> Dict:
+    return synthesize_cubes([seu_id])[0]
+
+
+# ── 큐브 저장 포맷 (compact) ──────────────────
+# 저장본은 근거(evidence)를 SEU당 한 번만 두고 C·I·E축은 evidence_idx로 가리킨다.
+# m.channel_activations는 channel_metas에서 복원하고, 반복되는 signal_type·모드 문자열은 intern.
+# expand_cube(compact_cube(cube))는 원래 큐브와 같다(키 순서 포함). 이전 포맷 큐브는 그대로 통과.
+_EVIDENCE_AXES = ("c", "i", "e")
+_INTERN_M      = ("cognitive_mode", "mode_label", "mode_label_ko", "mode_color")
+_INTERN_BASIS  = ("body_state", "audio_type", "meta_context")
+CUBE_SUMMARY_FIELDS = ["seu_id", "t.value", "c.value", "i.value", "e.value",
+                       "m.cognitive_mode", "m.mode_label", "m.mode_label_ko", "m.mode_score",
+                       "pai.created_at", "pai.channel_versions"]
+
+def is_compact(cube: Dict[str, Any]) -> bool:
+    return "evidence" in cube
+
+def compact_cube(cube: Dict[str, Any]) -> Dict[str, Any]:
+    if is_compact(cube):
+        return cube
+    evidence: List[Dict[str, str]] = []
+    index: Dict[Tuple[str, str], int] = {}
+    out = {k: v for k, v in cube.items()}
+    for a in _EVIDENCE_AXES:
+        idx = []
+        for ref in cube[a]["evidence_refs"]:
+            j = index.get((ref["kind"], ref["ref"]))
+            if j is None:
+                j = index[(ref["kind"], ref["ref"])] = len(evidence)
+                evidence.append(ref)
+            idx.append(j)
+        out[a] = {**{k: v for k, v in cube[a].items() if k != "evidence_refs"}, "evidence_idx": idx}
+    m = cube["m"]
+    out["m"] = {k: (sys.intern(v) if k in _INTERN_M else v) for k, v in m.items() if k != "channel_activations"}
+    out["m"]["synthesis_basis"] = {k: (sys.intern(v) if k in _INTERN_BASIS else v)
+                                   for k, v in m["synthesis_basis"].items()}
+    out["channel_metas"] = {ch: {**cm, "signal_type": sys.intern(cm["signal_type"])}
+                            for ch, cm in cube["channel_metas"].items()}
+    out["pai"] = {k: (sys.intern(v) if k in _INTERN_M else v) for k, v in cube["pai"].items()}
+    out["evidence"] = evidence
+    return out
+
+def expand_cube(cube: Dict[str, Any]) -> Dict[str, Any]:
+    if not is_compact(cube):
+        return cube
+    evidence = cube["evidence"]
+    out = {k: v for k, v in cube.items() if k != "evidence"}
+    for a in _EVIDENCE_AXES:
+        out[a] = {**{k: v for k, v in cube[a].items() if k != "evidence_idx"},
+                  "evidence_refs": [evidence[j] for j in cube[a]["evidence_idx"]]}
+    m = {}
+    for k, v in cube["m"].items():
+        m[k] = v
+        if k == "mode_scores":
+            m["channel_activations"] = {ch: {"activation": cm["activation"], "signal_type": cm["signal_type"]}
+                                        for ch, cm in cube["channel_metas"].items()}
+    out["m"] = m
+    return out
+
+def project(doc: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """점 경로(예: m.cognitive_mode) 목록만 남긴다. 없는 경로는 건너뛰고, 상위 경로가 있으면 하위는 무시."""
+    out: Dict[str, Any] = {}
+    paths = sorted({f.strip() for f in fields if f.strip()}, key=lambda f: f.count("."))
+    taken: set = set()
+    for path in paths:
+        parts = path.split(".")
+        if any(".".join(parts[:n]) in taken for n in range(1, len(parts))):
+            continue
+        src = doc
+        for p in parts:
+            if not isinstance(src, dict) or p not in src:
+                break
+            src = src[p]
+        else:
+            dst = out
+            for p in parts[:-1]:
+                dst = dst.setdefault(p, {})
+            dst[parts[-1]] = src
+            taken.add(path)
+    return out
+
+def render_cube(cube: Dict[str, Any], view: str = "full", fields: Optional[str] = None) -> Dict[str, Any]:
+    # cube는 저장본(compact)이든 합성 직후(full)든 된다 — summary는 펼치지 않고 바로 투영.
+    # 요약 필드는 evidence 밖에 있어 두 형태에서 값이 같다 (project(full, CUBE_SUMMARY_FIELDS)와 동일)
+    if view == "summary":
+        doc = project(cube, CUBE_SUMMARY_FIELDS)
+    else:
+        doc = expand_cube(cube)
+    return project(doc, fields.split(",")) if fields else doc
+
+
+class FastJSONResponse(Response):
+    """orjson이 있으면 orjson, 없으면 공백 없는 json.dumps — FastAPI 기본 인코더(jsonable_encoder)를 거치지 않는다."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
 def emit(event_type: str, payload: Dict) -> None:
-    EVENT_BUS.append({"event_id": str(uuid.uuid4()), "event_type": event_type,
-                      "emitted_at": now_iso(), "payload": payload})
+    t0 = time.perf_counter()
+    event = {"event_id": str(uuid.uuid4()), "event_type": event_type, "emitted_at": now_iso(), "payload": payload}
+    EVENT_BUS.append(event)
+    # 버스 잠금 밖에서 기록 — 스냅숏은 STORE 잠금을 쥔 채 EVENT_BUS.dump()를 부르므로 반대 순서로 잡으면 교착.
+    # 저널 순서가 seq와 어긋날 수 있는 것은 restore()가 seq 자리에 넣어 흡수한다
+    STORE.log("events", event)
+    _STAGE["emit"].observe(time.perf_counter() - t0)
+
+
+# ── 이벤트 버스 구독 (SSE) ─────────────────────
+SSE_BATCH      = 256     # 구독자 1회 전송 최대 이벤트 수
+SSE_KEEPALIVE  = 15.0    # 이벤트가 없을 때 keepalive 주기(초)
+SUBSCRIBERS:   Dict[str, Dict[str, Any]] = {}
+
+def _sse(event: Dict[str, Any]) -> str:
+    return (f"id: {event['seq']}\nevent: {event['event_type']}\n"
+            f"data: {json.dumps(event, ensure_ascii=False)}\n\n")
+
+async def _event_stream(request: Request, cursor: int, sub_id: str):
+    # 구독자별 커서 — 클라이언트가 읽는 속도만큼만 버퍼에서 꺼낸다(백프레셔).
+    # 느린 구독자가 링 버퍼에서 밀려나면 gap 이벤트로 놓친 개수를 알린다.
+    sub = SUBSCRIBERS[sub_id]
+    try:
+        while not await request.is_disconnected():
+            events, missed = EVENT_BUS.read(cursor, SSE_BATCH)
+            if missed:
+                sub["missed"] += missed
+                cursor += missed
+                yield f"event: gap\ndata: {json.dumps({'missed': missed, 'resume_after': cursor})}\n\n"
+            for ev in events:
+                yield _sse(ev)
+                cursor = ev["seq"]
+            sub["cursor"] = cursor
+            if not events and not await EVENT_BUS.wait(cursor, SSE_KEEPALIVE):
+                yield ": keepalive\n\n"
+    finally:
+        SUBSCRIBERS.pop(sub_id, None)
 
 
 # ── Models ───────────────────────────────────
@@ -485,72 +969,703 @@ class ChannelRawRegisterRequest(BaseModel):
 class ChannelRawRegisterResponse(BaseModel):
     raw_id: str; status: str
 
+class ChannelRawBatchRequest(BaseModel):
+    # 항목은 개별 검증하므로 dict로 받는다
+    items: List[Dict[str, Any]]; build: bool = False
+
+class CubeBuildBatchRequest(BaseModel):
+    seu_ids: List[str]
+
+class StreamFrame(BaseModel):
+    # SEU 없이 디바이스 시각(ts, ISO 8601)만 단 채널 프레임 — 세그먼터가 윈도에 묶어 SEU로 봉인한다
+    device_id: str; channel_id: str; ts: str; raw_ref: str
+    raw_hash: Optional[str] = None
+    encryption_key_id: str = "key_default"; retention_policy_id: str = "retain_default"
+    consent_policy_id: str = "consent_default"
+    quality_flags: List[str] = Field(default_factory=list)
+    extra: Dict[str, Any] = Field(default_factory=dict)
+
+class StreamFramesRequest(BaseModel):
+    # 항목은 개별 검증하므로 dict로 받는다
+    frames: List[Dict[str, Any]]
+
+class ProfilerToggleRequest(BaseModel):
+    enabled: bool; interval_ms: Optional[float] = None; reset: bool = False
+
 
 # ── Routes ───────────────────────────────────
 @app.post("/seu", response_model=SEUCreateResponse)
 def create_seu(req: SEUCreateRequest):
     seu_id = req.seu_id or f"seu_{now_iso()}_{uuid.uuid4().hex[:6]}"
-    ensure_seu(seu_id)
+    with SHARDS.lock(seu_id):
+        ensure_seu(seu_id)
+        _touch_record(seu_id)
+        SEU_STORE[seu_id] = {"seu_id": seu_id, "device_id": req.device_id, "time": req.time.model_dump(),
+                             "privacy_level": req.privacy_level, "created_at": now_iso()}
+        cube = CUBE_STORE.get(seu_id)
+        if cube is not None:  # 큐브가 먼저 만들어진 SEU — 새 device·시간으로 다시 색인
+            _index_cube(seu_id, cube)
     emit("seu.created", {"seu_id": seu_id, "time": req.time.model_dump(),
                          "device_id": req.device_id, "privacy_level": req.privacy_level})
     return SEUCreateResponse(seu_id=seu_id, status="created", expected_channels=CHANNELS)
 
-@app.post("/channel/raw", response_model=ChannelRawRegisterResponse)
-def register_raw(req: ChannelRawRegisterRequest):
+@app.delete("/seu/{seu_id}")
+def delete_seu(seu_id: str, keep_cube: bool = False):
+    # keep_cube로 축출된 SEU(묘비 레코드)와 레코드 없이 큐브만 남은 SEU도 지울 수 있다
+    rec = SEU_RECORDS.get(seu_id)
+    freed = _evict_seu(seu_id, RetentionPolicy("manual", keep_cube=keep_cube), "manual")
+    if freed is None:
+        raise HTTPException(404, detail="seu not found")
+    RETENTION.untrack(seu_id)
+    RETENTION.record(rec["policy"] if rec else "retain_default", "manual", freed)
+    return {"seu_id": seu_id, "status": "evicted", "keep_cube": keep_cube, "reclaimed_bytes": freed}
+
+def _resolve_raw_ref(req: ChannelRawRegisterRequest) -> Tuple[str, str, Optional[bytes]]:
+    # (raw_ref, raw_hash, 블롭으로 옮긴 원문) — blob:// 참조는 존재 확인, 큰 인라인 페이로드는 블롭으로 옮긴다
+    h = blob_hash(req.raw_ref)
+    if h is not None:
+        if h not in BLOBS:
+            raise HTTPException(400, detail="unknown blob")
+        if req.raw_hash and req.raw_hash != h:
+            raise HTTPException(400, detail="raw_hash does not match blob")
+        return req.raw_ref, h, None
+    if len(req.raw_ref) > BLOB_INLINE_MAX:
+        data = req.raw_ref.encode("utf-8")
+        h, _ = BLOBS.put(data)
+        return BLOB_PREFIX + h, req.raw_hash or h, data
+    return req.raw_ref, req.raw_hash or stable_hash(req.raw_ref), None
+
+def _blob_acquire(h: str, data: Optional[bytes]) -> None:
+    # 그 사이 마지막 참조가 축출돼 파일이 지워졌으면 다시 쓰거나(인라인에서 옮긴 원문) 거절
+    if not BLOB_GC:
+        return
+    with BLOB_REFS_LOCK:
+        if h not in BLOBS:
+            if data is None:
+                raise HTTPException(400, detail="unknown blob")
+            BLOBS.put(data)
+        BLOB_REFS[h] = BLOB_REFS.get(h, 0) + 1
+
+def _blob_release(h: str) -> int:
+    if not BLOB_GC:
+        return 0
+    with BLOB_REFS_LOCK:
+        n = BLOB_REFS.get(h, 0) - 1
+        if n > 0:
+            BLOB_REFS[h] = n
+            return 0
+        BLOB_REFS.pop(h, None)
+        return BLOBS.remove(h)
+
+def _touch_record(seu_id: str, policy_id: Optional[str] = None, raw_id: Optional[str] = None,
+                  blob: Optional[str] = None) -> None:
+    # SEU 샤드 잠금 안에서 호출. 보존 정책은 가장 최근 raw의 retention_policy_id — 바뀌면 새 gen으로 다시 추적
+    # (TTL 기준 시각 at은 SEU의 첫 기록 시각 그대로)
+    rec = SEU_RECORDS.get(seu_id)
+    if rec is not None and rec.get("evicted"):  # keep_cube 묘비 — 새 raw는 처음 기록된 SEU처럼 추적
+        rec = None
+    retrack = rec is None or (policy_id is not None and policy_id != rec["policy"])
+    if rec is None:
+        rec = {"policy": policy_id or "retain_default", "at": time.time(), "gen": "", "raw_ids": [], "blobs": []}
+    rec = {**rec, "raw_ids": (rec["raw_ids"] + [raw_id]) if raw_id else rec["raw_ids"],
+           "blobs": (rec["blobs"] + [blob]) if blob else rec["blobs"]}
+    if retrack:
+        rec["policy"], rec["gen"] = policy_id or rec["policy"], uuid.uuid4().hex
+    SEU_RECORDS[seu_id] = rec
+    if retrack:
+        RETENTION.track(seu_id, rec["policy"], rec["at"], rec["gen"])
+
+def _register_raw(req: ChannelRawRegisterRequest) -> str:
     if req.channel_id not in CHANNELS:
         raise HTTPException(400, detail="invalid channel_id")
-    ensure_seu(req.seu_id)
-    raw_id   = f"raw_{uuid.uuid4().hex}"
-    raw_hash = req.raw_hash or stable_hash(req.raw_ref)
-    rec = {**req.model_dump(), "raw_id": raw_id, "raw_hash": raw_hash, "created_at": now_iso()}
-    RAW_STORE[raw_id] = rec
-    RAW_BY_SEU[req.seu_id][req.channel_id] = raw_id
-    emit("channel.raw_registered", {"seu_id": req.seu_id, "channel_id": req.channel_id,
-                                     "raw_id": raw_id, "raw_ref": req.raw_ref, "raw_hash": raw_hash})
+    raw_ref, raw_hash, spilled = _resolve_raw_ref(req)
+    h = blob_hash(raw_ref)
+    with SHARDS.lock(req.seu_id):
+        if h is not None:
+            _blob_acquire(h, spilled)
+        ensure_seu(req.seu_id)
+        raw_id   = f"raw_{uuid.uuid4().hex}"
+        # 채널 버전: 같은 SEU·채널에 내용(raw_ref·raw_hash)이나 시간 정보(T축 입력)가 다른 raw가 오면 +1
+        # (raw_hash는 클라이언트 값일 수 있어 그것만으로는 내용이 같다고 보지 않는다)
+        prev_id  = RAW_BY_SEU[req.seu_id].get(req.channel_id)
+        prev     = RAW_STORE.get(prev_id) if prev_id else None
+        changed  = prev is not None and (prev.raw_ref, prev.raw_hash, prev.ts_start, prev.ts_end, prev.extra) \
+                                        != (raw_ref, raw_hash, req.ts_start, req.ts_end, req.extra)
+        version  = 1 if prev is None else prev.version + changed
+        RAW_STORE[raw_id] = RawRecord(raw_id, req.seu_id, req.channel_id, req.ts_start, req.ts_end, raw_ref, raw_hash,
+                                      req.encryption_key_id, req.retention_policy_id, req.consent_policy_id,
+                                      req.quality_flags, req.extra, version, now_iso())
+        RAW_BY_SEU[req.seu_id] = {**RAW_BY_SEU[req.seu_id], req.channel_id: raw_id}
+        _touch_record(req.seu_id, req.retention_policy_id, raw_id, h)
+        emit("channel.raw_registered", {"seu_id": req.seu_id, "channel_id": req.channel_id,
+                                         "raw_id": raw_id, "raw_ref": raw_ref, "raw_hash": raw_hash})
+    return raw_id
+
+def _ensure_metas(seu_id: str) -> List[str]:
+    # 메타가 없거나 현재 raw와 raw_ref·raw_hash가 다르거나 지난번에 휴리스틱으로 대체된 채널만 다시 계산 → 다시 계산한 채널 반환
+    # (raw_ref는 서버가 읽는 원문·블롭 주소 — 클라이언트 raw_hash가 그대로여도 원문이 바뀌면 다시 계산)
+    if not all_channels_present(seu_id):
+        raise HTTPException(400, detail="not all channel raws present")
+    recomputed, raws = [], []
+    for ch in CHANNELS:
+        k    = key(seu_id, ch)
+        raw  = get_raw(seu_id, ch)
+        feat = FEATURE_STORE.get(k)
+        if k in META_STORE and feat is not None and feat["raw_ref"] == raw.raw_ref \
+                and feat["raw_hash"] == raw.raw_hash and "fallback" not in feat["signal"]:
+            continue
+        recomputed.append(ch)
+        raws.append(raw)
+    # 다시 계산할 채널들의 추출을 모아서 동시에 실행한 뒤 메타 생성
+    for ch, raw, signal in zip(recomputed, raws, signals_for_raws(raws)):
+        k    = key(seu_id, ch)
+        feat = build_features_from_raw(raw, signal)
+        FEATURE_STORE[k] = feat
+        META_STORE[k]    = build_channel_meta(ch, feat)
+    return recomputed
+
+def _dirty_channels(prev: Optional[Dict], seu_id: str, recomputed: List[str]) -> Optional[set]:
+    if prev is None:
+        return None
+    built = prev.get("pai", {}).get("channel_versions", {})
+    return {ch for ch in CHANNELS if built.get(ch) != get_raw(seu_id, ch).version} | set(recomputed)
+
+def _index_cube(seu_id: str, cube: Dict[str, Any]) -> None:
+    # 시간은 SEU 레지스트리의 ts_start, 없으면(POST /seu 없이 raw만 등록) 큐브 T축의 ts_start
+    seu = SEU_STORE.get(seu_id) or {}
+    CUBE_INDEX.put(seu_id, seu.get("time", {}).get("ts_start") or cube["t"].get("ts_start", ""),
+                   device_id=seu.get("device_id"), cognitive_mode=cube["m"]["cognitive_mode"])
+
+# 디바이스 타임라인: 최근 PAI_TIMELINE_WINDOW개 큐브 윈도 + alpha=PAI_TIMELINE_ALPHA EWMA
+TIMELINE = TimelineRollup(CHANNELS, MODE_KEYS, window=int(os.environ.get("PAI_TIMELINE_WINDOW", "20")),
+                          alpha=float(os.environ.get("PAI_TIMELINE_ALPHA", "0.3")))
+
+def _update_timeline(seu_id: str, cube: Dict[str, Any], replaced: bool) -> None:
+    # 우세 모드(EWMA mode_scores 최댓값)가 바뀌면 mode.transition 이벤트
+    seu = SEU_STORE.get(seu_id)
+    if not seu:  # device_id를 모르는 SEU(POST /seu 없이 raw만 등록)는 타임라인 없음
+        return
+    device_id = seu["device_id"]
+    ts        = seu["time"].get("ts_start") or cube["t"].get("ts_start", "")
+    m         = cube["m"]
+    with DEVICE_LOCKS.lock(device_id):
+        state, transition = TIMELINE.fold(
+            DEVICE_TIMELINE.get(device_id), device_id, seu_id, ts, seu["time"].get("duration_ms") or 0,
+            m["cognitive_mode"], [cube["channel_metas"][ch]["activation"] for ch in CHANNELS],
+            [m["mode_scores"][k] for k in MODE_KEYS], replaced=replaced)
+        DEVICE_TIMELINE[device_id] = state
+    if transition:
+        emit("mode.transition", transition)
+
+def _store_cube(cube: Dict[str, Any], job_id: Optional[str] = None) -> None:
+    seu_id   = cube["seu_id"]
+    replaced = seu_id in CUBE_STORE
+    CUBE_STORE[seu_id] = compact_cube(cube)
+    _index_cube(seu_id, cube)
+    _update_timeline(seu_id, cube, replaced)
+    COGNITIVE_MODES.labels(cube["m"]["cognitive_mode"]).inc()
+    payload = {"seu_id": seu_id, "cognitive_mode": cube["m"]["cognitive_mode"],
+               "mode_label": cube["m"]["mode_label"], "mode_score": cube["m"]["mode_score"]}
+    if job_id is not None:
+        payload["job_id"] = job_id
+    emit("cube.created", payload)
+
+def _build(seu_ids: List[str], job_ids: Optional[List[str]] = None) -> List[Any]:
+    """
+    SEU별 메타 준비(변경 채널만) → 변경 축만 재합성 + M축 배치 점수화 → 저장·이벤트.
+    항목별 결과: (cube, {"channels": [...], "axes": [...]}) 또는 HTTPException
+    job_ids(비동기 빌드)를 주면 각 cube.created 이벤트에 job_id를 싣는다.
+    """
+    out: List[Any] = [None] * len(seu_ids)
+    ready, prevs, dirties, channels = [], [], [], []
+    # 배치가 걸친 샤드를 모두 잡은 채 준비·합성·저장 → 합성 중 메타가 바뀌지 않는다
+    with SHARDS.lock_many(seu_ids):
+        for idx, seu_id in enumerate(seu_ids):
+            try:
+                recomputed = _ensure_metas(seu_id)
+            except HTTPException as err:
+                out[idx] = err
+                continue
+            prev = CUBE_STORE.get(seu_id)
+            ready.append(idx); prevs.append(expand_cube(prev) if prev else None); channels.append(recomputed)
+            dirties.append(_dirty_channels(prev, seu_id, recomputed))
+        built = _synthesize([seu_ids[i] for i in ready], prevs, dirties)
+        for idx, recomputed, (cube, axes) in zip(ready, channels, built):
+            _store_cube(cube, job_ids[idx] if job_ids else None)
+            out[idx] = (cube, {"channels": recomputed, "axes": axes})
+    return out
+
+def _build_cube(seu_id: str) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    res = _build([seu_id])[0]
+    if isinstance(res, HTTPException):
+        raise res
+    return res
+
+def _item_error(index: int, err: Exception) -> Dict[str, Any]:
+    if isinstance(err, HTTPException):
+        return {"index": index, "status": "error", "status_code": err.status_code, "detail": err.detail}
+    return {"index": index, "status": "error", "status_code": 422,
+            "detail": err.errors(include_url=False) if isinstance(err, ValidationError) else str(err)}
+
+def _build_cubes(seu_ids: List[str], job_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    results = []
+    for idx, (seu_id, res) in enumerate(zip(seu_ids, _build(seu_ids, job_ids))):
+        if isinstance(res, HTTPException):
+            results.append({**_item_error(idx, res), "seu_id": seu_id})
+            continue
+        cube, recomputed = res
+        results.append({"index": idx, "seu_id": seu_id, "status": "cube_written",
+                        "cognitive_mode": cube["m"]["cognitive_mode"], "mode_score": cube["m"]["mode_score"],
+                        "recomputed": recomputed})
+    return results
+
+# 비동기 빌드(POST /cube/build?async=true) — 워커가 대기 작업을 최대 PAI_BUILD_BATCH개씩 모아 _build_cubes로 배치 빌드
+BUILD_QUEUE = BuildQueue(_build_cubes,
+                         capacity=int(os.environ.get("PAI_BUILD_QUEUE", "1024")),
+                         workers=int(os.environ.get("PAI_BUILD_WORKERS", "4")),
+                         batch=int(os.environ.get("PAI_BUILD_BATCH", "32")),
+                         history=int(os.environ.get("PAI_BUILD_JOB_HISTORY", "10000")))
+
+def _nbytes(v: Any) -> int:
+    # 회수 바이트는 저장 직렬화(JSON) 크기 기준 — 메모리 백엔드에서도 같은 잣대로 센다
+    return len(json.dumps(v, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8"))
+
+def _evict_seu(seu_id: str, policy: RetentionPolicy, reason: str, gen: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    역색인(SEU_RECORDS)에 적힌 레코드만 지운다 — 저장소 스캔 없음. 그 raw의 signal·메타 메모도 비운다.
+    keep_cube면 큐브·SEU(SEU_STORE)·인덱스는 남기고, 역색인 자리에 묘비({"evicted": True, raw 없음})를 둔다 —
+    나중에 DELETE /seu/{seu_id}로 남은 큐브를 지울 수 있도록. 역색인이 없어도 큐브가 있으면 수동 삭제(gen 없음)는 진행한다.
+    gen이 주어졌는데 그 사이 SEU가 다시 추적됐으면(정책 변경) 아무것도 지우지 않고 None.
+    """
+    freed: Dict[str, int] = {}
+    def drop(table: MutableMapping[str, Any], store: str, k: str) -> None:
+        v = table.pop(k, None)
+        if v is not None:
+            freed[store] = freed.get(store, 0) + _nbytes(v)
+    with SHARDS.lock(seu_id):
+        rec = SEU_RECORDS.get(seu_id)
+        if rec is None and gen is None and seu_id in CUBE_STORE:
+            rec = {"policy": "retain_default", "at": 0.0, "gen": "", "raw_ids": [], "blobs": [], "evicted": True}
+        if rec is None or (gen is not None and rec["gen"] != gen):
+            return None
+        for raw_id in rec["raw_ids"]:
+            raw = RAW_STORE.get(raw_id)
+            if raw is not None:
+                SIGNAL_MEMO.pop(_signal_memo_key(raw))
+                META_MEMO.pop(_meta_memo_key(raw.channel_id, raw.raw_ref, raw.raw_hash))
+            drop(RAW_STORE, "raw", raw_id)
+        drop(RAW_BY_SEU, "raw", seu_id)
+        for ch in CHANNELS:
+            drop(FEATURE_STORE, "feature", key(seu_id, ch))
+            drop(META_STORE, "meta", key(seu_id, ch))
+        if not policy.keep_cube:
+            drop(CUBE_STORE, "cube", seu_id)
+            drop(SEU_STORE, "seu", seu_id)
+            CUBE_INDEX.remove(seu_id)
+        for h in rec["blobs"]:
+            n = _blob_release(h)
+            if n:
+                freed["blob"] = freed.get("blob", 0) + n
+        if policy.keep_cube:
+            SEU_RECORDS[seu_id] = {"policy": rec["policy"], "at": rec["at"], "gen": "", "raw_ids": [], "blobs": [],
+                                   "evicted": True}
+        else:
+            SEU_RECORDS.pop(seu_id, None)
+    emit("seu.evicted", {"seu_id": seu_id, "policy": rec["policy"], "reason": reason,
+                         "keep_cube": policy.keep_cube, "reclaimed_bytes": sum(freed.values())})
+    return freed
+
+# 보존 정책: PAI_RETENTION_POLICIES="short=ttl:3600; capped=max:10000; summary=ttl:86400,keep_cube"
+# 백그라운드 스윕은 PAI_RETENTION_SWEEP_MS마다 만기된 SEU를 최대 PAI_RETENTION_SWEEP_BUDGET개씩
+RETENTION = RetentionManager(_evict_seu,
+                             interval=int(os.environ.get("PAI_RETENTION_SWEEP_MS", "1000")) / 1000.0,
+                             budget=int(os.environ.get("PAI_RETENTION_SWEEP_BUDGET", "256")))
+if os.environ.get("PAI_RETENTION_POLICIES"):
+    RETENTION.load_spec(os.environ["PAI_RETENTION_POLICIES"])
+
+def _window_seu_id(w: Window) -> str:
+    # 디바이스·윈도 시작 시각으로 정해진다 — idle 뒤 다시 열린 윈도는 같은 SEU를 갱신한다
+    return f"seu_{w.device_id}_{int(round(w.start * 1000))}"
+
+def _seal_windows(windows: List[Window]) -> List[Dict[str, Any]]:
+    """봉인된 윈도 → SEU 생성·채널 raw 등록, 8채널이 모인 SEU는 한 번에 배치 빌드."""
+    results: List[Dict[str, Any]] = []
+    ready: List[int] = []
+    for w in windows:
+        seu_id   = _window_seu_id(w)
+        ts_start, ts_end = format_ts(w.start), format_ts(w.end)
+        duration_ms = int(round((w.end - w.start) * 1000))
+        if seu_id not in SEU_STORE:
+            create_seu(SEUCreateRequest(seu_id=seu_id, device_id=w.device_id,
+                                        time=SEUTime(ts_start=ts_start, ts_end=ts_end, duration_ms=duration_ms)))
+        failed: Dict[str, Any] = {}
+        for ch, (_, frame) in w.frames.items():
+            raw = frame.model_dump(exclude={"device_id", "ts"})
+            raw.update(seu_id=seu_id, ts_start=ts_start, ts_end=ts_end,
+                       quality_flags=raw["quality_flags"] + ["carried_forward"] if ch in w.carried
+                       else raw["quality_flags"],
+                       extra={"duration_ms": duration_ms, **raw["extra"]})
+            try:
+                _register_raw(ChannelRawRegisterRequest(**raw))
+            except HTTPException as err:
+                failed[ch] = err.detail
+        view = w.view()
+        emit("seu.sealed", {"seu_id": seu_id, **view})
+        res = {"seu_id": seu_id, **view, "status": "incomplete",
+               "missing": [ch for ch in CHANNELS if ch not in RAW_BY_SEU.get(seu_id, {})]}
+        if failed:
+            res["failed"] = failed
+        if not res["missing"]:
+            ready.append(len(results))
+        results.append(res)
+    for idx, built in zip(ready, _build_cubes([results[i]["seu_id"] for i in ready])):
+        results[idx].update({k: v for k, v in built.items() if k not in ("index", "seu_id")})
+    return results
+
+# 스트리밍 세그먼터: PAI_SEGMENT_WINDOW_MS 윈도를 PAI_SEGMENT_SLIDE_MS 간격으로(없으면 텀블링),
+# 늦은 프레임은 PAI_SEGMENT_LATENESS_MS까지 받는다. PAI_SEGMENT_IDLE_MS 동안 조용한 디바이스는 백그라운드에서 봉인
+SEGMENTER = Segmenter(_seal_windows,
+                      window=int(os.environ.get("PAI_SEGMENT_WINDOW_MS", "60000")) / 1000.0,
+                      slide=int(os.environ["PAI_SEGMENT_SLIDE_MS"]) / 1000.0
+                      if os.environ.get("PAI_SEGMENT_SLIDE_MS") else None,
+                      lateness=int(os.environ.get("PAI_SEGMENT_LATENESS_MS", "5000")) / 1000.0,
+                      idle=int(os.environ.get("PAI_SEGMENT_IDLE_MS", "30000")) / 1000.0,
+                      max_windows=int(os.environ.get("PAI_SEGMENT_MAX_WINDOWS", "64")),
+                      max_devices=int(os.environ.get("PAI_SEGMENT_MAX_DEVICES", "10000")),
+                      carry=os.environ.get("PAI_SEGMENT_CARRY", "1") != "0",
+                      channels=CHANNELS)
+
+def _push_frame(frame: StreamFrame) -> Tuple[bool, List[Window]]:
+    if frame.channel_id not in CHANNELS:
+        raise HTTPException(400, detail="invalid channel_id")
+    try:
+        ts = parse_ts(frame.ts)
+    except ValueError:
+        raise HTTPException(400, detail="invalid ts")
+    return SEGMENTER.push(frame.device_id, frame.channel_id, ts, frame)
+
+@app.put("/blob")
+async def put_blob(request: Request):
+    """요청 본문을 조각 단위로 해시하며 디스크에 스트리밍 — 반환된 raw_ref를 /channel/raw에 그대로 쓴다."""
+    w = BLOBS.writer()
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                w.write(chunk)
+    except BaseException:
+        w.abort()
+        raise
+    h, size = w.commit()
+    return {"raw_hash": h, "raw_ref": BLOB_PREFIX + h, "size": size}
+
+@app.get("/blob/{raw_hash}")
+def get_blob(raw_hash: str):
+    if not BlobStore.valid(raw_hash):
+        raise HTTPException(400, detail="invalid blob hash")
+    if raw_hash not in BLOBS:
+        raise HTTPException(404, detail="blob not found")
+    return FileResponse(BLOBS.path(raw_hash), media_type="application/octet-stream")
+
+@app.post("/channel/raw", response_model=ChannelRawRegisterResponse)
+def register_raw(req: ChannelRawRegisterRequest):
+    raw_id = _register_raw(req)
     return ChannelRawRegisterResponse(raw_id=raw_id, status="registered")
 
+@app.post("/channel/raw/batch")
+def register_raw_batch(req: ChannelRawBatchRequest):
+    # 항목별 검증·등록 — 잘못된 항목 하나가 배치 전체를 중단시키지 않는다
+    results: List[Dict[str, Any]] = []
+    touched: Dict[str, None] = {}
+    for idx, item in enumerate(req.items):
+        try:
+            raw_req = ChannelRawRegisterRequest.model_validate(item)
+            raw_id  = _register_raw(raw_req)
+        except (ValidationError, HTTPException) as err:
+            results.append(_item_error(idx, err))
+            continue
+        touched[raw_req.seu_id] = None
+        results.append({"index": idx, "seu_id": raw_req.seu_id, "channel_id": raw_req.channel_id,
+                        "raw_id": raw_id, "status": "registered"})
+    cubes = _build_cubes([s for s in touched if all_channels_present(s)]) if req.build else []
+    return {"registered": sum(r["status"] == "registered" for r in results),
+            "failed": sum(r["status"] == "error" for r in results),
+            "results": results, "cubes": cubes}
+
+def _ingest_frame(req: ChannelRawRegisterRequest) -> Tuple[str, Optional[Tuple[Dict, Dict]]]:
+    # 등록 후 8채널이 모두 모였고 큐브가 없거나 낡았으면 즉시 합성
+    with SHARDS.lock(req.seu_id):
+        raw_id = _register_raw(req)
+        if not all_channels_present(req.seu_id):
+            return raw_id, None
+        prev = CUBE_STORE.get(req.seu_id)
+        if prev is not None and not _dirty_channels(prev, req.seu_id, []):
+            return raw_id, None
+        return raw_id, _build_cube(req.seu_id)
+
+@app.websocket("/ws/ingest")
+async def ingest_ws(ws: WebSocket):
+    """
+    디바이스 세션이 ChannelRawRegisterRequest 프레임(JSON)을 밀어 넣는 수집 채널.
+    프레임마다 ack를, SEU의 8번째 채널이 도착하면 같은 소켓으로 cube 요약을 돌려준다.
+    선택 필드 frame_id는 응답에 그대로 실린다.
+    """
+    await ws.accept()
+    try:
+        while True:
+            text = await ws.receive_text()
+            frame_id = None
+            try:
+                frame    = json.loads(text)
+                frame_id = frame.get("frame_id") if isinstance(frame, dict) else None
+                req      = ChannelRawRegisterRequest.model_validate(frame)
+                raw_id, built = await run_in_threadpool(_ingest_frame, req)
+            except (ValueError, HTTPException) as err:  # JSON 오류·ValidationError 포함
+                err = err if isinstance(err, (HTTPException, ValidationError)) else HTTPException(400, detail=str(err))
+                await ws.send_json({"type": "error", "frame_id": frame_id,
+                                    **{k: v for k, v in _item_error(0, err).items() if k != "index"}})
+                continue
+            await ws.send_json({"type": "ack", "frame_id": frame_id, "seu_id": req.seu_id,
+                                "channel_id": req.channel_id, "raw_id": raw_id})
+            if built:
+                cube, recomputed = built
+                await ws.send_json({"type": "cube", "seu_id": req.seu_id, "status": "cube_written",
+                                    "cognitive_mode": cube["m"]["cognitive_mode"],
+                                    "mode_label":     cube["m"]["mode_label"],
+                                    "mode_score":     cube["m"]["mode_score"],
+                                    "recomputed":     recomputed})
+    except WebSocketDisconnect:
+        pass
+
+@app.post("/stream/frames")
+def stream_frames(req: StreamFramesRequest):
+    """
+    프레임 배치를 세그먼터에 넣고, 이 배치로 봉인된 윈도를 SEU로 등록·빌드한다.
+    받아들인 프레임은 개수만 세고, 늦었거나 잘못된 프레임만 rejected에 싣는다.
+    """
+    _require_single_worker("stream segmenter")
+    rejected: List[Dict[str, Any]] = []
+    sealed: List[Window] = []
+    for idx, item in enumerate(req.frames):
+        try:
+            frame = StreamFrame.model_validate(item)
+            accepted, windows = _push_frame(frame)
+        except (ValidationError, HTTPException) as err:
+            rejected.append(_item_error(idx, err))
+            continue
+        sealed += windows
+        if not accepted:
+            rejected.append({"index": idx, "status": "late", "device_id": frame.device_id,
+                             "channel_id": frame.channel_id, "ts": frame.ts})
+    late = sum(r["status"] == "late" for r in rejected)
+    return {"accepted": len(req.frames) - len(rejected), "late": late, "failed": len(rejected) - late,
+            "rejected": rejected, "sealed": _seal_windows(sealed)}
+
+@app.post("/stream/flush")
+def stream_flush(device_id: Optional[str] = None):
+    """워터마크를 기다리지 않고 열린 윈도를 봉인한다 (device_id가 없으면 모든 디바이스)."""
+    _require_single_worker("stream segmenter")
+    return {"sealed": _seal_windows(SEGMENTER.flush(device_id))}
+
+@app.get("/stream/stats")
+def stream_stats():
+    return SEGMENTER.stats()
+
+def _stream_frame(frame: StreamFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    accepted, windows = _push_frame(frame)
+    return accepted, _seal_windows(windows)
+
+@app.websocket("/ws/stream")
+async def stream_ws(ws: WebSocket):
+    """
+    디바이스 스트림 — StreamFrame(JSON)마다 ack(status: accepted | late)를,
+    그 프레임으로 봉인된 윈도마다 seu 메시지(봉인·빌드 결과)를 같은 소켓으로 돌려준다.
+    """
+    if not SINGLE_WORKER:  # 핸드셰이크 거절 — POST /stream/frames의 409와 같은 사유
+        await ws.close(code=1008, reason="stream segmenter needs PAI_SHARED_SINGLE_WORKER=1")
+        return
+    await ws.accept()
+    try:
+        while True:
+            text = await ws.receive_text()
+            frame_id = None
+            try:
+                data     = json.loads(text)
+                frame_id = data.get("frame_id") if isinstance(data, dict) else None
+                frame    = StreamFrame.model_validate(data)
+                accepted, sealed = await run_in_threadpool(_stream_frame, frame)
+            except (ValueError, HTTPException) as err:  # JSON 오류·ValidationError 포함
+                err = err if isinstance(err, (HTTPException, ValidationError)) else HTTPException(400, detail=str(err))
+                await ws.send_json({"type": "error", "frame_id": frame_id,
+                                    **{k: v for k, v in _item_error(0, err).items() if k != "index"}})
+                continue
+            await ws.send_json({"type": "ack", "frame_id": frame_id, "device_id": frame.device_id,
+                                "channel_id": frame.channel_id, "status": "accepted" if accepted else "late"})
+            for res in sealed:
+                await ws.send_json({"type": "seu", **res})
+    except WebSocketDisconnect:
+        pass
+
 @app.post("/channel/meta/{seu_id}/{channel_id}")
 def compute_meta(seu_id: str, channel_id: str):
     if channel_id not in CHANNELS:
         raise HTTPException(400, detail="invalid channel_id")
-    raw  = get_raw(seu_id, channel_id)
-    k    = key(seu_id, channel_id)
-    feat = build_features_from_raw(raw)
-    FEATURE_STORE[k] = feat
-    meta = build_channel_meta(channel_id, feat)
-    META_STORE[k] = meta
-    emit("channel.meta_created", {"seu_id": seu_id, "channel_id": channel_id, "meta_key": k})
-    return {"seu_id": seu_id, "channel_id": channel_id, "meta": meta}
+    with SHARDS.lock(seu_id):
+        raw  = get_raw(seu_id, channel_id)
+        k    = key(seu_id, channel_id)
+        feat = build_features_from_raw(raw)
+        FEATURE_STORE[k] = feat
+        meta = build_channel_meta(channel_id, feat)
+        META_STORE[k] = meta
+        emit("channel.meta_created", {"seu_id": seu_id, "channel_id": channel_id, "meta_key": k})
+    return {"seu_id": seu_id, "channel_id": channel_id, "meta": meta.to_dict()}
+
+CubeView = Literal["full", "summary"]
 
 @app.post("/cube/build")
-def build_cube(payload: Dict[str, Any]):
+def build_cube(payload: Dict[str, Any], view: CubeView = "full", fields: Optional[str] = None,
+               async_: bool = Query(False, alias="async")):
     seu_id = payload.get("seu_id")
     if not seu_id:
         raise HTTPException(400, detail="seu_id required")
+    if async_:
+        return _submit_build(seu_id)
+    cube, recomputed = _build_cube(seu_id)
+    return FastJSONResponse({"seu_id": seu_id, "status": "cube_written",
+                             "cube": render_cube(cube, view, fields), "recomputed": recomputed})
+
+def _submit_build(seu_id: str) -> Response:
+    # raw가 다 없으면 큐에 넣지 않고 동기 빌드와 같은 오류로 바로 돌려준다
+    _require_single_worker("async build")
     if not all_channels_present(seu_id):
         raise HTTPException(400, detail="not all channel raws present")
-    for ch in CHANNELS:
-        k = key(seu_id, ch)
-        if k not in META_STORE:
-            raw  = get_raw(seu_id, ch)
-            feat = build_features_from_raw(raw)
-            FEATURE_STORE[k] = feat
-            META_STORE[k]    = build_channel_meta(ch, feat)
-    cube = synthesize_cube(seu_id)
-    CUBE_STORE[seu_id] = cube
-    emit("cube.created", {"seu_id": seu_id, "cognitive_mode": cube["m"]["cognitive_mode"],
-                          "mode_label": cube["m"]["mode_label"], "mode_score": cube["m"]["mode_score"]})
-    return {"seu_id": seu_id, "status": "cube_written", "cube": cube}
+    try:
+        job = BUILD_QUEUE.submit(seu_id)
+    except QueueFull as err:
+        raise HTTPException(429, detail=str(err), headers={"Retry-After": str(err.retry_after)})
+    return FastJSONResponse(job.view(), status_code=202)
+
+@app.get("/cube/jobs")
+def build_jobs_stats():
+    return BUILD_QUEUE.stats()
+
+@app.get("/cube/jobs/{job_id}")
+def get_build_job(job_id: str):
+    job = BUILD_QUEUE.get(job_id)
+    if job is None:
+        raise HTTPException(404, detail="job not found")
+    return job.view()
+
+@app.post("/cube/build/batch")
+def build_cube_batch(req: CubeBuildBatchRequest):
+    results = _build_cubes(req.seu_ids)
+    return {"built": sum(r["status"] == "cube_written" for r in results),
+            "failed": sum(r["status"] == "error" for r in results),
+            "results": results}
+
+def _encode_cursor(pos: Tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(pos), ensure_ascii=False).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        ts, k = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(ts), str(k)
+    except (ValueError, TypeError):
+        raise HTTPException(400, detail="invalid cursor")
+
+@app.get("/cubes")
+def list_cubes(device_id: Optional[str] = None, mode: Optional[str] = None,
+               ts_from: Optional[str] = None, ts_to: Optional[str] = None,
+               limit: int = 50, cursor: Optional[str] = None,
+               view: CubeView = "summary", fields: Optional[str] = None):
+    """
+    보조 인덱스 조회 — device_id / mode(cognitive_mode) 등호, ts_from <= ts_start < ts_to (ISO 문자열 비교).
+    ts_start, seu_id 오름차순. next_cursor를 cursor로 넘기면 다음 페이지.
+    """
+    limit = max(1, min(limit, 1000))
+    hits  = CUBE_INDEX.query(ts_from=ts_from, ts_to=ts_to, after=_decode_cursor(cursor) if cursor else None,
+                             limit=limit, device_id=device_id, cognitive_mode=mode)
+    items = []
+    for ts, seu_id in hits:
+        cube = CUBE_STORE.get(seu_id)
+        if cube is not None:
+            items.append(render_cube(cube, view, fields))
+    return FastJSONResponse({"items": items, "count": len(items),
+                             "next_cursor": _encode_cursor(hits[-1]) if len(hits) == limit else None})
+
+def _export_rows(ts_from: Optional[str], ts_to: Optional[str], device_id: Optional[str], mode: Optional[str],
+                 page: int):
+    # 인덱스 순서(ts_start, seu_id)대로 page개씩 — 한 번에 한 페이지의 키만 들고 있다
+    after = None
+    while True:
+        hits = CUBE_INDEX.query(ts_from=ts_from, ts_to=ts_to, after=after, limit=page,
+                                device_id=device_id, cognitive_mode=mode)
+        for ts, seu_id in hits:
+            cube = CUBE_STORE.get(seu_id)
+            if cube is not None:
+                yield seu_id, (SEU_STORE.get(seu_id) or {}).get("device_id"), cube
+        if len(hits) < page:
+            return
+        after = hits[-1]
+
+@app.get("/export/cubes")
+def export_cubes(format: Literal["parquet", "arrow"] = "parquet", device_id: Optional[str] = None,
+                 mode: Optional[str] = None, ts_from: Optional[str] = None, ts_to: Optional[str] = None,
+                 row_group: int = 10000):
+    """
+    /cubes와 같은 필터로 큐브를 열 지향 파일로 스트리밍 (Parquet 또는 Arrow IPC 스트림).
+    행 그룹(row_group개 큐브)마다 인코딩해 바로 내보내므로 메모리는 행 그룹 하나 크기로 묶인다.
+    """
+    if export.pa is None:
+        raise HTTPException(501, detail="pyarrow is not installed")
+    row_group = max(1, min(row_group, 1_000_000))
+    exporter  = export.CubeExporter(CHANNELS, MODE_KEYS)
+    media_type, ext = export.FORMATS[format]
+    return StreamingResponse(exporter.stream(_export_rows(ts_from, ts_to, device_id, mode, row_group),
+                                             format, row_group),
+                             media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="cubes.{ext}"'})
+
+@app.get("/device/{device_id}/timeline")
+def device_timeline(device_id: str):
+    # 큐브 기록 시 갱신되는 롤업을 그대로 읽는다 — 기록 수와 무관하게 O(윈도 크기)
+    state = DEVICE_TIMELINE.get(device_id)
+    if state is None:
+        raise HTTPException(404, detail="no cubes for device")
+    return TIMELINE.view(state)
 
 @app.get("/cube/{seu_id}")
-def get_cube(seu_id: str):
-    if seu_id not in CUBE_STORE:
+def get_cube(seu_id: str, view: CubeView = "full", fields: Optional[str] = None):
+    # view=full(기본, 기존 응답과 동일) | summary, fields=쉼표로 구분한 점 경로
+    cube = CUBE_STORE.get(seu_id)
+    if cube is None:
         raise HTTPException(404, detail="cube not found")
-    return CUBE_STORE[seu_id]
+    return FastJSONResponse(render_cube(cube, view, fields))
 
 @app.get("/events")
-def events(limit: int = 50):
-    return {"events": EVENT_BUS[-limit:]}
+def events(limit: int = 50, after: Optional[int] = None):
+    # after 지정 시 커서 읽기(seq > after, 누락 없음) — 버퍼에서 밀려난 개수는 missed로 보고
+    if after is None:
+        evs, missed = EVENT_BUS.tail(limit), 0
+    else:
+        evs, missed = EVENT_BUS.read(after, limit)
+    next_after = evs[-1]["seq"] if evs else (EVENT_BUS.last_seq if after is None else after + missed)
+    return {"events": evs, "next_after": next_after, "missed": missed}
+
+@app.get("/events/stream")
+async def events_stream(request: Request, after: Optional[int] = None):
+    # Server-Sent Events — after(또는 Last-Event-ID) 이후부터, 미지정이면 현재 시점부터
+    last_id = request.headers.get("last-event-id")
+    cursor  = after if after is not None else (int(last_id) if last_id and last_id.isdigit() else EVENT_BUS.last_seq)
+    sub_id  = uuid.uuid4().hex[:12]
+    SUBSCRIBERS[sub_id] = {"cursor": cursor, "missed": 0, "since": now_iso()}
+    return StreamingResponse(_event_stream(request, cursor, sub_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/events/stats")
+def events_stats():
+    return {**EVENT_BUS.stats(),
+            "subscribers": [{"id": sid, **{k: s[k] for k in ("cursor", "missed", "since")},
+                             "lag": EVENT_BUS.last_seq - s["cursor"]} for sid, s in SUBSCRIBERS.items()]}
 
 @app.get("/")
 def root():
@@ -559,3 +1674,37 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/store/stats")
+def store_stats():
+    return {**STORE.stats(), "locks": SHARDS.stats(), "blobs": BLOBS.stats()}
+
+@app.get("/retention/stats")
+def retention_stats():
+    return RETENTION.stats()
+
+@app.get("/extractors")
+def extractors_stats():
+    return EXTRACTORS.stats()
+
+@app.get("/memo/stats")
+def memo_stats():
+    return {"signal": SIGNAL_MEMO.stats(), "meta": META_MEMO.stats()}
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/profiler")
+def profiler_stats():
+    return PROFILER.stats()
+
+@app.post("/metrics/profiler")
+def profiler_toggle(req: ProfilerToggleRequest):
+    if req.reset:
+        PROFILER.reset()
+    if req.enabled:
+        PROFILER.start(req.interval_ms / 1000.0 if req.interval_ms else None)
+    else:
+        PROFILER.stop()
+    return PROFILER.stats()
@@ -0,0 +1,352 @@
+"""
+PAI 8-Channel Cube 벤치마크.
+
+- 합성 SEU 생성기 : extract_signal이 인식하는 bpm / dB / lux / °C / 분 패턴과
+                    모드 키워드를 섞은 한/영 raw_ref를 8채널 모두 만든다 (seed 고정 → 재현 가능).
+- micro           : extract_signal, build_channel_meta, syn_c / syn_i / syn_e, synthesize_m, synthesize_cube
+- macro           : 프로세스 내 TestClient로 /seu → /channel/raw ×8 → /cube/build 전체 흐름
+                    (처리량, p50/p99 지연, tracemalloc 최대 메모리)
+- memory          : SEU를 적재·빌드한 뒤 저장소별로 SEU 하나가 차지하는 바이트 (메모리 백엔드)
+
+결과는 JSON으로 저장해 커밋 간 회귀를 비교한다:
+
+    python bench.py --out bench-base.json
+    python bench.py --compare bench-base.json
+"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import app as A
+
+# ── 합성 SEU 생성기 ───────────────────────────
+_SCENES   = ["카페", "사무실", "창가", "거실", "회의실", "cafe", "office", "window", "home"]
+_SCENE_KW = ["RGB", "depth", "밝은 조명", "어두운 화면", "bright lighting", "dark screen", "screen glare", "창 밖 풍경"]
+_AUDIO    = ["재즈 음악", "lo-fi music", "bgm melody", "동료 목소리", "multiple speaker 대화", "발표 voice",
+             "지하철 안내 방송", "announcement", "조용함", "quiet room", "silence"]
+_PLACES   = ["지하철 이동 중", "walking to office", "버스 이동", "train commute", "카페 실내", "사무실 책상",
+             "자택 거실", "meeting room", "회의실"]
+_BIO      = ["이완 상태", "relax breathing", "편안한 자세", "긴장된 어깨", "tense posture", "활발한 제스처",
+             "alert gaze", "화면 응시", "무거운 눈꺼풀"]
+_TEXT     = ["오늘 목표 핵심 전략 정리", "finish the key strategy doc", "분기 목표 달성 계획 실행",
+             "회의록 초안 메모", "reading notes on the paper", "장보기 목록", "ok", "(없음)", "(none)",
+             "priority: complete the critical review"]
+_DEVICE   = ["연속 타이핑", "typing", "스크롤", "scroll", "앱 전환", "app switching", "메신저 확인"]
+_IDLE     = ["터치 없음", "no touch", "idle", "입력 없음 none"]
+_MODE     = ["완전 집중 모드", "deep focus session", "몰입해서 작업 중", "논문 읽으며 공부", "study 정리 중",
+             "learn new 지식", "팀 회의 발표 준비", "presentation discussion", "토론 논의",
+             "업무 완수 목표", "execute goal", "완료 직전 핵심 작업", "휴식 모드", "recovery mode rest",
+             "쉬고 있음", "출근 중 이동", "commute to office", "회의실로 향하는 중",
+             "기대되고 활기찬 상태", "stress and fatigue", "피로 누적 불안", "curious and motivated", "그냥 평소"]
+_ENV      = ["조용한 실내", "quiet indoor", "야외", "outdoor"]
+
+
+def _pick(rng: random.Random, xs: List[str]) -> str:
+    return xs[rng.randrange(len(xs))]
+
+
+def gen_raws(rng: random.Random) -> Dict[str, str]:
+    """채널별 raw_ref 한 벌 — 숫자 패턴과 키워드가 섞여 대부분 고유한 문자열이 된다."""
+    ch2 = _pick(rng, _AUDIO) if rng.random() < 0.6 else f"주변 소음 {rng.randint(25, 85)} dB"
+    r3  = rng.random()
+    ch3 = (_pick(rng, _PLACES) if r3 < 0.7 else
+           f"GPS {rng.uniform(33, 38):.4f}, {rng.uniform(124, 130):.4f}" if r3 < 0.9 else "위치 정보 일반")
+    r4  = rng.random()
+    ch4 = (f"심박 {rng.randint(55, 100)} bpm, {_pick(rng, _BIO)}" if r4 < 0.6 else
+           _pick(rng, _BIO) if r4 < 0.9 else "특이 사항 없음 neutral")
+    r6  = rng.random()
+    ch6 = (f"{rng.randint(1, 30)}분 {_pick(rng, _DEVICE)}" if r6 < 0.4 else
+           f"{rng.randint(5, 90)} sec {_pick(rng, _DEVICE)}" if r6 < 0.7 else
+           f"{rng.randint(2, 40)}초 {_pick(rng, _DEVICE)}" if r6 < 0.8 else
+           _pick(rng, _IDLE) if r6 < 0.9 else _pick(rng, _DEVICE))
+    ch8 = (f"{rng.randint(15, 30)}°C {rng.randint(80, 900)} lux {rng.randint(30, 80)}dB"
+           if rng.random() < 0.8 else f"{_pick(rng, _ENV)} {rng.randint(15, 30)}℃")
+    return {
+        "CH1": f"{_pick(rng, _SCENE_KW)} {_pick(rng, _SCENES)} {_pick(rng, _SCENE_KW)} #{rng.randint(1, 9999)}",
+        "CH2": ch2,
+        "CH3": ch3,
+        "CH4": ch4,
+        "CH5": f"{_pick(rng, _TEXT)}" + (f" ({rng.randint(1, 99)})" if rng.random() < 0.5 else ""),
+        "CH6": ch6,
+        "CH7": _pick(rng, _MODE),
+        "CH8": ch8,
+    }
+
+
+def gen_seus(n: int, seed: int = 42, prefix: str = "bench") -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        ts = f"2026-10-17T{8 + i // 3600 % 12:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+        out.append({"seu_id": f"{prefix}_{i:06d}", "device_id": f"dev_{rng.randrange(16):02d}",
+                    "ts_start": ts, "ts_end": ts, "duration_ms": 60000, "raws": gen_raws(rng)})
+    return out
+
+
+# ── 측정 도우미 ───────────────────────────────
+def _pct(sorted_ns: List[int], q: float) -> float:
+    return sorted_ns[min(len(sorted_ns) - 1, int(round(q * (len(sorted_ns) - 1))))] / 1000.0
+
+def summarize(lat_ns: List[int], ops: Optional[int] = None) -> Dict[str, float]:
+    """지연(µs) 분포 + 초당 처리량."""
+    s = sorted(lat_ns)
+    total = sum(s)
+    return {"n": len(s), "mean_us": round(total / len(s) / 1000.0, 3),
+            "p50_us": round(_pct(s, 0.50), 3), "p99_us": round(_pct(s, 0.99), 3),
+            "max_us": round(s[-1] / 1000.0, 3),
+            "ops_per_s": round((ops or len(s)) / (total / 1e9), 1) if total else 0.0}
+
+def timed(fn: Callable[[Any], Any], args: List[Any], repeat: int = 1) -> Dict[str, float]:
+    lat: List[int] = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for a in args:
+            t0 = clock()
+            fn(a)
+            lat.append(clock() - t0)
+    return summarize(lat)
+
+
+# ── micro ────────────────────────────────────
+def _prepare(seus: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """SEU별 metas / raws / I·E 축을 미리 계산 (축 합성 벤치 입력)."""
+    out = []
+    for s in seus:
+        metas = {}
+        for ch, ref in s["raws"].items():
+            feat = {"raw_ref": ref, "raw_hash": A.stable_hash(ref), "signal": A.extract_signal(ch, ref)}
+            metas[ch] = A._channel_meta(ch, feat)
+        out.append({"metas": metas, "raws": s["raws"],
+                    "i": A.syn_i(metas, s["raws"]), "e": A.syn_e(metas, s["raws"])})
+    return out
+
+def _load_stores(seus: List[Dict[str, Any]]) -> None:
+    for s in seus:
+        for ch, ref in s["raws"].items():
+            A._register_raw(A.ChannelRawRegisterRequest(seu_id=s["seu_id"], channel_id=ch,
+                                                        ts_start=s["ts_start"], ts_end=s["ts_end"], raw_ref=ref))
+        A._ensure_metas(s["seu_id"])
+
+def run_micro(seus: List[Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, float]]:
+    pairs = [(ch, ref) for s in seus for ch, ref in s["raws"].items()]
+    feats = [(ch, {"raw_ref": ref, "raw_hash": f"bench:{n}:{A.stable_hash(ref)}",
+                   "signal": A.extract_signal(ch, ref)}) for n, (ch, ref) in enumerate(pairs)]
+    prep  = _prepare(seus)
+    res = {
+        "extract_signal":     timed(lambda p: A.extract_signal(*p), pairs, repeat),
+        # 고유 raw_hash → 메모 미스 경로 (메타 생성 + LRU 삽입)
+        "build_channel_meta": timed(lambda f: A.build_channel_meta(*f), feats),
+        "syn_c":              timed(lambda p: A.syn_c(p["metas"], p["raws"]), prep, repeat),
+        "syn_i":              timed(lambda p: A.syn_i(p["metas"], p["raws"]), prep, repeat),
+        "syn_e":              timed(lambda p: A.syn_e(p["metas"], p["raws"]), prep, repeat),
+        "synthesize_m":       timed(lambda p: A.synthesize_m(None, None, p["i"], p["e"], p["metas"], p["raws"]),
+                                    prep, repeat),
+    }
+    _load_stores(seus)
+    res["synthesize_cube"] = timed(lambda s: A.synthesize_cube(s["seu_id"]), seus, repeat)
+    return res
+
+
+# ── macro ────────────────────────────────────
+def _flow(client, s: Dict[str, Any], stage_ns: Dict[str, List[int]]) -> None:
+    clock = time.perf_counter_ns
+    t0 = clock()
+    r = client.post("/seu", json={"seu_id": s["seu_id"], "device_id": s["device_id"],
+                                  "time": {"ts_start": s["ts_start"], "ts_end": s["ts_end"],
+                                           "duration_ms": s["duration_ms"]}})
+    r.raise_for_status()
+    t1 = clock()
+    for ch, ref in s["raws"].items():
+        r = client.post("/channel/raw", json={"seu_id": s["seu_id"], "channel_id": ch, "ts_start": s["ts_start"],
+                                              "ts_end": s["ts_end"], "raw_ref": ref})
+        r.raise_for_status()
+    t2 = clock()
+    r = client.post("/cube/build", json={"seu_id": s["seu_id"]})
+    r.raise_for_status()
+    t3 = clock()
+    stage_ns["seu"].append(t1 - t0)
+    stage_ns["channel_raw_x8"].append(t2 - t1)
+    stage_ns["cube_build"].append(t3 - t2)
+    stage_ns["flow"].append(t3 - t0)
+
+def run_macro(seus: List[Dict[str, Any]], warmup: int = 20) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    with TestClient(A.app) as client:
+        scratch: Dict[str, List[int]] = {k: [] for k in ("seu", "channel_raw_x8", "cube_build", "flow")}
+        for s in gen_seus(warmup, seed=7, prefix="warmup"):
+            _flow(client, s, scratch)
+
+        stage_ns: Dict[str, List[int]] = {k: [] for k in scratch}
+        t0 = time.perf_counter()
+        for s in seus:
+            _flow(client, s, stage_ns)
+        wall = time.perf_counter() - t0
+
+        # 메모리는 별도 패스에서 측정 (tracemalloc 오버헤드가 지연 수치에 섞이지 않도록)
+        mem_seus = [{**s, "seu_id": s["seu_id"] + "_mem"} for s in seus]
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        for s in mem_seus:
+            _flow(client, s, {k: [] for k in scratch})
+        cur, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seus":            len(seus),
+        "requests":        len(seus) * 10,
+        "wall_s":          round(wall, 3),
+        "seus_per_s":      round(len(seus) / wall, 1),
+        "requests_per_s":  round(len(seus) * 10 / wall, 1),
+        "latency":         {k: summarize(v) for k, v in stage_ns.items()},
+        "peak_mem_bytes":  peak - base,
+        "retained_bytes":  cur - base,
+        "bytes_per_seu":   round((cur - base) / len(seus), 1),
+    }
+
+
+# ── memory ───────────────────────────────────
+def _deep_size(o: Any, seen: set) -> int:
+    """sys.getsizeof 재귀 합 — 이미 센 객체(메모 공유 레코드·intern 문자열)는 한 번만 센다."""
+    total, stack = 0, [o]
+    while stack:
+        x = stack.pop()
+        if id(x) in seen:
+            continue
+        seen.add(id(x))
+        total += sys.getsizeof(x)
+        if isinstance(x, (dict, MappingProxyType)):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            stack.extend(x)
+        else:
+            for cls in type(x).__mro__:
+                stack.extend(getattr(x, k) for k in cls.__dict__.get("__slots__", ()) if hasattr(x, k))
+            if hasattr(x, "__dict__"):
+                stack.append(x.__dict__)
+    return total
+
+def run_memory(seus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    SEU를 적재·빌드한 뒤 그 SEU들이 저장소에 남긴 객체(키 포함)의 크기를 저장소별로 합쳐 SEU 수로 나눈다.
+    테이블 dict 자체의 해시 슬롯은 빼고 센다. 여러 SEU가 공유하는 객체는 한 번만 센다.
+    """
+    if A.STORE.name != "memory":
+        return {"skipped": f"store backend is {A.STORE.name}"}
+    _load_stores(seus)
+    A._build_cubes([s["seu_id"] for s in seus])
+    seen: set = set()
+    sids  = {s["seu_id"] for s in seus}
+    chk   = {A.key(sid, ch) for sid in sids for ch in A.CHANNELS}
+    rids  = {rid for sid in sids for rid in A.RAW_BY_SEU.get(sid, {}).values()}
+    # (저장소, 테이블, 이 SEU들의 키) — 테이블의 키·값 객체를 그대로 센다 (임시 객체의 id는 재사용될 수 있다)
+    tables = [("raw", A.RAW_BY_SEU, sids), ("raw", A.RAW_STORE, rids),
+              ("feature", A.FEATURE_STORE, chk), ("meta", A.META_STORE, chk), ("cube", A.CUBE_STORE, sids),
+              ("seu", A.SEU_STORE, sids), ("seu", getattr(A, "SEU_RECORDS", {}), sids)]  # 역색인 없는 트리면 빈 dict
+    sizes = {"raw": 0, "feature": 0, "meta": 0, "cube": 0, "seu": 0}
+    for store, table, keys in tables:
+        for k, v in table.items():
+            if k in keys:
+                sizes[store] += _deep_size(k, seen) + _deep_size(v, seen)
+    per = {k: round(v / len(seus), 1) for k, v in sizes.items()}
+    per["total"] = round(sum(sizes.values()) / len(seus), 1)
+    return {"seus": len(seus), "bytes_per_seu": per}
+
+
+# ── 결과 저장·비교 ────────────────────────────
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _rows(result: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    rows = {f"micro.{k}": v for k, v in result.get("micro", {}).items()}
+    rows.update({f"macro.{k}": v for k, v in result.get("macro", {}).get("latency", {}).items()})
+    return rows
+
+def compare(base: Dict[str, Any], cur: Dict[str, Any]) -> None:
+    print(f"\n{'benchmark':28} {'base p50':>10} {'cur p50':>10} {'Δ':>8}   {'base p99':>10} {'cur p99':>10} {'Δ':>8}")
+    b_rows = _rows(base)
+    for name, c in _rows(cur).items():
+        b = b_rows.get(name)
+        if not b:
+            continue
+        d50 = (c["p50_us"] / b["p50_us"] - 1) * 100 if b["p50_us"] else 0.0
+        d99 = (c["p99_us"] / b["p99_us"] - 1) * 100 if b["p99_us"] else 0.0
+        print(f"{name:28} {b['p50_us']:>10.1f} {c['p50_us']:>10.1f} {d50:>+7.1f}%   "
+              f"{b['p99_us']:>10.1f} {c['p99_us']:>10.1f} {d99:>+7.1f}%")
+    bmem = base.get("memory", {}).get("bytes_per_seu", {})
+    for k, v in cur.get("memory", {}).get("bytes_per_seu", {}).items():
+        if bmem.get(k):
+            print(f"{'memory.' + k + ' B/SEU':28} {bmem[k]:>10.0f} {v:>10.0f} {(v / bmem[k] - 1) * 100:>+7.1f}%")
+    bm, cm = base.get("macro"), cur.get("macro")
+    if bm and cm:
+        print(f"{'macro.seus_per_s':28} {bm['seus_per_s']:>10.1f} {cm['seus_per_s']:>10.1f} "
+              f"{(cm['seus_per_s'] / bm['seus_per_s'] - 1) * 100:>+7.1f}%")
+        print(f"{'macro.peak_mem_bytes':28} {bm['peak_mem_bytes']:>10} {cm['peak_mem_bytes']:>10} "
+              f"{(cm['peak_mem_bytes'] / max(bm['peak_mem_bytes'], 1) - 1) * 100:>+7.1f}%")
+
+def report(result: Dict[str, Any]) -> None:
+    print(f"{'benchmark':28} {'n':>7} {'p50 µs':>10} {'p99 µs':>10} {'ops/s':>12}")
+    for name, r in _rows(result).items():
+        print(f"{name:28} {r['n']:>7} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {r['ops_per_s']:>12.1f}")
+    m = result.get("macro")
+    if m:
+        print(f"\nmacro: {m['seus']} SEUs ({m['requests']} requests) in {m['wall_s']}s — "
+              f"{m['seus_per_s']} SEU/s, {m['requests_per_s']} req/s, "
+              f"peak {m['peak_mem_bytes'] / 1024:.0f} KiB, retained {m['bytes_per_seu']:.0f} B/SEU")
+    mem = result.get("memory", {}).get("bytes_per_seu")
+    if mem:
+        print("\nstore bytes per SEU: " + ", ".join(f"{k} {v:.0f}" for k, v in mem.items()))
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description="PAI cube pipeline benchmarks")
+    ap.add_argument("--seus", type=int, default=500, help="합성 SEU 수")
+    ap.add_argument("--repeat", type=int, default=3, help="micro 반복 횟수")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--only", choices=["micro", "macro", "memory"], help="하나만 실행")
+    ap.add_argument("--out", help="결과 JSON 경로 (기본: bench-<git rev>.json)")
+    ap.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = ap.parse_args(argv)
+
+    rev = _git_rev()
+    result: Dict[str, Any] = {
+        "meta": {"git_rev": rev, "created_at": A.now_iso(), "python": platform.python_version(),
+                 "numpy": A.np.__version__, "platform": platform.platform(),
+                 "store_backend": A.STORE.name, "memo_size": A.MEMO_SIZE,
+                 "seus": args.seus, "repeat": args.repeat, "seed": args.seed},
+    }
+    if args.only in (None, "micro"):
+        result["micro"] = run_micro(gen_seus(args.seus, args.seed, prefix="micro"), args.repeat)
+    if args.only in (None, "macro"):
+        result["macro"] = run_macro(gen_seus(args.seus, args.seed + 1, prefix="macro"))
+    if args.only in (None, "memory"):
+        result["memory"] = run_memory(gen_seus(args.seus, args.seed + 2, prefix="memory"))
+
+    report(result)
+    out = args.out or f"bench-{rev or 'local'}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\nsaved → {out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
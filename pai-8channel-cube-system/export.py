@@ -0,0 +1,158 @@
+"""
+큐브 열 지향 내보내기 — Arrow IPC 스트림 / Parquet (pyarrow 선택 의존성).
+
+한 SEU = 한 행. 중첩된 큐브를 평평한 열로 편다:
+- seu_id, device_id, ts_start, ts_end, duration_ms, created_at
+- C·I·E 축 값과 수치 (c_value, c_confidence, i_intensity, e_valence, ...)
+- cognitive_mode, mode_score, mode_<모드> (mode_scores)
+- 채널별 ch<n>_activation / ch<n>_confidence / ch<n>_signal_type (큐브에 기록된 채널 메타)
+
+CubeExporter.stream()은 행을 row_group개씩 모아 레코드 배치 하나로 쓰고, 그때까지 나온 바이트를 곧바로 내보낸다
+— 메모리는 내보내는 큐브 수와 무관하게 행 그룹 하나 크기로 묶인다.
+
+CLI (서버의 GET /export/cubes를 파일로 받는다):
+
+    python export.py -o cubes.parquet --ts-from 2026-10-01 --ts-to 2026-11-01
+    python export.py -o cubes.arrows --format arrow --device dev_01 --row-group 50000
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import shutil
+import sys
+import urllib.parse
+import urllib.request
+
+try:
+    import pyarrow as pa  # 선택 의존성 — 없으면 내보내기만 쓸 수 없다
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMATS = {"parquet": ("application/vnd.apache.parquet", "parquet"),
+           "arrow":   ("application/vnd.apache.arrow.stream", "arrows")}
+
+# (열 이름, 종류, 큐브 축, 축 안의 키)
+_AXIS_COLUMNS = [
+    ("c_value", "str", "c", "value"), ("c_confidence", "f64", "c", "confidence"),
+    ("i_value", "str", "i", "value"), ("i_intensity", "f64", "i", "intensity"), ("i_confidence", "f64", "i", "confidence"),
+    ("e_value", "str", "e", "value"), ("e_valence", "f64", "e", "valence"), ("e_body_state", "str", "e", "body_state"),
+    ("e_confidence", "f64", "e", "confidence"),
+]
+
+
+class _Chunks:
+    """쓰기 전용 파일 흉내 — 쓴 바이트를 모아 두었다가 drain()으로 꺼낸다."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.pos    = 0
+        self.closed = False
+
+    def write(self, b) -> int:
+        self.parts.append(bytes(b))
+        self.pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self.pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out, self.parts = b"".join(self.parts), []
+        return out
+
+
+class CubeExporter:
+
+    def __init__(self, channels: List[str], modes: List[str]):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for columnar export")
+        self.channels = list(channels)
+        self.modes    = list(modes)
+        kinds = {"str": pa.string(), "f64": pa.float64(), "i64": pa.int64()}
+        cols  = [("seu_id", "str"), ("device_id", "str"), ("ts_start", "str"), ("ts_end", "str"),
+                 ("duration_ms", "i64"), ("created_at", "str")]
+        cols += [(name, kind) for name, kind, _, _ in _AXIS_COLUMNS]
+        cols += [("cognitive_mode", "str"), ("mode_score", "f64")]
+        cols += [(f"mode_{m}", "f64") for m in self.modes]
+        for ch in self.channels:
+            n = ch.lower()
+            cols += [(f"{n}_activation", "f64"), (f"{n}_confidence", "f64"), (f"{n}_signal_type", "str")]
+        self.schema = pa.schema([(name, kinds[kind]) for name, kind in cols])
+
+    def row(self, seu_id: str, device_id: Optional[str], cube: Dict[str, Any]) -> List[Any]:
+        """저장 형태(compact)든 전체 형태든 같은 키만 읽는다 — 펼치지 않는다."""
+        t, m, pai = cube["t"], cube["m"], cube.get("pai", {})
+        out = [seu_id, device_id, t.get("ts_start"), t.get("ts_end"), t.get("duration_ms"), pai.get("created_at")]
+        out += [cube[axis].get(k) for _, _, axis, k in _AXIS_COLUMNS]
+        scores = m.get("mode_scores", {})
+        out += [m.get("cognitive_mode"), m.get("mode_score")]
+        out += [scores.get(mk) for mk in self.modes]
+        metas = cube.get("channel_metas", {})
+        for ch in self.channels:
+            cm = metas.get(ch, {})
+            out += [cm.get("activation"), cm.get("confidence"), cm.get("signal_type")]
+        return out
+
+    def _batch(self, rows: List[List[Any]]):
+        cols = list(zip(*rows))
+        return pa.RecordBatch.from_arrays([pa.array(c, type=f.type) for c, f in zip(cols, self.schema)],
+                                          schema=self.schema)
+
+    def stream(self, rows: Iterable[Tuple[str, Optional[str], Dict[str, Any]]], fmt: str = "parquet",
+               row_group: int = 10000) -> Iterator[bytes]:
+        """(seu_id, device_id, cube) 행을 받아 인코딩된 바이트 조각을 차례로 내보낸다 (행 그룹마다 한 번)."""
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format: {fmt}")
+        sink   = _Chunks()
+        writer = (pq.ParquetWriter(sink, self.schema) if fmt == "parquet"
+                  else pa.ipc.new_stream(sink, self.schema))
+        buf: List[List[Any]] = []
+        try:
+            for seu_id, device_id, cube in rows:
+                buf.append(self.row(seu_id, device_id, cube))
+                if len(buf) >= row_group:
+                    writer.write_batch(self._batch(buf))
+                    buf = []
+                    yield sink.drain()
+            if buf:
+                writer.write_batch(self._batch(buf))
+        finally:
+            writer.close()
+        yield sink.drain()
+
+
+# ── CLI ──────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Export PAI cubes as Parquet / Arrow IPC")
+    ap.add_argument("-o", "--out", required=True, help="출력 파일 (- 이면 stdout)")
+    ap.add_argument("--url", default="http://127.0.0.1:8000", help="PAI 서버 주소")
+    ap.add_argument("--format", choices=list(FORMATS), default="parquet")
+    ap.add_argument("--ts-from", help="ts_start 하한 (포함, ISO 문자열)")
+    ap.add_argument("--ts-to", help="ts_start 상한 (제외)")
+    ap.add_argument("--device", help="device_id")
+    ap.add_argument("--mode", help="cognitive_mode")
+    ap.add_argument("--row-group", type=int, default=10000, help="행 그룹 크기")
+    args = ap.parse_args(argv)
+
+    params = {"format": args.format, "row_group": args.row_group, "ts_from": args.ts_from, "ts_to": args.ts_to,
+              "device_id": args.device, "mode": args.mode}
+    url = args.url.rstrip("/") + "/export/cubes?" + urllib.parse.urlencode(
+        {k: v for k, v in params.items() if v is not None})
+    with urllib.request.urlopen(url) as resp:
+        if args.out == "-":
+            shutil.copyfileobj(resp, sys.stdout.buffer, 1 << 20)
+        else:
+            with open(args.out, "wb") as f:
+                shutil.copyfileobj(resp, f, 1 << 20)
+
+
+if __name__ == "__main__":
+    main()
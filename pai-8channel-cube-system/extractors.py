@@ -0,0 +1,189 @@
+"""
+채널 추출기 레지스트리.
+
+채널마다 추출기 fn(t, tl) -> (activation, signal_type)을 실행 정책과 함께 등록한다:
+- inline  : 호출한 스레드에서 바로 (기본 — 키워드 휴리스틱처럼 가벼운 추출기)
+- thread  : 공유 스레드 풀
+- process : 공유 프로세스 풀 (CPU를 오래 쓰는 영상·음성·생체 추출기; fn은 모듈 최상위 함수여야 한다)
+
+run_many()는 풀 작업을 먼저 제출하고 inline 작업을 처리한 뒤 결과를 모은다.
+풀 작업이 timeout을 넘기거나 예외를 내면 그 채널의 fallback(키워드 휴리스틱)으로 대신한다.
+timeout이 난 풀은 그 호출의 결과를 다 모은 뒤 새 풀로 바꾼다 — 멈춘 작업이 슬롯을 계속 쥐지 않도록
+프로세스 풀은 워커를 종료하고, 스레드 풀은 (스레드를 죽일 수 없으므로) 버리고 새로 만든다.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import importlib
+import multiprocessing
+import threading
+import time
+
+Extract = Callable[[str, str], Tuple[float, str]]
+POLICIES = ("inline", "thread", "process")
+
+
+def _noop() -> None:
+    pass
+
+
+def _invoke(fn: Extract, t: str) -> Tuple[float, str]:
+    # 프로세스 풀로는 원문 한 벌만 보내고 소문자화는 작업 쪽에서
+    return fn(t, t.lower())
+
+
+class Extractor:
+    __slots__ = ("channel", "fn", "policy", "timeout", "name")
+
+    def __init__(self, channel: str, fn: Extract, policy: str = "inline", timeout: Optional[float] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown extractor policy: {policy}")
+        self.channel = channel
+        self.fn      = fn
+        self.policy  = policy
+        self.timeout = timeout
+        self.name    = f"{fn.__module__}:{fn.__qualname__}"
+
+
+class ExtractorRegistry:
+
+    def __init__(self, fallbacks: Dict[str, Extract], threads: int = 8, processes: int = 2,
+                 mp_context: str = "spawn", default_timeout: float = 5.0):
+        self.fallbacks       = dict(fallbacks)
+        self.default_timeout = default_timeout
+        self.extractors: Dict[str, Extractor] = {ch: Extractor(ch, fn) for ch, fn in fallbacks.items()}
+        self.calls:     Dict[str, int] = {}
+        self.fallback_counts: Dict[Tuple[str, str], int] = {}
+        self.recycled:  Dict[str, int] = {"thread": 0, "process": 0}
+        self._threads, self._processes, self._mp_context = threads, processes, mp_context
+        self._thread_pool:  Optional[ThreadPoolExecutor]  = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    # ── 등록 ──
+    def register(self, channel: str, fn: Optional[Extract] = None, policy: str = "inline",
+                 timeout: Optional[float] = None) -> Extractor:
+        """fn을 생략하면 기본(휴리스틱) 추출기를 그대로 두고 정책·타임아웃만 바꾼다."""
+        ex = Extractor(channel, fn or self.fallbacks[channel], policy, timeout)
+        self.extractors[channel] = ex
+        return ex
+
+    def load_spec(self, spec: str) -> None:
+        """
+        "CH1=pkg.video:extract@process:2.5, CH2=@thread" 형식.
+        채널=[모듈:함수][@정책[:타임아웃초]] — 모듈을 비우면 기본 추출기.
+        """
+        for item in filter(None, (s.strip() for s in spec.split(","))):
+            channel, _, rest = item.partition("=")
+            target, _, pol   = rest.partition("@")
+            policy, _, tmo   = pol.partition(":")
+            fn = None
+            if target:
+                mod, _, attr = target.partition(":")
+                fn = getattr(importlib.import_module(mod), attr)
+            self.register(channel.strip(), fn, policy or "inline", float(tmo) if tmo else None)
+
+    # ── 실행 ──
+    def _pool(self, policy: str):
+        with self._lock:
+            if policy == "thread":
+                if self._thread_pool is None:
+                    self._thread_pool = ThreadPoolExecutor(self._threads, thread_name_prefix="pai-extract")
+                return self._thread_pool
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    self._processes, mp_context=multiprocessing.get_context(self._mp_context))
+            return self._process_pool
+
+    def _recycle(self, policy: str, pool) -> None:
+        """timeout이 난 풀을 떼어내고 닫는다 — 다음 _pool() 호출이 새 풀을 만든다. 이미 바뀐 풀이면 그대로."""
+        with self._lock:
+            attr = "_thread_pool" if policy == "thread" else "_process_pool"
+            if getattr(self, attr) is not pool:
+                return
+            setattr(self, attr, None)
+            self.recycled[policy] += 1
+        procs = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for proc in procs:  # 실행 중인 작업은 cancel로 멈추지 않는다 — 워커를 직접 종료
+            if proc.is_alive():
+                proc.terminate()
+
+    def _fallback(self, channel: str, t: str, reason: str) -> Tuple[float, str]:
+        with self._lock:
+            self.fallback_counts[(channel, reason)] = self.fallback_counts.get((channel, reason), 0) + 1
+        return self.fallbacks[channel](t, t.lower())
+
+    def run_many(self, jobs: List[Tuple[str, str]]) -> List[Tuple[Tuple[float, str], Optional[str], float]]:
+        """
+        jobs: [(channel, 원문)] → [((activation, signal_type), fallback 사유 또는 None, 소요 초)].
+        풀 작업은 동시에 돌고, 각 작업은 제출 시점부터 자기 timeout까지 기다린다.
+        """
+        out: List[Any] = [None] * len(jobs)
+        pending: List[Tuple[int, Extractor, Any, Future, float]] = []
+        stale: Dict[int, Tuple[str, Any]] = {}
+        clock = time.perf_counter
+        for idx, (ch, t) in enumerate(jobs):
+            ex = self.extractors.get(ch)
+            if ex is not None and ex.policy != "inline":
+                try:
+                    pool = self._pool(ex.policy)
+                    pending.append((idx, ex, pool, pool.submit(_invoke, ex.fn, t), clock()))
+                except RuntimeError:  # 풀이 종료됨
+                    out[idx] = (self._fallback(ch, t, "error"), "error", 0.0)
+        for idx, (ch, t) in enumerate(jobs):
+            ex = self.extractors.get(ch)
+            if ex is None or ex.policy != "inline":
+                continue
+            t0 = clock()
+            try:
+                res, reason = ex.fn(t, t.lower()), None
+            except Exception:
+                if ex.fn is self.fallbacks.get(ch):
+                    raise
+                res, reason = self._fallback(ch, t, "error"), "error"
+            out[idx] = (res, reason, clock() - t0)
+        for idx, ex, pool, fut, t0 in pending:
+            ch, t   = jobs[idx]
+            timeout = ex.timeout if ex.timeout is not None else self.default_timeout
+            try:
+                res, reason = fut.result(timeout=max(0.0, t0 + timeout - clock())), None
+            except FutureTimeout:
+                if not fut.cancel():  # 이미 실행 중 — 끝날 때까지 풀 슬롯을 쥐므로 풀을 바꾼다
+                    stale[id(pool)] = (ex.policy, pool)
+                res, reason = self._fallback(ch, t, "timeout"), "timeout"
+            except Exception:
+                res, reason = self._fallback(ch, t, "error"), "error"
+            out[idx] = (res, reason, clock() - t0)
+        for policy, pool in stale.values():
+            self._recycle(policy, pool)
+        with self._lock:
+            for ch, _ in jobs:
+                self.calls[ch] = self.calls.get(ch, 0) + 1
+        return out
+
+    def warm(self) -> None:
+        """process 정책 추출기가 있으면 워커를 미리 띄운다 (첫 요청이 프로세스 기동 시간을 떠안지 않도록)."""
+        if any(ex.policy == "process" for ex in self.extractors.values()):
+            pool = self._pool("process")
+            for f in [pool.submit(_noop) for _ in range(self._processes)]:
+                f.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools, self._thread_pool, self._process_pool = (self._thread_pool, self._process_pool), None, None
+        for p in pools:
+            if p is not None:
+                p.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "extractors": {ch: {"name": ex.name, "policy": ex.policy,
+                                "timeout": ex.timeout if ex.timeout is not None else
+                                (None if ex.policy == "inline" else self.default_timeout),
+                                "calls": self.calls.get(ch, 0)}
+                           for ch, ex in self.extractors.items()},
+            "fallbacks": [{"channel": ch, "reason": r, "count": n} for (ch, r), n in self.fallback_counts.items()],
+            "pools_recycled": dict(self.recycled),
+        }
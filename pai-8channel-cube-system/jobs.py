@@ -0,0 +1,174 @@
+"""
+비동기 큐브 빌드 작업 큐.
+
+- submit(seu_id)   : 대기 중인 같은 seu_id 작업이 있으면 그 작업에 합친다(coalesce), 없으면 새 작업을 큐에 넣는다
+- 큐가 capacity만큼 차 있으면 QueueFull(retry_after) — 호출자는 429 + Retry-After로 돌려준다
+- 워커 스레드 : 큐에서 최대 batch개를 한 번에 꺼내 run(seu_ids, job_ids)으로 배치 빌드한다
+
+워커는 요청 스레드 풀과 별개라 빌드가 몰려도 다른 엔드포인트의 지연은 늘지 않는다.
+끝난 작업은 상태 조회를 위해 최근 history개까지 남긴다.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import math
+import threading
+import time
+import uuid
+
+# run(seu_ids, job_ids) → 항목별 결과 dict ("status" == "cube_written"이면 성공)
+Run = Callable[[List[str], List[str]], List[Dict[str, Any]]]
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"build queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    __slots__ = ("job_id", "seu_id", "status", "submitted_at", "started_at", "finished_at", "coalesced", "result")
+
+    def __init__(self, seu_id: str):
+        self.job_id       = uuid.uuid4().hex
+        self.seu_id       = seu_id
+        self.status       = "queued"   # queued → running → done | failed
+        self.submitted_at = time.time()
+        self.started_at: Optional[float]  = None
+        self.finished_at: Optional[float] = None
+        self.coalesced    = 0          # 이 작업에 합쳐진 중복 요청 수
+        self.result: Optional[Dict[str, Any]] = None
+
+    def view(self) -> Dict[str, Any]:
+        out = {"job_id": self.job_id, "seu_id": self.seu_id, "status": self.status,
+               "submitted_at": self.submitted_at, "started_at": self.started_at,
+               "finished_at": self.finished_at, "coalesced": self.coalesced}
+        if self.result is not None:
+            out["result"] = self.result
+        return out
+
+
+class BuildQueue:
+
+    def __init__(self, run: Run, capacity: int = 1024, workers: int = 4, batch: int = 32, history: int = 10000):
+        self.run      = run
+        self.capacity = capacity
+        self.workers  = workers
+        self.batch    = batch
+        self.history  = history
+        self.counts   = {"submitted": 0, "coalesced": 0, "rejected": 0, "done": 0, "failed": 0}
+        self._queue:   Deque[Job] = deque()
+        self._pending: Dict[str, Job] = {}                   # seu_id → 대기 중 작업 (coalesce 대상)
+        self._jobs:    "OrderedDict[str, Job]" = OrderedDict()
+        self._running  = 0
+        self._batch_secs = 0.0                               # 배치 소요 시간 EWMA (Retry-After 추정)
+        self._cond    = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed  = False
+
+    # ── 제출·조회 ──
+    def submit(self, seu_id: str) -> Job:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("build queue is shut down")
+            job = self._pending.get(seu_id)
+            if job is not None:
+                job.coalesced += 1
+                self.counts["coalesced"] += 1
+                return job
+            if len(self._queue) >= self.capacity:
+                self.counts["rejected"] += 1
+                raise QueueFull(self._retry_after())
+            job = Job(seu_id)
+            self._queue.append(job)
+            self._pending[seu_id] = job
+            self._remember(job)
+            self.counts["submitted"] += 1
+            if not self._threads:
+                self._start()
+            self._cond.notify()
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+        # 오래된 것부터 — 끝난 작업만 잊는다 (대기·실행 중 작업은 capacity·workers로 이미 묶여 있다)
+        while len(self._jobs) > self.history:
+            old_id, old = next(iter(self._jobs.items()))
+            if old.status in ("queued", "running"):
+                break
+            del self._jobs[old_id]
+
+    def _retry_after(self) -> int:
+        # 앞선 작업을 모두 비우는 데 걸릴 예상 시간 — 배치 소요 시간을 아직 모르면 1초
+        rounds = math.ceil(len(self._queue) / (self.workers * self.batch))
+        return max(1, math.ceil(rounds * self._batch_secs))
+
+    # ── 워커 ──
+    def _start(self) -> None:
+        for i in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"pai-build-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _take(self) -> Optional[List[Job]]:
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            jobs = [self._queue.popleft() for _ in range(min(self.batch, len(self._queue)))]
+            now  = time.time()
+            for job in jobs:
+                # 실행을 시작한 작업에는 더 합치지 않는다 — 그 사이 raw가 바뀌었을 수 있으므로 새 작업으로
+                del self._pending[job.seu_id]
+                job.status, job.started_at = "running", now
+            self._running += len(jobs)
+            return jobs
+
+    def _loop(self) -> None:
+        while True:
+            jobs = self._take()
+            if jobs is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                results = self.run([j.seu_id for j in jobs], [j.job_id for j in jobs])
+            except Exception as err:
+                results = [{"status": "error", "status_code": 500, "detail": str(err)}] * len(jobs)
+            secs = time.perf_counter() - t0
+            now  = time.time()
+            with self._cond:
+                for job, res in zip(jobs, results):
+                    job.status      = "done" if res.get("status") == "cube_written" else "failed"
+                    job.result      = res
+                    job.finished_at = now
+                    self.counts[job.status] += 1
+                self._running   -= len(jobs)
+                self._batch_secs = secs if not self._batch_secs else 0.3 * secs + 0.7 * self._batch_secs
+
+    def shutdown(self, wait: bool = True) -> None:
+        """새 제출을 막고, 대기 중 작업은 failed로 닫는다. 실행 중인 배치는 끝까지 돈다."""
+        with self._cond:
+            self._closed = True
+            now = time.time()
+            while self._queue:
+                job = self._queue.popleft()
+                job.status, job.finished_at = "failed", now
+                job.result = {"status": "error", "status_code": 503, "detail": "server shutting down"}
+                self.counts["failed"] += 1
+            self._pending.clear()
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+        self._threads = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"queued": len(self._queue), "running": self._running, "capacity": self.capacity,
+                    "workers": self.workers, "batch": self.batch, "tracked_jobs": len(self._jobs),
+                    "batch_seconds_ewma": round(self._batch_secs, 6), **self.counts}
@@ -0,0 +1,212 @@
+"""
+메모리 백엔드 상태의 스냅숏 + 선행 기록 저널 (PAI_STATE_DIR).
+
+디렉터리 안의 파일:
+- journal-<gen>.log  : 변경 기록을 덧붙이는 세그먼트. 레코드 = [길이 u32][crc32 u32][헤더 길이 u32][헤더 pickle][값 pickle]
+                       헤더는 (op, 이름, 키) — 값과 따로 인코딩해 재생 때 헤더만 먼저 읽는다
+- snapshot-<gen>.bin : gen 세그먼트 직전까지의 전체 상태 (pickle 한 덩어리)
+
+- 쓰기   : append()는 인코딩된 레코드를 버퍼에 넣기만 한다. 플러셔 스레드가 batch건이 쌓이거나 interval초마다
+           한 번의 write + fsync로 내려 쓴다(그룹 커밋) — 크래시 때 잃는 것은 마지막 interval 동안의 쓰기뿐
+- 스냅숏 : 호출자가 rotate()로 새 세그먼트를 열면서 상태를 잘라 내고, write_snapshot(gen, state)로 쓴다.
+           쓰는 동안에도 저널은 새 세그먼트로 계속 받는다. 다 쓰면 그 이전 스냅숏·세그먼트를 지운다
+- 복구   : load()가 가장 최근 스냅숏을 mmap으로 열어 역직렬화하고, replay()가 그 gen부터의 세그먼트를 읽는다.
+           헤더만 훑어 같은 키의 마지막 기록만 남기고(superseded는 값을 풀지 않는다) 그 값만 역직렬화한다.
+           크래시 중 쓰다 만 끝 레코드는 길이·crc로 걸러 버린다(torn_bytes). 기동 후 쓰기는 항상 새 세그먼트로
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+import zlib
+
+_FRAME   = struct.Struct("<III")
+_FILE_RE = re.compile(r"^(journal|snapshot)-(\d{8})\.(log|bin)$")
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+class Journal:
+
+    def __init__(self, root: str, batch: int = 1024, interval: float = 0.05):
+        os.makedirs(root, exist_ok=True)
+        self.root     = root
+        self.batch    = batch
+        self.interval = interval
+        self.gen      = 0
+        self.counts   = {"records": 0, "bytes": 0, "fsyncs": 0, "snapshots": 0}
+        self.since_snapshot = 0                       # 마지막 rotate 이후 받은 레코드 수
+        self._buf: List[bytes] = []
+        self._cond   = threading.Condition()
+        self._io     = threading.Lock()               # 파일 쓰기·교체 직렬화
+        self._f      = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 파일 ──
+    def _path(self, kind: str, gen: int) -> str:
+        return os.path.join(self.root, f"{kind}-{gen:08d}.{'log' if kind == 'journal' else 'bin'}")
+
+    def _files(self, kind: str) -> List[int]:
+        return sorted(int(m.group(2)) for m in map(_FILE_RE.match, os.listdir(self.root))
+                      if m is not None and m.group(1) == kind)
+
+    def _sync_dir(self) -> None:
+        fd = os.open(self.root, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ── 복구 ──
+    def load(self) -> Tuple[int, Optional[Any], int]:
+        """가장 최근 스냅숏 → (gen, 상태, 파일 크기). 없으면 (0, None, 0)."""
+        for gen in reversed(self._files("snapshot")):
+            path = self._path("snapshot", gen)
+            size = os.path.getsize(path)
+            if not size:
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return gen, pickle.loads(mm), size
+        return 0, None, 0
+
+    def replay(self, since: int, stats: Dict[str, int]) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+        """
+        since 이상 세그먼트에서 (헤더, 값)을 마지막 기록 순서대로. 같은 테이블·인덱스 키는 마지막 기록 하나만
+        (set/del, ix_put/ix_del), "x"(외부 상태)는 모두. stats에 segments / records / superseded / torn_bytes를 센다.
+        """
+        maps: List[mmap.mmap] = []
+        keep: Dict[Any, Tuple[int, int, int, Tuple[Any, ...]]] = {}   # 키 → (세그먼트, 값 시작, 끝, 헤더)
+        n_x = 0
+        try:
+            for gen in self._files("journal"):
+                if gen < since:
+                    continue
+                stats["segments"] = stats.get("segments", 0) + 1
+                with open(self._path("journal", gen), "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if not size:
+                        continue
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                maps.append(mm)
+                pos = 0
+                while pos + _FRAME.size <= size:
+                    n, crc, hlen = _FRAME.unpack_from(mm, pos)
+                    start = pos + _FRAME.size
+                    end   = start + n
+                    if end > size or hlen > n or zlib.crc32(mm[start:end]) != crc:
+                        break
+                    header = pickle.loads(mm[start:start + hlen])
+                    if header[0] == "x":
+                        k = n_x = n_x + 1
+                    else:
+                        k = ("i" if header[0].startswith("ix_") else "t", header[1], header[2])
+                        keep.pop(k, None)        # 다시 넣어 순서를 마지막 기록 위치로
+                    keep[k] = (len(maps) - 1, start + hlen, end, header)
+                    stats["records"] = stats.get("records", 0) + 1
+                    pos = end
+                stats["torn_bytes"] = stats.get("torn_bytes", 0) + size - pos
+            stats["superseded"] = stats.get("records", 0) - len(keep)
+            for i, vstart, end, header in keep.values():
+                yield header, pickle.loads(maps[i][vstart:end]) if end > vstart else None
+        finally:
+            for mm in maps:
+                mm.close()
+
+    def open(self) -> None:
+        """기존 파일 다음 gen으로 새 세그먼트를 열고 플러셔를 띄운다 (복구가 끝난 뒤 호출)."""
+        existing = self._files("journal") + self._files("snapshot")
+        self.gen = (max(existing) + 1) if existing else 1
+        self._f  = open(self._path("journal", self.gen), "ab")
+        self._sync_dir()
+        self._thread = threading.Thread(target=self._loop, name="pai-journal", daemon=True)
+        self._thread.start()
+
+    # ── 쓰기 ──
+    @staticmethod
+    def encode(header: Tuple[Any, ...], value: Any = None) -> bytes:
+        """header = (op, 이름[, 키]). 값이 없는 기록(del 등)은 value=None — 헤더만 싣는다."""
+        h    = pickle.dumps(header, PROTOCOL)
+        data = h if value is None else h + pickle.dumps(value, PROTOCOL)
+        return _FRAME.pack(len(data), zlib.crc32(data), len(h)) + data
+
+    def append(self, frame: bytes) -> None:
+        with self._cond:
+            self._buf.append(frame)
+            self.since_snapshot += 1
+            if len(self._buf) >= self.batch:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        with self._io:
+            with self._cond:
+                buf, self._buf = self._buf, []
+            if not buf or self._f is None:
+                return
+            data = b"".join(buf)
+            self._f.write(data)
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self.counts["records"] += len(buf)
+            self.counts["bytes"]   += len(data)
+            self.counts["fsyncs"]  += 1
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._buf and not self._closed:
+                    self._cond.wait(self.interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def rotate(self) -> int:
+        """버퍼를 지금 세그먼트에 내려 쓰고 다음 gen 세그먼트를 연다 → 새 gen (이 gen의 스냅숏이 곧 쓰인다)."""
+        self.flush()
+        with self._io:
+            self._f.close()
+            self.gen += 1
+            self._f = open(self._path("journal", self.gen), "ab")
+            self.since_snapshot = 0
+            return self.gen
+
+    def write_snapshot(self, gen: int, state: Any) -> int:
+        """상태를 snapshot-<gen>.bin으로 (임시 파일 → fsync → rename), 이전 스냅숏·세그먼트 정리 → 파일 크기."""
+        path = self._path("snapshot", gen)
+        tmp  = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp, path)
+        self._sync_dir()
+        for kind in ("snapshot", "journal"):
+            for old in self._files(kind):
+                if old < gen:
+                    os.remove(self._path(kind, old))
+        self.counts["snapshots"] += 1
+        return size
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        with self._io:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = len(self._buf)
+        return {"dir": self.root, "gen": self.gen, "pending": pending, "since_snapshot": self.since_snapshot,
+                "batch": self.batch, "fsync_interval_s": self.interval, **self.counts}
@@ -0,0 +1,241 @@
+"""
+파이프라인 계측 — Prometheus 텍스트 포맷(/metrics).
+
+- Counter / Histogram : 라벨 조합별 자식을 미리 꺼내 두고(labels()) 핫패스에서는 observe()/inc()만 호출
+- Gauge              : 스크레이프 시점에 콜백으로 값을 읽는다 (저장소 크기 등)
+- SamplingProfiler   : 켜 두면 주기적으로 스레드 스택을 샘플링해 이 패키지 안의 함수별 샘플 수를 센다
+
+외부 의존성 없음 — 자식마다 잠금 하나, observe 한 번은 bisect + 정수 증가 수준이다.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import os
+import sys
+import threading
+
+# 5µs ~ 2.5s — 채널 추출(µs)부터 배치 빌드(ms~s)까지
+DEFAULT_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+                   1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _fmt_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_esc(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _fmt_num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1.0) -> None:
+        with self._lock:
+            self.value += n
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # 마지막 칸 = +Inf
+        self.sum    = 0.0
+        self._lock  = threading.Lock()
+
+    def observe(self, v: float) -> None:
+        i = bisect_left(self.bounds, v)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += v
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()):
+        self.name       = name
+        self.doc        = doc
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, n: float = 1.0) -> None:
+        self.labels().inc(n)
+
+    def render(self) -> List[str]:
+        out = self._header()
+        for values, c in list(self._children.items()):
+            out.append(f"{self.name}_total{_fmt_labels(self.labelnames, values)} {_fmt_num(c.value)}")
+        return out
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, v: float) -> None:
+        self.labels().observe(v)
+
+    def render(self) -> List[str]:
+        out = self._header()
+        for values, h in list(self._children.items()):
+            with h._lock:
+                counts, total = list(h.counts), h.sum
+            acc = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                acc += n
+                le = 'le="%s"' % _fmt_num(bound)
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, values, le)} {acc}")
+            lbl = _fmt_labels(self.labelnames, values)
+            out.append(f"{self.name}_sum{lbl} {_fmt_num(total)}")
+            out.append(f"{self.name}_count{lbl} {acc}")
+        return out
+
+
+class Gauge(_Metric):
+    """스크레이프 시점에 fn()을 호출한다 — fn은 {라벨값 튜플: 값}을 돌려준다."""
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...],
+                 fn: Callable[[], Dict[Tuple[str, ...], float]]):
+        super().__init__(name, doc, labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        out = self._header()
+        for values, v in self.fn().items():
+            out.append(f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_num(v)}")
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, doc, labelnames, buckets))
+
+    def gauge(self, name: str, doc: str, labelnames: Tuple[str, ...],
+              fn: Callable[[], Dict[Tuple[str, ...], float]]) -> Gauge:
+        return self.register(Gauge(name, doc, labelnames, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self.metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    interval초마다 sys._current_frames()로 다른 스레드의 스택을 훑어
+    root 디렉터리 안에서 가장 안쪽 프레임(파일:함수)을 하나 센다. 대기 중인 스레드는 자연히 빠진다.
+    """
+
+    def __init__(self, root: str, interval: float = 0.01, top: int = 50):
+        self.root     = os.path.abspath(root)
+        self.interval = interval
+        self.top      = top
+        self.samples: Dict[str, int] = {}
+        self.ticks    = 0
+        self._stop    = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock    = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if interval:
+            self.interval = interval
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="pai-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+            self.ticks = 0
+
+    def _loop(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            hits = []
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                while frame is not None and not frame.f_code.co_filename.startswith(self.root):
+                    frame = frame.f_back
+                if frame is not None:
+                    code = frame.f_code
+                    hits.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            with self._lock:
+                self.ticks += 1
+                for h in hits:
+                    self.samples[h] = self.samples.get(h, 0) + 1
+
+    def snapshot(self) -> List[Tuple[str, int]]:
+        with self._lock:
+            return sorted(self.samples.items(), key=lambda kv: -kv[1])[:self.top]
+
+    def stats(self) -> Dict[str, object]:
+        return {"running": self.running, "interval_ms": round(self.interval * 1000, 3),
+                "ticks": self.ticks, "top": [{"frame": f, "samples": n} for f, n in self.snapshot()]}
@@ -0,0 +1,125 @@
+"""
+raw / 채널 메타 레코드 — dict 대신 __slots__ 클래스.
+
+- RawRecord   : POST /channel/raw 한 건. 채널 ID·정책 ID·seu_id·시각처럼 SEU 안팎에서 반복되는 문자열은
+                intern하고, 비어 있는 quality_flags / extra는 모듈 공용 빈 값(EMPTY_FLAGS / EMPTY_EXTRA)을 가리킨다.
+- ChannelMeta : 채널 메타. summary / source_channels는 필드에서 만들고, evidence_refs는 처음 쓸 때 한 번 만들어
+                붙여 둔다 — 큐브 evidence가 같은 dict를 가리키고, 메모로 공유되는 메타라 SEU마다 새로 생기지 않는다.
+
+레코드는 값 객체다 — 여러 SEU가 메모로 같은 ChannelMeta를 공유하므로 제자리 수정 금지.
+to_dict()는 이전 dict 레코드와 같은 모양(API 응답·SQLite 행), from_dict()는 그 역.
+pickle(스냅숏·저널)은 필드 값만 싣고 생성자로 복원하므로 intern과 공용 빈 값도 다시 적용된다.
+"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import sys
+
+EMPTY_FLAGS: Tuple[str, ...]  = ()
+EMPTY_EXTRA: Mapping[str, Any] = MappingProxyType({})
+
+_intern = sys.intern
+
+
+class Record:
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and all(getattr(self, k) == getattr(other, k) for k in self._fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={getattr(self, k)!r}' for k in self._fields)})"
+
+    def __reduce__(self):
+        # 생성자 인자 순서 = _fields (스냅숏·저널 pickle). 공용 빈 값(EMPTY_EXTRA)은 dict로 — __init__이 다시 가리킨다
+        return type(self), tuple(dict(v) if isinstance(v, MappingProxyType) else v
+                                 for v in (getattr(self, k) for k in self._fields))
+
+
+class RawRecord(Record):
+    _fields = ("raw_id", "seu_id", "channel_id", "ts_start", "ts_end", "raw_ref", "raw_hash",
+               "encryption_key_id", "retention_policy_id", "consent_policy_id",
+               "quality_flags", "extra", "version", "created_at")
+    __slots__ = _fields
+
+    def __init__(self, raw_id: str, seu_id: str, channel_id: str, ts_start: str, ts_end: str, raw_ref: str,
+                 raw_hash: str, encryption_key_id: str = "key_default", retention_policy_id: str = "retain_default",
+                 consent_policy_id: str = "consent_default", quality_flags: Sequence[str] = EMPTY_FLAGS,
+                 extra: Optional[Mapping[str, Any]] = None, version: int = 1, created_at: str = ""):
+        self.raw_id              = raw_id
+        self.seu_id              = _intern(seu_id)
+        self.channel_id          = _intern(channel_id)
+        self.ts_start            = _intern(ts_start)
+        self.ts_end              = _intern(ts_end)
+        self.raw_ref             = raw_ref
+        self.raw_hash            = raw_hash
+        self.encryption_key_id   = _intern(encryption_key_id)
+        self.retention_policy_id = _intern(retention_policy_id)
+        self.consent_policy_id   = _intern(consent_policy_id)
+        self.quality_flags       = tuple(_intern(f) for f in quality_flags) if quality_flags else EMPTY_FLAGS
+        self.extra               = extra if extra else EMPTY_EXTRA
+        self.version             = version
+        self.created_at          = _intern(created_at)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = super().to_dict()
+        out["quality_flags"] = list(self.quality_flags)
+        out["extra"]         = dict(self.extra)
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "RawRecord":
+        return cls(d["raw_id"], d["seu_id"], d["channel_id"], d["ts_start"], d["ts_end"], d["raw_ref"], d["raw_hash"],
+                   d.get("encryption_key_id", "key_default"), d.get("retention_policy_id", "retain_default"),
+                   d.get("consent_policy_id", "consent_default"), d.get("quality_flags") or EMPTY_FLAGS,
+                   d.get("extra"), d.get("version", 1), d.get("created_at", ""))
+
+
+class ChannelMeta(Record):
+    _fields = ("channel_id", "confidence", "activation", "signal_type", "raw_ref", "raw_hash")
+    __slots__ = _fields + ("_evidence",)
+
+    def __init__(self, channel_id: str, confidence: float, activation: float, signal_type: str,
+                 raw_ref: str, raw_hash: str):
+        self.channel_id  = _intern(channel_id)
+        self.confidence  = confidence
+        self.activation  = activation
+        self.signal_type = _intern(signal_type)
+        self.raw_ref     = raw_ref
+        self.raw_hash    = raw_hash
+        self._evidence: Optional[List[Dict[str, str]]] = None
+
+    @property
+    def summary(self) -> str:
+        return f"{self.channel_id}:{self.signal_type}@{self.activation:.2f}"
+
+    @property
+    def source_channels(self) -> List[str]:
+        return [self.channel_id]
+
+    @property
+    def evidence_refs(self) -> List[Dict[str, str]]:
+        if self._evidence is None:
+            self._evidence = [
+                {"kind": "raw_ref",    "ref": self.raw_ref},
+                {"kind": "raw_hash",   "ref": self.raw_hash},
+                {"kind": "signal",     "ref": self.signal_type},
+                {"kind": "activation", "ref": str(self.activation)},
+            ]
+        return self._evidence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"channel_id": self.channel_id, "confidence": self.confidence, "activation": self.activation,
+                "signal_type": self.signal_type, "summary": self.summary, "source_channels": self.source_channels,
+                "evidence_refs": self.evidence_refs}
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "ChannelMeta":
+        refs = {r["kind"]: r["ref"] for r in d.get("evidence_refs", ())}
+        return cls(d["channel_id"], d["confidence"], d["activation"], d["signal_type"],
+                   d.get("raw_ref", refs.get("raw_ref", "")), d.get("raw_hash", refs.get("raw_hash", "")))
@@ -0,0 +1,204 @@
+"""
+보존 정책(retention_policy_id) 집행.
+
+정책 레지스트리 — 이름별로:
+- ttl       : SEU가 처음 raw를 받은 뒤 ttl초가 지나면 축출
+- max_seus  : 이 정책 아래 SEU가 max_seus개를 넘으면 가장 오래된 것부터 축출
+- keep_cube : 축출할 때 raw·feature·meta만 지우고 큐브(와 SEU 레코드·인덱스)는 남긴다
+ttl도 max_seus도 없는 정책(기본 retain_default 포함)과 등록되지 않은 정책 ID는 영구 보존이다.
+
+RetentionManager는 만료 시각 순 힙 하나로 축출 후보를 관리한다. SEU를 다시 추적하면(정책 변경)
+새 gen으로 힙에 넣고 이전 항목은 꺼낼 때 gen이 달라 버려진다(지연 삭제). 백그라운드 스레드가
+interval마다 만기된 항목을 budget개까지만 처리하므로 전체 스캔 없이 조금씩 비운다.
+실제 삭제는 evict(seu_id, policy, reason, gen) 콜백 — 이미 새로 기록된 SEU면 None을 돌려 건너뛴다.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import threading
+import time
+
+# evict(seu_id, policy, reason, gen) → {저장소: 회수 바이트} 또는 None(그 사이 다시 기록됨)
+Evict = Callable[[str, "RetentionPolicy", str, str], Optional[Dict[str, int]]]
+
+
+class RetentionPolicy:
+    __slots__ = ("name", "ttl", "max_seus", "keep_cube")
+
+    def __init__(self, name: str, ttl: Optional[float] = None, max_seus: Optional[int] = None,
+                 keep_cube: bool = False):
+        self.name      = name
+        self.ttl       = ttl
+        self.max_seus  = max_seus
+        self.keep_cube = keep_cube
+
+    @property
+    def bounded(self) -> bool:
+        return self.ttl is not None or self.max_seus is not None
+
+    def view(self) -> Dict[str, Any]:
+        return {"ttl": self.ttl, "max_seus": self.max_seus, "keep_cube": self.keep_cube}
+
+
+class RetentionManager:
+
+    def __init__(self, evict: Evict, interval: float = 1.0, budget: int = 256, default: str = "retain_default"):
+        self.evict    = evict
+        self.interval = interval
+        self.budget   = budget
+        self.policies: Dict[str, RetentionPolicy] = {default: RetentionPolicy(default)}
+        self.evicted:   Dict[Tuple[str, str], int] = {}
+        self.reclaimed: Dict[str, int] = {}
+        self.sweeps   = 0
+        self.last_sweep_ms = 0.0
+        self._heap: List[Tuple[float, int, str, str, str]] = []     # (기한, seq, seu_id, gen, 사유)
+        self._seq  = 0
+        self._entries: Dict[str, Tuple[str, float, str]] = {}       # seu_id → (정책, 최초 기록 시각, gen)
+        self._order:   Dict[str, "OrderedDict[str, None]"] = {}     # max_seus 정책별 기록 순서
+        self._lock   = threading.Lock()
+        self._stop   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 정책 ──
+    def register(self, name: str, ttl: Optional[float] = None, max_seus: Optional[int] = None,
+                 keep_cube: bool = False) -> RetentionPolicy:
+        p = self.policies[name] = RetentionPolicy(name, ttl, max_seus, keep_cube)
+        return p
+
+    def load_spec(self, spec: str) -> None:
+        """
+        "short=ttl:3600; capped=max:10000; summary=ttl:86400,keep_cube" 형식.
+        정책은 ;로, 옵션은 ,로 구분한다 — ttl:<초>, max:<SEU 수>, keep_cube.
+        """
+        for item in filter(None, (s.strip() for s in spec.split(";"))):
+            name, _, opts = item.partition("=")
+            kw: Dict[str, Any] = {}
+            for opt in filter(None, (o.strip() for o in opts.split(","))):
+                k, _, v = opt.partition(":")
+                if k == "ttl":
+                    kw["ttl"] = float(v)
+                elif k == "max":
+                    kw["max_seus"] = int(v)
+                elif k == "keep_cube":
+                    kw["keep_cube"] = True
+                else:
+                    raise ValueError(f"unknown retention option: {opt}")
+            self.register(name.strip(), **kw)
+
+    def policy(self, name: str) -> RetentionPolicy:
+        # 등록되지 않은 정책 ID는 영구 보존
+        return self.policies.get(name) or RetentionPolicy(name)
+
+    # ── 추적 ──
+    def _push(self, due: float, seu_id: str, gen: str, reason: str) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, seu_id, gen, reason))
+
+    def _forget(self, seu_id: str) -> None:
+        entry = self._entries.pop(seu_id, None)
+        if entry is not None and entry[0] in self._order:
+            self._order[entry[0]].pop(seu_id, None)
+
+    def track(self, seu_id: str, policy_id: str, at: float, gen: str) -> None:
+        """SEU를 policy_id 아래 at(최초 기록 시각)부터 추적 — 같은 SEU를 다시 부르면 이전 추적을 대신한다."""
+        with self._lock:
+            self._forget(seu_id)
+            p = self.policies.get(policy_id)
+            if p is None or not p.bounded:
+                return
+            self._entries[seu_id] = (policy_id, at, gen)
+            if p.ttl is not None:
+                self._push(at + p.ttl, seu_id, gen, "ttl")
+            if p.max_seus is not None:
+                order = self._order.setdefault(policy_id, OrderedDict())
+                order[seu_id] = None
+                while len(order) > p.max_seus:
+                    old, _ = order.popitem(last=False)
+                    self._push(0.0, old, self._entries[old][2], "max_seus")
+
+    def untrack(self, seu_id: str) -> None:
+        with self._lock:
+            self._forget(seu_id)
+
+    def rebuild(self, entries: Iterable[Tuple[str, str, float, str]]) -> None:
+        """기동 시 영속 역색인에서 (seu_id, 정책, 최초 기록 시각, gen)을 받아 힙·순서를 다시 만든다."""
+        for seu_id, policy_id, at, gen in sorted(entries, key=lambda e: e[2]):
+            self.track(seu_id, policy_id, at, gen)
+
+    # ── 스윕 ──
+    def _due(self, now: float, budget: int) -> List[Tuple[str, str, str]]:
+        out = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(out) < budget:
+                _, _, seu_id, gen, reason = heapq.heappop(self._heap)
+                entry = self._entries.get(seu_id)
+                if entry is not None and entry[2] == gen:
+                    out.append((seu_id, entry[0], reason))
+        return out
+
+    def sweep(self, now: Optional[float] = None, budget: Optional[int] = None) -> int:
+        """만기된 SEU를 최대 budget개 축출하고 축출한 수를 돌려준다."""
+        t0 = time.perf_counter()
+        n  = 0
+        for seu_id, policy_id, reason in self._due(time.time() if now is None else now, budget or self.budget):
+            with self._lock:
+                entry = self._entries.get(seu_id)
+            if entry is None:
+                continue
+            freed = self.evict(seu_id, self.policies[policy_id], reason, entry[2])
+            with self._lock:
+                if self._entries.get(seu_id) == entry:
+                    self._forget(seu_id)
+                if freed is None:
+                    continue
+                n += 1
+                self._count(policy_id, reason, freed)
+        with self._lock:
+            self.sweeps += 1
+            self.last_sweep_ms = round((time.perf_counter() - t0) * 1000, 3)
+        return n
+
+    def _count(self, policy_id: str, reason: str, freed: Dict[str, int]) -> None:
+        self.evicted[(policy_id, reason)] = self.evicted.get((policy_id, reason), 0) + 1
+        for store, b in freed.items():
+            self.reclaimed[store] = self.reclaimed.get(store, 0) + b
+
+    def record(self, policy_id: str, reason: str, freed: Dict[str, int]) -> None:
+        """스윕 밖에서(수동 삭제 등) 축출한 결과도 같은 통계에 넣는다."""
+        with self._lock:
+            self._count(policy_id, reason, freed)
+
+    # ── 백그라운드 스레드 ──
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="pai-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            # 밀린 만기가 budget보다 많으면 쉬지 않고 이어서 — 한 번에 한 budget씩이라 잠금은 짧게만 잡는다
+            while self.sweep() >= self.budget and not self._stop.is_set():
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "policies":  {name: p.view() for name, p in self.policies.items()},
+                "tracked":   len(self._entries),
+                "heap":      len(self._heap),
+                "next_due":  self._heap[0][0] if self._heap else None,
+                "sweeps":    self.sweeps,
+                "last_sweep_ms": self.last_sweep_ms,
+                "evicted":   [{"policy": p, "reason": r, "count": n} for (p, r), n in self.evicted.items()],
+                "reclaimed_bytes": dict(self.reclaimed),
+            }
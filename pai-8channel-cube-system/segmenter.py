@@ -0,0 +1,218 @@
+"""
+스트리밍 SEU 세그먼터 — 디바이스별 이벤트 시간 윈도.
+
+SEU가 지정되지 않은 채널 프레임(device_id, channel_id, ts, payload)을 받아 길이 window, 간격 slide인
+윈도 [start, start + window)에 넣는다. slide == window면 텀블링, slide < window면 슬라이딩
+(프레임 하나가 ceil(window / slide)개 윈도에 들어간다).
+
+- 워터마크 : 디바이스별 최대 ts - lateness. 끝이 워터마크 이하가 된 윈도는 봉인된다
+- 늦은 프레임 : 들어갈 윈도가 모두 이미 닫혔으면(끝 ≤ 워터마크이거나 봉인됨) 버리고 late로 센다
+- 채널 슬롯 : 윈도는 채널당 ts가 가장 늦은 프레임 하나만 든다 — 윈도 크기는 프레임 수와 무관하게 채널 수로 묶인다
+- 이어 쓰기 : carry면 봉인 시 빠진 채널을 그 디바이스의 직전 프레임으로 채운다 (carried에 기록)
+- 상한 : 디바이스당 열린 윈도가 max_windows를 넘으면 가장 오래된 윈도를, 디바이스가 max_devices를 넘으면
+         가장 오래 조용했던 디바이스를 일찍 봉인한다. idle초 동안 프레임이 없던 디바이스는 백그라운드 스레드가 봉인하고
+         상태를 버린다 — 그 뒤에 온 예전 윈도의 프레임은 같은 윈도(같은 SEU)를 다시 연다
+
+프레임당 작업은 O(window / slide) — 상수다. 봉인된 윈도는 push()·flush()가 돌려주고(호출자가 처리),
+백그라운드 스레드가 봉인한 윈도는 seal(windows) 콜백으로 넘긴다.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import heapq
+import math
+import threading
+import time
+
+Seal = Callable[[List["Window"]], Any]
+
+
+def parse_ts(ts: str) -> float:
+    """ISO 8601 → epoch 초. 시간대가 없으면 UTC로 본다."""
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def format_ts(t: float) -> str:
+    return datetime.fromtimestamp(t, timezone.utc).isoformat(timespec="milliseconds")
+
+
+class Window:
+    __slots__ = ("device_id", "start", "end", "frames", "count", "carried", "reason")
+
+    def __init__(self, device_id: str, start: float, end: float):
+        self.device_id = device_id
+        self.start     = start
+        self.end       = end
+        self.frames: Dict[str, Tuple[float, Any]] = {}   # channel_id → (ts, payload)
+        self.count     = 0                               # 받은 프레임 수 (슬롯에서 밀려난 것 포함)
+        self.carried: Tuple[str, ...] = ()
+        self.reason    = ""                              # watermark | overflow | idle | evicted | flush
+
+    def put(self, channel_id: str, ts: float, payload: Any) -> None:
+        self.count += 1
+        cur = self.frames.get(channel_id)
+        if cur is None or ts >= cur[0]:
+            self.frames[channel_id] = (ts, payload)
+
+    def view(self) -> Dict[str, Any]:
+        return {"device_id": self.device_id, "ts_start": format_ts(self.start), "ts_end": format_ts(self.end),
+                "frames": self.count, "channels": sorted(self.frames), "carried": list(self.carried),
+                "reason": self.reason}
+
+
+class _Device:
+    __slots__ = ("max_ts", "windows", "heap", "sealed_until", "carry", "seen_at")
+
+    def __init__(self) -> None:
+        self.max_ts       = -math.inf
+        self.windows: Dict[float, Window] = {}           # start → 열린 윈도
+        self.heap: List[float] = []                      # 열린 윈도 start (끝 순서와 같다 — 길이가 모두 window)
+        self.sealed_until = -math.inf                    # 봉인한 윈도 start 최댓값
+        self.carry: Dict[str, Tuple[float, Any]] = {}    # channel_id → 봉인된 윈도의 가장 늦은 프레임
+        self.seen_at      = 0.0
+
+
+class Segmenter:
+
+    def __init__(self, seal: Seal, window: float = 60.0, slide: Optional[float] = None, lateness: float = 5.0,
+                 idle: float = 30.0, max_windows: int = 64, max_devices: int = 10000, carry: bool = True,
+                 channels: Optional[List[str]] = None):
+        if window <= 0 or (slide is not None and not 0 < slide <= window):
+            raise ValueError("segmenter needs window > 0 and 0 < slide <= window")
+        self.seal        = seal
+        self.window      = window
+        self.slide       = slide or window
+        self.lateness    = lateness
+        self.idle        = idle
+        self.max_windows = max_windows
+        self.max_devices = max_devices
+        self.carry       = carry
+        self.channels    = list(channels or [])
+        self.counts      = {"frames": 0, "late": 0, "windows": 0, "sealed": 0,
+                            "watermark": 0, "overflow": 0, "idle": 0, "evicted": 0, "flush": 0}
+        self._devices: "OrderedDict[str, _Device]" = OrderedDict()   # 최근 프레임 순 (idle·max_devices 축출)
+        self._lock   = threading.Lock()
+        self._stop   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def mode(self) -> str:
+        return "tumbling" if self.slide == self.window else "sliding"
+
+    # ── 프레임 ──
+    def push(self, device_id: str, channel_id: str, ts: float, payload: Any) -> Tuple[bool, List[Window]]:
+        """프레임 하나를 윈도에 넣는다 → (받아들였는지, 이 프레임으로 봉인된 윈도들). False면 늦은 프레임."""
+        sealed: List[Window] = []
+        with self._lock:
+            self.counts["frames"] += 1
+            dev = self._devices.get(device_id)
+            if dev is None:
+                dev = self._devices[device_id] = _Device()
+                if len(self._devices) > self.max_devices:
+                    _, old = self._devices.popitem(last=False)
+                    sealed += self._seal_all(old, "evicted")
+            else:
+                self._devices.move_to_end(device_id)
+            dev.seen_at = time.monotonic()
+            wm = dev.max_ts - self.lateness
+            # ts를 담는 윈도: start = k × slide ∈ (ts - window, ts] — 격자에서 매번 곱해 부동소수 누적 오차를 피한다
+            k        = math.floor(ts / self.slide)
+            accepted = False
+            while k * self.slide > ts - self.window:
+                start = k * self.slide
+                if start + self.window > wm and start > dev.sealed_until:
+                    w = dev.windows.get(start)
+                    if w is None:
+                        w = dev.windows[start] = Window(device_id, start, start + self.window)
+                        heapq.heappush(dev.heap, start)
+                        self.counts["windows"] += 1
+                    w.put(channel_id, ts, payload)
+                    accepted = True
+                k -= 1
+            if not accepted:
+                self.counts["late"] += 1
+            if ts > dev.max_ts:
+                dev.max_ts = ts
+                wm = ts - self.lateness
+                while dev.heap and dev.heap[0] + self.window <= wm:
+                    sealed.append(self._seal_next(dev, "watermark"))
+            while len(dev.windows) > self.max_windows:
+                sealed.append(self._seal_next(dev, "overflow"))
+        return accepted, sealed
+
+    def _seal_next(self, dev: _Device, reason: str) -> Window:
+        start = heapq.heappop(dev.heap)
+        w = dev.windows.pop(start)
+        dev.sealed_until = max(dev.sealed_until, start)
+        if self.carry:
+            for ch, (ts, payload) in w.frames.items():
+                cur = dev.carry.get(ch)
+                if cur is None or ts >= cur[0]:
+                    dev.carry[ch] = (ts, payload)
+            missing = [ch for ch in self.channels if ch not in w.frames and ch in dev.carry]
+            for ch in missing:
+                w.frames[ch] = dev.carry[ch]
+            w.carried = tuple(missing)
+        w.reason = reason
+        self.counts["sealed"] += 1
+        self.counts[reason]   += 1
+        return w
+
+    def _seal_all(self, dev: _Device, reason: str) -> List[Window]:
+        return [self._seal_next(dev, reason) for _ in range(len(dev.heap))]
+
+    # ── 봉인 ──
+    def expire(self, now: Optional[float] = None) -> List[Window]:
+        """idle초 넘게 프레임이 없던 디바이스의 윈도를 모두 봉인하고 디바이스 상태를 버린다."""
+        now = time.monotonic() if now is None else now
+        out: List[Window] = []
+        with self._lock:
+            while self._devices:
+                device_id, dev = next(iter(self._devices.items()))
+                if now - dev.seen_at < self.idle:
+                    break
+                del self._devices[device_id]
+                out += self._seal_all(dev, "idle")
+        return out
+
+    def flush(self, device_id: Optional[str] = None) -> List[Window]:
+        """열린 윈도를 워터마크와 무관하게 봉인한다 (device_id가 없으면 모든 디바이스). 디바이스 상태는 남긴다."""
+        out: List[Window] = []
+        with self._lock:
+            for did, dev in list(self._devices.items()):
+                if device_id is None or did == device_id:
+                    out += self._seal_all(dev, "flush")
+        return out
+
+    # ── 백그라운드 스레드 ──
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="pai-segmenter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _loop(self) -> None:
+        # idle의 절반 간격으로 확인 — 조용해진 디바이스의 윈도는 늦어도 1.5 × idle 안에 봉인된다
+        while not self._stop.wait(max(0.05, self.idle / 2)):
+            windows = self.expire()
+            if windows:
+                self.seal(windows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "window_s": self.window, "slide_s": self.slide, "lateness_s": self.lateness,
+                    "idle_s": self.idle, "max_windows": self.max_windows, "max_devices": self.max_devices,
+                    "carry": self.carry, "devices": len(self._devices),
+                    "open_windows": sum(len(d.windows) for d in self._devices.values()), **self.counts}
@@ -0,0 +1,202 @@
+"""
+채널 휴리스틱 추출기 — 키워드·수치 규칙으로 원문에서 (activation, signal_type)을 뽑는다.
+
+import 시 부작용이 없는 모듈이다(저장소·스레드·저널 없음). process 정책 풀(spawn)의 워커가 추출기를 언피클할 때
+이 모듈만 다시 import하므로, app.py를 다시 읽어 STORE를 하나 더 만들지 않는다.
+추출기 fn(t, tl) — t는 strip한 원문, tl은 그 소문자.
+"""
+from __future__ import annotations
+
+from typing import List
+import re
+
+POSITIVE_KW = ["기대","활기","만족","편안","집중","몰입","호기심","즐거움","에너지","가볍",
+               "ready","focus","calm","satisfied","curious","energized","positive","motivated"]
+NEGATIVE_KW = ["긴장","피로","불안","스트레스","부담","어려움","혼란",
+               "tension","stress","fatigue","anxiety","tired","overwhelmed","nervous"]
+HIGH_INTENT_KW = ["완수","달성","목표","핵심","실행","완료","중요","전략",
+                  "achieve","complete","goal","critical","execute","strategy","key","priority"]
+SOCIAL_KW = ["팀","동료","회의","대화","협력","공유","눈인사","반응","함께",
+             "team","colleague","meeting","conversation","collaborate","share","together"]
+RELAX_KW  = ["이완","휴식","편안","가볍","회복","rest","relax","recover","comfortable","calm"]
+TENSE_KW  = ["긴장","바른","유지","집중","upright","tense","maintain","alert","posture"]
+
+def score_kw(text: str, pos: List[str], neg: List[str], default: float = 0.5) -> float:
+    t = text.lower()
+    p = sum(1 for kw in pos if kw in t)
+    n = sum(1 for kw in neg if kw in t)
+    return _kw_score(len(t), p, n, default)
+
+def _kw_score(length: int, p: int, n: int, default: float) -> float:
+    if p + n == 0:
+        return round(min(length / 30.0, 1.0) * 0.3 + default * 0.7, 3)
+    return round(min((p / (p + n)) * 0.6 + 0.4, 1.0), 3)
+
+
+class KeywordMatcher:
+    """
+    키워드군 전체를 하나의 정규식으로 컴파일해 텍스트를 한 번만 스캔한다.
+    scan() 결과(매치된 키워드 집합)로 `kw in tl` 판정과 키워드 개수를 그대로 재현한다.
+    """
+
+    def __init__(self, **families: List[str]):
+        self.families = families
+        # 긴 키워드 우선 → 같은 시작점에서는 항상 가장 긴 키워드가 소비된다
+        kws = sorted({k for ks in families.values() for k in ks}, key=len, reverse=True)
+        self._re = re.compile("|".join(map(re.escape, kws)))
+        # 매치된 키워드 안에 포함된 키워드 + 매치 꼬리와 겹쳐 시작하는 키워드(소비형 스캔이 놓칠 수 있음)
+        self._nested  = {k: frozenset(p for p in kws if p in k and p != k) for k in kws}
+        self._overlap = {a: frozenset(b for b in kws for i in range(1, len(a))
+                                      if b.startswith(a[i:]) and len(b) > len(a) - i) for a in kws}
+        self._expand  = frozenset(k for k in kws if self._nested[k] or self._overlap[k])
+        self._family_of = {k: frozenset(f for f, ks in families.items() if k in ks) for k in kws}
+        # 키워드별 가중치 = 목록 내 등장 횟수 (원래 sum(1 for kw in ks if kw in t)와 동일)
+        self._weight = {f: {k: ks.count(k) for k in ks} for f, ks in families.items()}
+
+    def scan(self, tl: str) -> set:
+        hits = set(self._re.findall(tl))
+        todo = list(hits.intersection(self._expand))
+        while todo:
+            k = todo.pop()
+            new = (self._nested[k] | {b for b in self._overlap[k] if b in tl}) - hits
+            hits |= new
+            todo.extend(new.intersection(self._expand))
+        return hits
+
+    def present(self, hits: set) -> set:
+        out: set = set()
+        for k in hits:
+            out |= self._family_of[k]
+        return out
+
+    def count(self, hits: set, family: str) -> int:
+        w = self._weight[family]
+        return sum(w.get(k, 0) for k in hits)
+
+
+_DB_RE   = re.compile(r"(\d+)\s*db")
+_BPM_RE  = re.compile(r"(\d+)\s*bpm")
+_LUX_RE  = re.compile(r"(\d+)\s*lux")
+_TEMP_RE = re.compile(r"(\d+)\s*[°c℃]")
+_GPS_RE  = re.compile(r"\d+\.\d+\s*,\s*\d+\.\d+")
+_MIN_RE  = re.compile(r"(\d+)\s*(분|min)")
+_SEC_RE  = re.compile(r"(\d+)\s*(초|sec\b)")
+
+_CH1_KW = KeywordMatcher(
+    scene=["rgb","depth","조명","lighting","화면","screen","창","window","밝","bright","어두","dark","카페","cafe","사무실"])
+_CH2_KW = KeywordMatcher(
+    music=["음악","music","jazz","bgm","melody","재즈"],
+    speech=["목소리","voice","발표","speaker","대화","conversation","다수","multiple"],
+    broadcast=["방송","announcement","안내"],
+    silent=["조용","quiet","silent","silence","없음","none"])
+_CH3_KW = KeywordMatcher(
+    moving=["이동","moving","subway","지하철","walking","걷","bus","버스","train","이동 중"],
+    static=["카페","cafe","사무실","office","자택","home","거실","회의실","meeting room"])
+_CH4_KW = KeywordMatcher(
+    relax=["이완","relax","편안","comfortable","무거","heavy"],
+    tense=["긴장","tense","활발","active","alert","응시"])
+_CH5_KW = KeywordMatcher(
+    absent=["(none)","(없음)","(입력 없음)"],
+    intent=HIGH_INTENT_KW)
+_CH6_KW = KeywordMatcher(
+    idle=["없음","none","터치 없","no touch","idle"])
+_CH7_KW = KeywordMatcher(
+    recovery=["회복","recovery","휴식","rest","이완 모드","recovery mode","쉬는","쉬고","쉼"],
+    learning=["학습","study","learn","공부","이해","지식","읽으며","정리 중"],
+    focus=["집중","focus","deep","깊은","몰입","완전 집중"],
+    social=["회의","meeting","발표","presentation","토론","discussion","논의"],
+    task=["완수","달성","목표","goal","실행","execute","완료","complete","업무 완수","핵심"],
+    transit=["출근","commute","이동","transit","준비","prepare","가는","향하는"],
+    pos=HIGH_INTENT_KW + POSITIVE_KW,
+    neg=NEGATIVE_KW)
+_CH7_MODES = [("recovery", 0.92, "mode_recovery"), ("learning", 0.88, "mode_learning"),
+              ("focus", 0.88, "mode_focus"), ("social", 0.85, "mode_social"),
+              ("task", 0.85, "mode_task"), ("transit", 0.72, "mode_transit")]
+
+
+def _ex_ch1(t: str, tl: str):  # Video Frames - 시각 장면 복잡도
+    richness = _CH1_KW.count(_CH1_KW.scan(tl), "scene")
+    act = min(0.3 + richness * 0.08 + len(t)/100.0 * 0.3, 1.0)
+    stype = "scene_complex" if richness > 3 else ("scene_moderate" if richness > 1 else "scene_sparse")
+    return act, stype
+
+def _ex_ch2(t: str, tl: str):  # Audio Stream - 음향 분류
+    fams = _CH2_KW.present(_CH2_KW.scan(tl))
+    if "music" in fams:     return 0.65, "music"
+    if "speech" in fams:    return 0.85, "speech_active"
+    if "broadcast" in fams: return 0.55, "broadcast"
+    if "silent" in fams:    return 0.05, "silent"
+    db_m = _DB_RE.search(tl)
+    if db_m:
+        db = int(db_m.group(1))
+        return min(db / 100.0, 1.0), ("noise_high" if db > 65 else ("noise_moderate" if db > 45 else "noise_low"))
+    return 0.40, "ambient"
+
+def _ex_ch3(t: str, tl: str):  # Spatial-Temporal - 이동성
+    fams = _CH3_KW.present(_CH3_KW.scan(tl))
+    if "moving" in fams: return 0.80, "mobile"
+    if "static" in fams: return 0.30, "static_indoor"
+    gps = _GPS_RE.search(tl)
+    return (0.60, "gps_fixed") if gps else (0.40, "spatial_general")
+
+def _ex_ch4(t: str, tl: str):  # Biometric - 생리적 각성
+    hr_m = _BPM_RE.search(tl)
+    if hr_m:
+        hr = int(hr_m.group(1))
+        if hr < 65: return 0.20, "bio_resting"
+        if hr < 75: return 0.45, "bio_calm"
+        if hr < 85: return 0.70, "bio_focused"
+        return 0.90, "bio_aroused"
+    fams = _CH4_KW.present(_CH4_KW.scan(tl))
+    if "relax" in fams: return 0.20, "bio_relaxed"
+    if "tense" in fams: return 0.75, "bio_alert"
+    return 0.50, "bio_neutral"
+
+def _ex_ch5(t: str, tl: str):  # Text Input - 언어 의미 신호
+    hits = _CH5_KW.scan(tl)
+    if not t or _CH5_KW.count(hits, "absent"):
+        return 0.0, "text_absent"
+    act = _kw_score(len(tl), _CH5_KW.count(hits, "intent"), 0, 0.5)
+    return act, ("text_task" if act > 0.6 else ("text_note" if len(t) > 10 else "text_brief"))
+
+def _ex_ch6(t: str, tl: str):  # Device Interactions - 상호작용 강도
+    if _CH6_KW.scan(tl):
+        return 0.05, "device_idle"
+    min_m = _MIN_RE.search(tl)
+    if min_m:
+        return min(0.3 + int(min_m.group(1))/20.0, 1.0), "device_sustained"
+    sec_m = _SEC_RE.search(tl)
+    if sec_m:
+        return min(0.2 + int(sec_m.group(1))/60.0, 0.8), "device_brief"
+    return min(len(t) / 40.0, 1.0) * 0.5 + 0.2, "device_active"
+
+def _ex_ch7(t: str, tl: str):  # User Mode / Context — 현재 사용자 상태·모드 (가장 직접적 신호)
+    hits = _CH7_KW.scan(tl)
+    fams = _CH7_KW.present(hits)
+    for fam, act, stype in _CH7_MODES:
+        if fam in fams:
+            return act, stype
+    return _kw_score(len(tl), _CH7_KW.count(hits, "pos"), _CH7_KW.count(hits, "neg"), 0.5), "mode_general"
+
+def _ex_ch8(t: str, tl: str):  # Environmental Attributes - 환경 적합성
+    lux_m  = _LUX_RE.search(tl)
+    db_m   = _DB_RE.search(tl)
+    temp_m = _TEMP_RE.search(tl)
+    score = 0.5
+    if lux_m:
+        lux = int(lux_m.group(1))
+        score += 0.15 if 200 <= lux <= 600 else -0.10
+    if db_m:
+        db = int(db_m.group(1))
+        score += 0.20 if db < 45 else (0.0 if db < 65 else -0.15)
+    if temp_m:
+        temp = int(temp_m.group(1))
+        score += 0.10 if 18 <= temp <= 24 else -0.05
+    act = round(max(0.1, min(score, 1.0)), 3)
+    return act, ("env_optimal" if act > 0.7 else ("env_moderate" if act > 0.4 else "env_suboptimal"))
+
+# 채널별 디스패치 테이블 (임포트 시 1회 구성)
+SIGNAL_EXTRACTORS = {
+    "CH1": _ex_ch1, "CH2": _ex_ch2, "CH3": _ex_ch3, "CH4": _ex_ch4,
+    "CH5": _ex_ch5, "CH6": _ex_ch6, "CH7": _ex_ch7, "CH8": _ex_ch8,
+}
@@ -0,0 +1,840 @@
+"""
+RAW / FEATURE / META / CUBE 저장소 백엔드.
+
+- MemoryBackend : 프로세스 메모리 dict (기본값). journal(journal.Journal)을 주면 쓰기를 저널에 남기고 주기적으로
+                  스냅숏을 떠서, 재시작 때 스냅숏 + 저널 꼬리로 복구한다 — 없으면 재시작 시 소실
+- SQLiteBackend : WAL 모드 SQLite — 쓰기는 모아서 한 트랜잭션으로 커밋하고,
+                  최근 SEU 레코드는 테이블별 LRU 캐시에 유지한다.
+
+두 백엔드 모두 table(name)이 MutableMapping을, index(name, fields)가 (ts, key) 정렬 보조 인덱스를
+돌려주므로 app.py의 저장소 접근 코드는 백엔드와 무관하다. ShardLocks는 SEU 단위 쓰기를 직렬화한다
+(여러 워커 프로세스가 같은 SQLite 파일을 공유할 때는 파일 잠금까지).
+BlobStore는 큰 raw 페이로드를 sha256 내용 주소로 디스크에 한 번만 저장하고 mmap으로 읽는다.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import combinations
+from typing import Any, Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+import gc
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from journal import Journal
+
+
+class LRUCache:
+    """크기 제한 LRU 캐시 — 적중/미스/축출 횟수를 센다."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize   = maxsize
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+class MemoryIndex:
+    """
+    (ts, key) 정렬 보조 인덱스. fields의 모든 부분집합마다 정렬 리스트를 두어
+    필드 등호 조건 + ts 범위 + 커서 조회가 결과 크기에만 비례한다 (fields 2개면 리스트 4종).
+    """
+
+    def __init__(self, fields: Tuple[str, ...], lock: Optional[Any] = None,
+                 log: Optional[Callable[[Tuple[Any, ...]], None]] = None):
+        self.fields = tuple(fields)
+        self.entries: Dict[str, Tuple[str, Dict[str, Optional[str]]]] = {}
+        self.postings: Dict[Tuple[Tuple[str, str], ...], List[Tuple[str, str]]] = {}
+        self._lock = lock or threading.Lock()
+        self._log  = log     # 저널 백엔드: 잠금 안에서 ("ix_put" | "ix_del", ...)를 남긴다
+
+    def _keys(self, attrs: Dict[str, Optional[str]]) -> List[Tuple[Tuple[str, str], ...]]:
+        present = [(f, attrs[f]) for f in self.fields if attrs.get(f) is not None]
+        return [c for n in range(len(present) + 1) for c in combinations(present, n)]
+
+    def _remove(self, key: str) -> None:
+        old = self.entries.pop(key, None)
+        if old is None:
+            return
+        ts, attrs = old
+        for pk in self._keys(attrs):
+            lst = self.postings[pk]
+            i = bisect_left(lst, (ts, key))
+            if i < len(lst) and lst[i] == (ts, key):
+                del lst[i]
+
+    def put(self, key: str, ts: str, **attrs: Optional[str]) -> None:
+        with self._lock:
+            self._remove(key)
+            self.entries[key] = (ts, attrs)
+            for pk in self._keys(attrs):
+                insort(self.postings.setdefault(pk, []), (ts, key))
+            if self._log is not None:
+                self._log(("ix_put", key, ts, attrs))
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+            if self._log is not None:
+                self._log(("ix_del", key))
+
+    def load(self, entries: Dict[str, Tuple[str, Dict[str, Optional[str]]]]) -> None:
+        """key → (ts, attrs) 전체로 다시 만든다 — 항목마다 insort하지 않고 리스트별로 한 번 정렬 (복구용)."""
+        postings: Dict[Tuple[Tuple[str, str], ...], List[Tuple[str, str]]] = {}
+        for key, (ts, attrs) in entries.items():
+            for pk in self._keys(attrs):
+                postings.setdefault(pk, []).append((ts, key))
+        for lst in postings.values():
+            lst.sort()
+        with self._lock:
+            self.entries, self.postings = entries, postings
+
+    def query(self, ts_from: Optional[str] = None, ts_to: Optional[str] = None,
+              after: Optional[Tuple[str, str]] = None, limit: int = 100, **eq: Optional[str]) -> List[Tuple[str, str]]:
+        """eq 필드가 모두 같고 ts_from <= ts < ts_to인 (ts, key)를 after 다음부터 최대 limit개."""
+        pk = tuple((f, eq[f]) for f in self.fields if eq.get(f) is not None)
+        with self._lock:
+            lst = self.postings.get(pk, [])
+            lo  = bisect_right(lst, after) if after else 0
+            if ts_from is not None:
+                lo = max(lo, bisect_left(lst, (ts_from, "")))
+            hi  = bisect_left(lst, (ts_to, "")) if ts_to is not None else len(lst)
+            return lst[lo:min(hi, lo + max(limit, 0))]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class JournaledDict(dict):
+    """
+    설정·삭제를 저널에 남기는 dict. 읽기는 dict 그대로라 핫패스 비용이 없다.
+    레코드 인코딩(pickle)은 잠금 밖에서, 반영과 저널 추가는 백엔드 잠금 안에서 함께 — 스냅숏 경계가 어긋나지 않는다.
+    """
+    __slots__ = ("name", "backend")
+
+    def __init__(self, name: str, backend: "MemoryBackend"):
+        super().__init__()
+        self.name    = name
+        self.backend = backend
+
+    def __setitem__(self, k: str, v: Any) -> None:
+        frame = Journal.encode(("set", self.name, k), v)
+        with self.backend.lock:
+            dict.__setitem__(self, k, v)
+            self.backend.journal.append(frame)
+
+    def __delitem__(self, k: str) -> None:
+        with self.backend.lock:
+            dict.__delitem__(self, k)
+            self.backend.journal.append(Journal.encode(("del", self.name, k)))
+
+    def pop(self, k: str, *default: Any) -> Any:
+        with self.backend.lock:
+            if k not in self:
+                return dict.pop(self, k, *default)
+            v = dict.pop(self, k)
+            self.backend.journal.append(Journal.encode(("del", self.name, k)))
+            return v
+
+    def setdefault(self, k: str, default: Any = None) -> Any:
+        with self.backend.lock:
+            if k not in self:
+                self[k] = default
+            return dict.__getitem__(self, k)
+
+    def update(self, *args: Any, **kw: Any) -> None:
+        for k, v in dict(*args, **kw).items():
+            self[k] = v
+
+    def popitem(self):
+        raise TypeError("journaled tables do not support popitem")
+
+    def clear(self) -> None:
+        raise TypeError("journaled tables do not support clear")
+
+
+class MemoryBackend:
+    """
+    프로세스 메모리 dict 백엔드.
+
+    journal이 있으면:
+    - 테이블은 JournaledDict, 인덱스 쓰기도 저널에 남는다. register_state()로 등록한 외부 상태(이벤트 버스 등)는
+      log(name, payload)로 남기고, 스냅숏에는 dump()를 싣는다
+    - 스냅숏: snapshot_interval초마다(그 사이 쓰기가 있었으면) 또는 snapshot_records건마다 백그라운드에서.
+      잠금은 세그먼트 교체와 얕은 복사 동안만 잡는다 — 값은 통째로 교체해서 쓰므로(제자리 수정 금지) 얕은 복사가
+      그 시점 상태다. 직렬화·fsync는 잠금 밖. close()도 마지막 스냅숏을 떠서 다음 기동은 재생할 꼬리가 없다
+    - 복구: 생성 시 스냅숏(mmap) + 저널 꼬리 재생. 인덱스 정렬 리스트는 index()로 처음 열 때 한 번에 만든다.
+      외부 상태는 register_state() 때 load → 재생 순서로 반영한다
+    """
+    name = "memory"
+
+    def __init__(self, journal: Optional[Journal] = None, snapshot_interval: float = 300.0,
+                 snapshot_records: int = 250_000):
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.indexes: Dict[str, MemoryIndex] = {}
+        self.journal           = journal
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_records  = snapshot_records
+        self.lock = threading.RLock()
+        self.recovery: Dict[str, Any] = {}
+        self.last_snapshot: Dict[str, Any] = {}
+        self._states: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None], Callable[[Any], None]]] = {}
+        self._pending_states: Dict[str, Tuple[Any, List[Any]]] = {}   # 복구했지만 아직 등록되지 않은 외부 상태
+        self._pending_indexes: Dict[str, Dict[str, Any]] = {}         # 복구했지만 아직 열리지 않은 인덱스 항목
+        self._snap_lock = threading.Lock()
+        self._snapped_at = time.monotonic()
+        self._stop   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if journal is not None:
+            self._recover()
+            journal.open()
+            self._thread = threading.Thread(target=self._snapshot_loop, name="pai-snapshot", daemon=True)
+            self._thread.start()
+
+    def table(self, name: str, entries_per_seu: int = 1, record: Optional[type] = None) -> Dict[str, Any]:
+        if name not in self.tables:
+            self.tables[name] = JournaledDict(name, self) if self.journal is not None else {}
+        return self.tables[name]
+
+    def index(self, name: str, fields: Tuple[str, ...]) -> MemoryIndex:
+        if name not in self.indexes:
+            if self.journal is None:
+                self.indexes[name] = MemoryIndex(fields)
+            else:
+                ix = self.indexes[name] = MemoryIndex(fields, self.lock, lambda rec: self._log_index(name, rec))
+                entries = self._pending_indexes.pop(name, None)
+                if entries:
+                    t0 = time.perf_counter()
+                    ix.load(entries)
+                    self.recovery["index_ms"] = round(self.recovery.get("index_ms", 0.0)
+                                                      + (time.perf_counter() - t0) * 1000, 3)
+        return self.indexes[name]
+
+    # ── 저널 ──
+    def _log_index(self, name: str, rec: Tuple[Any, ...]) -> None:
+        # MemoryIndex가 백엔드 잠금 안에서 호출
+        self.journal.append(Journal.encode((rec[0], name, rec[1]), rec[2:] or None))
+
+    def register_state(self, name: str, dump: Callable[[], Any], load: Callable[[Any], None],
+                       apply: Callable[[Any], None]) -> None:
+        """
+        테이블 밖 상태를 스냅숏·저널에 싣는다. dump()는 백엔드 잠금 안에서 불리는 복사, load(state)는 스냅숏 복원,
+        apply(payload)는 log(name, payload) 재생 — 스냅숏 경계에서 겹쳐 두 번 올 수 있으니 멱등이어야 한다.
+        """
+        if self.journal is None:
+            return
+        self._states[name] = (dump, load, apply)
+        state, recs = self._pending_states.pop(name, (None, []))
+        if state is not None:
+            load(state)
+        for payload in recs:
+            apply(payload)
+
+    def log(self, name: str, payload: Any) -> None:
+        if self.journal is None:
+            return
+        frame = Journal.encode(("x", name), payload)
+        with self.lock:
+            self.journal.append(frame)
+
+    def _recover(self) -> None:
+        # 역직렬화는 컨테이너를 수백만 개 만든다 — 그동안 순환 GC를 멈춰 세대 스캔이 반복되지 않게 하고,
+        # 끝나면 복구한 객체를 영구 세대로 옮겨(freeze) 서비스 중 전체 GC가 매번 다시 훑지 않게 한다
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load_and_replay()
+        finally:
+            gc.freeze()
+            if enabled:
+                gc.enable()
+
+    def _load_and_replay(self) -> None:
+        t0 = time.perf_counter()
+        gen, state, size = self.journal.load()
+        if state is not None:
+            for name, data in state["tables"].items():
+                dict.update(self.table(name), data)
+            self._pending_indexes.update(state["indexes"])
+            self._pending_states.update((n, (s, [])) for n, s in state["states"].items())
+        t1 = time.perf_counter()
+        stats: Dict[str, int] = {}
+        for header, value in self.journal.replay(gen, stats):
+            op = header[0]
+            if op == "set":
+                dict.__setitem__(self.table(header[1]), header[2], value)
+            elif op == "del":
+                dict.pop(self.table(header[1]), header[2], None)
+            elif op == "ix_put":
+                self._pending_indexes.setdefault(header[1], {})[header[2]] = value
+            elif op == "ix_del":
+                self._pending_indexes.get(header[1], {}).pop(header[2], None)
+            elif op == "x":
+                self._pending_states.setdefault(header[1], (None, []))[1].append(value)
+        t2 = time.perf_counter()
+        replay_s = t2 - t1
+        self.recovery = {"snapshot_gen": gen or None, "snapshot_bytes": size,
+                         "snapshot_load_ms": round((t1 - t0) * 1000, 3),
+                         "journal_segments": stats.get("segments", 0), "replayed": stats.get("records", 0),
+                         "superseded": stats.get("superseded", 0),
+                         "replay_ms": round(replay_s * 1000, 3),
+                         "replay_per_sec": round(stats.get("records", 0) / replay_s) if replay_s > 0 else None,
+                         "torn_bytes": stats.get("torn_bytes", 0),
+                         "entries": sum(len(t) for t in self.tables.values()),
+                         "total_ms": round((t2 - t0) * 1000, 3)}
+
+    # ── 스냅숏 ──
+    def snapshot(self) -> Dict[str, Any]:
+        if self.journal is None:
+            return {}
+        with self._snap_lock:
+            t0 = time.perf_counter()
+            with self.lock:
+                gen   = self.journal.rotate()
+                state = {"tables":  {n: dict(t) for n, t in self.tables.items()},
+                         "indexes": {**self._pending_indexes,
+                                     **{n: dict(ix.entries) for n, ix in self.indexes.items()}},
+                         "states":  {n: dump() for n, (dump, _, _) in self._states.items()}}
+            t1 = time.perf_counter()
+            size = self.journal.write_snapshot(gen, state)
+            t2 = time.perf_counter()
+            self._snapped_at   = time.monotonic()
+            self.last_snapshot = {"gen": gen, "bytes": size, "entries": sum(len(t) for t in state["tables"].values()),
+                                  "cut_ms": round((t1 - t0) * 1000, 3), "write_ms": round((t2 - t1) * 1000, 3),
+                                  "at": time.time()}
+            return self.last_snapshot
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop.wait(min(1.0, self.snapshot_interval)):
+            n = self.journal.since_snapshot
+            if n >= self.snapshot_records or (n and time.monotonic() - self._snapped_at >= self.snapshot_interval):
+                self.snapshot()
+
+    def flush(self) -> None:
+        if self.journal is not None:
+            self.journal.flush()
+
+    def close(self) -> None:
+        if self.journal is None:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.snapshot()
+        self.journal.close()
+
+    def stats(self) -> Dict[str, Any]:
+        out = {"backend": self.name, "tables": {n: {"size": len(t)} for n, t in self.tables.items()},
+               "indexes": {n: {"size": len(ix)} for n, ix in self.indexes.items()}}
+        if self.journal is not None:
+            out["journal"]  = self.journal.stats()
+            out["snapshot"] = self.last_snapshot
+            out["recovery"] = self.recovery
+        return out
+
+
+_DELETED = object()
+
+def json_default(o: Any) -> Any:
+    # 레코드 객체(to_dict)와 읽기 전용 매핑(records.EMPTY_EXTRA 등)을 JSON으로
+    to_dict = getattr(o, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(o, Mapping):
+        return dict(o)
+    raise TypeError(f"not JSON serializable: {type(o).__name__}")
+
+
+class SQLiteTable(MutableMapping):
+    """
+    키-값 테이블 (k TEXT PRIMARY KEY, v JSON).
+    쓰기는 pending에 모였다가 backend.flush()에서 일괄 커밋 — 그 전까지 읽기는 pending이 우선.
+    record(to_dict / from_dict를 가진 레코드 클래스)를 주면 값은 그 객체로 다루고 행에는 to_dict()를 쓴다.
+    """
+
+    def __init__(self, backend: "SQLiteBackend", name: str, cache_size: int, record: Optional[type] = None):
+        self.backend = backend
+        self.name    = name
+        self.record  = record
+        self.cache   = LRUCache(cache_size)
+        self.pending: Dict[str, Any] = {}
+
+    def _load(self, k: str) -> Any:
+        with self.backend.lock:
+            if k in self.pending:
+                v = self.pending[k]
+                if v is _DELETED:
+                    raise KeyError(k)
+                return v
+            row = self.backend.conn.execute(f"SELECT v FROM {self.name} WHERE k = ?", (k,)).fetchone()
+        if row is None:
+            raise KeyError(k)
+        v = json.loads(row[0])
+        if self.record is not None:
+            v = self.record.from_dict(v)
+        self.cache.put(k, v)
+        return v
+
+    def __getitem__(self, k: str) -> Any:
+        v = self.cache.get(k, _DELETED)
+        return self._load(k) if v is _DELETED else v
+
+    def __setitem__(self, k: str, v: Any) -> None:
+        with self.backend.lock:
+            self.pending[k] = v
+            self.cache.put(k, v)
+        self.backend.note_write()
+
+    def __delitem__(self, k: str) -> None:
+        if k not in self:
+            raise KeyError(k)
+        with self.backend.lock:
+            self.pending[k] = _DELETED
+            self.cache.pop(k)
+        self.backend.note_write()
+
+    def __contains__(self, k: object) -> bool:
+        if k in self.cache:
+            return True
+        with self.backend.lock:
+            if k in self.pending:
+                return self.pending[k] is not _DELETED
+            return self.backend.conn.execute(f"SELECT 1 FROM {self.name} WHERE k = ?", (k,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        self.backend.flush()
+        with self.backend.lock:
+            keys = [r[0] for r in self.backend.conn.execute(f"SELECT k FROM {self.name}")]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        self.backend.flush()
+        with self.backend.lock:
+            return self.backend.conn.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+
+
+class SQLiteIndex:
+    """
+    MemoryIndex와 같은 인터페이스의 SQLite 보조 인덱스 — 테이블 (k, ts, 필드...)와
+    (ts, k) / (필드 부분집합..., ts, k) 복합 인덱스. 쓰기는 테이블처럼 모아서 커밋, 조회 전에 flush.
+    """
+
+    def __init__(self, backend: "SQLiteBackend", name: str, fields: Tuple[str, ...]):
+        self.backend = backend
+        self.name    = name
+        self.fields  = tuple(fields)
+        self.pending: Dict[str, Any] = {}
+        cols = "".join(f", {f} TEXT" for f in self.fields)
+        with backend.lock:
+            backend.conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (k TEXT PRIMARY KEY, ts TEXT NOT NULL{cols})")
+            for n in range(len(self.fields) + 1):
+                for combo in combinations(self.fields, n):
+                    backend.conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_{'_'.join(combo + ('ts',))} "
+                                         f"ON {name} ({', '.join(combo + ('ts', 'k'))})")
+
+    def put(self, key: str, ts: str, **attrs: Optional[str]) -> None:
+        with self.backend.lock:
+            self.pending[key] = (key, ts) + tuple(attrs.get(f) for f in self.fields)
+        self.backend.note_write()
+
+    def remove(self, key: str) -> None:
+        with self.backend.lock:
+            self.pending[key] = _DELETED
+        self.backend.note_write()
+
+    def flush_pending(self) -> None:
+        # backend.flush()가 트랜잭션 안에서 호출
+        upserts = [v for v in self.pending.values() if v is not _DELETED]
+        deletes = [(k,) for k, v in self.pending.items() if v is _DELETED]
+        cols = ", ".join(("k", "ts") + self.fields)
+        if upserts:
+            self.backend.conn.executemany(
+                f"INSERT OR REPLACE INTO {self.name} ({cols}) VALUES ({', '.join('?' * (len(self.fields) + 2))})",
+                upserts)
+        if deletes:
+            self.backend.conn.executemany(f"DELETE FROM {self.name} WHERE k = ?", deletes)
+
+    def query(self, ts_from: Optional[str] = None, ts_to: Optional[str] = None,
+              after: Optional[Tuple[str, str]] = None, limit: int = 100, **eq: Optional[str]) -> List[Tuple[str, str]]:
+        self.backend.flush()
+        where, args = [], []
+        for f in self.fields:
+            if eq.get(f) is not None:
+                where.append(f"{f} = ?"); args.append(eq[f])
+        if ts_from is not None:
+            where.append("ts >= ?"); args.append(ts_from)
+        if ts_to is not None:
+            where.append("ts < ?"); args.append(ts_to)
+        if after:
+            where.append("(ts, k) > (?, ?)"); args.extend(after)
+        sql = (f"SELECT ts, k FROM {self.name}" + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY ts, k LIMIT ?")
+        with self.backend.lock:
+            return [tuple(r) for r in self.backend.conn.execute(sql, args + [max(limit, 0)])]
+
+    def __len__(self) -> int:
+        self.backend.flush()
+        with self.backend.lock:
+            return self.backend.conn.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+
+
+class SQLiteBackend:
+    """
+    WAL 모드 SQLite 백엔드.
+    batch_size건이 쌓이거나 flush_interval초가 지나면 모든 테이블의 쓰기를 한 트랜잭션으로 커밋한다.
+    """
+    name = "sqlite"
+
+    def __init__(self, path: str, cache_seus: int = 1024, batch_size: int = 256, flush_interval: float = 0.5):
+        self.path           = path
+        self.cache_seus     = cache_seus
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval
+        self.tables: Dict[str, SQLiteTable] = {}
+        self.indexes: Dict[str, SQLiteIndex] = {}
+        self.lock  = threading.RLock()
+        self.conn  = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.commits = 0
+        self._pending_writes = 0
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="pai-store-flush", daemon=True)
+        self._flusher.start()
+
+    def table(self, name: str, entries_per_seu: int = 1, record: Optional[type] = None) -> SQLiteTable:
+        if name not in self.tables:
+            with self.lock:
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+            self.tables[name] = SQLiteTable(self, name, self.cache_seus * entries_per_seu, record)
+        return self.tables[name]
+
+    def index(self, name: str, fields: Tuple[str, ...]) -> SQLiteIndex:
+        if name not in self.indexes:
+            self.indexes[name] = SQLiteIndex(self, name, fields)
+        return self.indexes[name]
+
+    def note_write(self) -> None:
+        with self.lock:
+            self._pending_writes += 1
+            full = self._pending_writes >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self._pending_writes:
+                return
+            self.conn.execute("BEGIN")
+            try:
+                for t in self.tables.values():
+                    if not t.pending:
+                        continue
+                    upserts = [(k, json.dumps(v, ensure_ascii=False, separators=(",", ":"), default=json_default))
+                               for k, v in t.pending.items() if v is not _DELETED]
+                    deletes = [(k,) for k, v in t.pending.items() if v is _DELETED]
+                    if upserts:
+                        self.conn.executemany(
+                            f"INSERT INTO {t.name} (k, v) VALUES (?, ?) ON CONFLICT(k) DO UPDATE SET v = excluded.v", upserts)
+                    if deletes:
+                        self.conn.executemany(f"DELETE FROM {t.name} WHERE k = ?", deletes)
+                for ix in self.indexes.values():
+                    ix.flush_pending()
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            for t in self.tables.values():
+                t.pending.clear()
+            for ix in self.indexes.values():
+                ix.pending.clear()
+            self._pending_writes = 0
+            self.commits += 1
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        with self.lock:
+            self.conn.close()
+
+    def register_state(self, name: str, dump: Callable[[], Any], load: Callable[[Any], None],
+                       apply: Callable[[Any], None]) -> None:
+        pass  # 테이블 밖 상태의 스냅숏·저널은 메모리 백엔드 전용
+
+    def log(self, name: str, payload: Any) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.path, "commits": self.commits,
+                "pending_writes": self._pending_writes,
+                "tables": {n: {"pending": len(t.pending), "cache": t.cache.stats()} for n, t in self.tables.items()},
+                "indexes": {n: {"pending": len(ix.pending)} for n, ix in self.indexes.items()}}
+
+
+class ShardLocks:
+    """
+    seu_id 해시로 나눈 샤드별 잠금. 같은 SEU의 복합 쓰기(raw + 인덱스, 메타 + 큐브)를 직렬화한다.
+
+    lock_dir를 주면 샤드마다 잠금 파일에 flock을 걸어 여러 워커 프로세스 사이에서도 배타적이 되고,
+    가장 바깥 잠금을 풀기 직전에 on_release(예: 백엔드 flush)를 호출해 다른 프로세스가 결과를 보게 한다.
+    같은 스레드 안에서는 재진입 가능.
+    """
+
+    def __init__(self, shards: int = 64, lock_dir: Optional[str] = None,
+                 on_release: Optional[Callable[[], None]] = None):
+        self.shards     = shards
+        self.on_release = on_release
+        self.contended  = 0
+        self._locks = [threading.RLock() for _ in range(shards)]
+        self._local = threading.local()
+        self._files = None
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+            self._files = [open(os.path.join(lock_dir, f"shard-{i:03d}.lock"), "a+") for i in range(shards)]
+
+    def shard_of(self, seu_id: str) -> int:
+        return zlib.crc32(seu_id.encode("utf-8")) % self.shards
+
+    def _acquire(self, i: int) -> None:
+        lk = self._locks[i]
+        if not lk.acquire(blocking=False):
+            self.contended += 1
+            lk.acquire()
+        depth = self._local.__dict__.setdefault("depth", [0] * self.shards)
+        if depth[i] == 0 and self._files is not None:
+            import fcntl
+            fcntl.flock(self._files[i].fileno(), fcntl.LOCK_EX)
+        depth[i] += 1
+
+    def _release(self, i: int) -> None:
+        depth = self._local.depth
+        depth[i] -= 1
+        try:
+            if depth[i] == 0 and self._files is not None:
+                import fcntl
+                try:
+                    if self.on_release:
+                        self.on_release()
+                finally:
+                    fcntl.flock(self._files[i].fileno(), fcntl.LOCK_UN)
+        finally:
+            self._locks[i].release()
+
+    @contextmanager
+    def lock(self, seu_id: str) -> Iterator[None]:
+        i = self.shard_of(seu_id)
+        self._acquire(i)
+        try:
+            yield
+        finally:
+            self._release(i)
+
+    @contextmanager
+    def lock_many(self, seu_ids: List[str]) -> Iterator[None]:
+        # 샤드 번호 순으로 잡아 교착을 피한다
+        held = sorted({self.shard_of(s) for s in seu_ids})
+        acquired: List[int] = []
+        try:
+            for i in held:
+                self._acquire(i)
+                acquired.append(i)
+            yield
+        finally:
+            for i in reversed(acquired):
+                self._release(i)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"shards": self.shards, "cross_process": self._files is not None, "contended": self.contended}
+
+
+def hold_exclusive(path: str) -> Optional[Any]:
+    """
+    path 잠금 파일에 기다리지 않고 배타 flock을 건다 → 잠금을 쥔 파일 객체(프로세스가 끝날 때까지 열어 둔다).
+    다른 프로세스가 이미 쥐고 있으면 None.
+    """
+    import fcntl
+    f = open(path, "a+")
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return None
+    return f
+
+
+_BLOB_HASH_RE = re.compile(r"[0-9a-f]{64}")
+
+
+class BlobWriter:
+    """스트리밍 쓰기 — 조각마다 sha256을 갱신하며 임시 파일에 쓰고, commit()에서 내용 주소 경로로 옮긴다."""
+
+    def __init__(self, store: "BlobStore"):
+        self.store  = store
+        self.size   = 0
+        self._hash  = hashlib.sha256()
+        os.makedirs(store.tmp_dir, exist_ok=True)
+        self._path  = os.path.join(store.tmp_dir, f"{os.getpid()}-{threading.get_ident()}-{id(self):x}")
+        self._file  = open(self._path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> Tuple[str, int]:
+        self._file.close()
+        h    = self._hash.hexdigest()
+        dest = self.store.path(h)
+        if os.path.exists(dest):  # 같은 내용이 이미 있음 — 한 번만 저장
+            os.unlink(self._path)
+            self.store.dedup_hits += 1
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(self._path, dest)
+            self.store.writes += 1
+        return h, self.size
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+
+class BlobStore:
+    """
+    sha256 내용 주소 블롭 저장소: root/ab/abcdef... (해시 = 원문 UTF-8 바이트의 sha256 = stable_hash).
+    읽기는 mmap — view()는 파일 페이지를 그대로 가리키는 memoryview를 준다.
+    """
+
+    def __init__(self, root: str):
+        self.root       = root
+        self.tmp_dir    = os.path.join(root, "tmp")
+        self.writes     = 0
+        self.dedup_hits = 0
+        self.removes    = 0
+
+    @staticmethod
+    def valid(h: str) -> bool:
+        return bool(_BLOB_HASH_RE.fullmatch(h))
+
+    def path(self, h: str) -> str:
+        if not self.valid(h):
+            raise ValueError(f"invalid blob hash: {h!r}")
+        return os.path.join(self.root, h[:2], h)
+
+    def __contains__(self, h: object) -> bool:
+        return isinstance(h, str) and self.valid(h) and os.path.exists(self.path(h))
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put(self, data: bytes, chunk_size: int = 1 << 20) -> Tuple[str, int]:
+        w = self.writer()
+        try:
+            mv = memoryview(data)
+            for i in range(0, len(mv), chunk_size):
+                w.write(mv[i:i + chunk_size])
+        except BaseException:
+            w.abort()
+            raise
+        return w.commit()
+
+    def size(self, h: str) -> int:
+        return os.path.getsize(self.path(h))
+
+    def remove(self, h: str) -> int:
+        """블롭 파일을 지우고 회수한 바이트 수를 돌려준다 (없으면 0). 참조 관리는 호출자 몫."""
+        try:
+            n = os.path.getsize(self.path(h))
+            os.unlink(self.path(h))
+        except FileNotFoundError:
+            return 0
+        self.removes += 1
+        return n
+
+    @contextmanager
+    def view(self, h: str) -> Iterator[memoryview]:
+        with open(self.path(h), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:  # 빈 파일은 mmap 불가
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mv = memoryview(mm)
+                try:
+                    yield mv
+                finally:
+                    mv.release()
+
+    def read_text(self, h: str, limit: Optional[int] = None) -> str:
+        # mmap 버퍼에서 바로 디코드 (중간 bytes 복사 없음). limit 바이트로 자르면 잘린 문자는 버린다.
+        # 텍스트가 아닌 페이로드(영상·음성 원본)는 깨진 바이트를 U+FFFD로 바꿔 키워드 추출만 가능하게 한다
+        with self.view(h) as mv:
+            if limit is not None and limit < len(mv):
+                with mv[:limit] as head:
+                    return str(head, "utf-8", "ignore")
+            return str(mv, "utf-8", "replace")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"root": self.root, "writes": self.writes, "dedup_hits": self.dedup_hits, "removes": self.removes}
+
+
+def open_backend(kind: str, path: Optional[str] = None, journal: Optional[Journal] = None,
+                 snapshot_interval: float = 300.0, snapshot_records: int = 250_000, **opts: Any):
+    if kind == "memory":
+        return MemoryBackend(journal, snapshot_interval, snapshot_records)
+    if kind == "sqlite":
+        return SQLiteBackend(path or "pai_store.db", **opts)
+    raise ValueError(f"unknown store backend: {kind}")
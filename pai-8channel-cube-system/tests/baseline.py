@@ -0,0 +1,272 @@
+"""
+최적화 이전 기준 구현 — baseline 커밋 app.py에서 그대로 옮겼다 (골든 테스트의 기대값 생성용, 수정 금지).
+
+- 1단계: 키워드 목록 · score_kw · extract_signal (채널마다 `kw in tl`을 하나씩 검사하던 버전)
+- 4단계: MODES · synthesize_m · _narrative (SEU 하나씩 dict 점수를 계산하던 스칼라 버전, metas는 dict 메타)
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+CHANNELS = ["CH1", "CH2", "CH3", "CH4", "CH5", "CH6", "CH7", "CH8"]
+
+
+# ── 1단계: 원신호 분석 ────────────────────────
+POSITIVE_KW = ["기대","활기","만족","편안","집중","몰입","호기심","즐거움","에너지","가볍",
+               "ready","focus","calm","satisfied","curious","energized","positive","motivated"]
+NEGATIVE_KW = ["긴장","피로","불안","스트레스","부담","어려움","혼란",
+               "tension","stress","fatigue","anxiety","tired","overwhelmed","nervous"]
+HIGH_INTENT_KW = ["완수","달성","목표","핵심","실행","완료","중요","전략",
+                  "achieve","complete","goal","critical","execute","strategy","key","priority"]
+SOCIAL_KW = ["팀","동료","회의","대화","협력","공유","눈인사","반응","함께",
+             "team","colleague","meeting","conversation","collaborate","share","together"]
+RELAX_KW  = ["이완","휴식","편안","가볍","회복","rest","relax","recover","comfortable","calm"]
+TENSE_KW  = ["긴장","바른","유지","집중","upright","tense","maintain","alert","posture"]
+
+def score_kw(text: str, pos: List[str], neg: List[str], default: float = 0.5) -> float:
+    t = text.lower()
+    p = sum(1 for kw in pos if kw in t)
+    n = sum(1 for kw in neg if kw in t)
+    if p + n == 0:
+        return round(min(len(t) / 30.0, 1.0) * 0.3 + default * 0.7, 3)
+    return round(min((p / (p + n)) * 0.6 + 0.4, 1.0), 3)
+
+def extract_signal(ch: str, raw_ref: str) -> Dict[str, Any]:
+    """
+    백서 #06 기준 채널 정의:
+    CH1: Video Frames  CH2: Audio Stream  CH3: Spatial-Temporal
+    CH4: Biometric     CH5: Text Input    CH6: Device Interactions
+    CH7: Metadata      CH8: Environmental Attributes
+    """
+    import re as _re
+    t = raw_ref.strip()
+    tl = t.lower()
+
+    if ch == "CH1":  # Video Frames - 시각 장면 복잡도
+        scene_kw = ["rgb","depth","조명","lighting","화면","screen","창","window","밝","bright","어두","dark","카페","cafe","사무실"]
+        richness = sum(1 for k in scene_kw if k in tl)
+        act = min(0.3 + richness * 0.08 + len(t)/100.0 * 0.3, 1.0)
+        stype = "scene_complex" if richness > 3 else ("scene_moderate" if richness > 1 else "scene_sparse")
+
+    elif ch == "CH2":  # Audio Stream - 음향 분류
+        if any(k in tl for k in ["음악","music","jazz","bgm","melody","재즈"]):
+            act, stype = 0.65, "music"
+        elif any(k in tl for k in ["목소리","voice","발표","speaker","대화","conversation","다수","multiple"]):
+            act, stype = 0.85, "speech_active"
+        elif any(k in tl for k in ["방송","announcement","안내"]):
+            act, stype = 0.55, "broadcast"
+        elif any(k in tl for k in ["조용","quiet","silent","silence","없음","none"]):
+            act, stype = 0.05, "silent"
+        else:
+            db_m = _re.search(r"(\d+)\s*db", tl)
+            if db_m:
+                db = int(db_m.group(1))
+                act = min(db / 100.0, 1.0)
+                stype = "noise_high" if db > 65 else ("noise_moderate" if db > 45 else "noise_low")
+            else:
+                act, stype = 0.40, "ambient"
+
+    elif ch == "CH3":  # Spatial-Temporal - 이동성
+        moving_kw = ["이동","moving","subway","지하철","walking","걷","bus","버스","train","이동 중"]
+        static_kw = ["카페","cafe","사무실","office","자택","home","거실","회의실","meeting room"]
+        if any(k in tl for k in moving_kw):
+            act, stype = 0.80, "mobile"
+        elif any(k in tl for k in static_kw):
+            act, stype = 0.30, "static_indoor"
+        else:
+            gps = _re.search(r"\d+\.\d+\s*,\s*\d+\.\d+", tl)
+            act = 0.60 if gps else 0.40
+            stype = "gps_fixed" if gps else "spatial_general"
+
+    elif ch == "CH4":  # Biometric - 생리적 각성
+        hr_m = _re.search(r"(\d+)\s*bpm", tl)
+        if hr_m:
+            hr = int(hr_m.group(1))
+            if hr < 65:   act, stype = 0.20, "bio_resting"
+            elif hr < 75: act, stype = 0.45, "bio_calm"
+            elif hr < 85: act, stype = 0.70, "bio_focused"
+            else:         act, stype = 0.90, "bio_aroused"
+        else:
+            relax_kw = ["이완","relax","편안","comfortable","무거","heavy"]
+            tense_kw = ["긴장","tense","활발","active","alert","응시"]
+            if any(k in tl for k in relax_kw):   act, stype = 0.20, "bio_relaxed"
+            elif any(k in tl for k in tense_kw): act, stype = 0.75, "bio_alert"
+            else:                                 act, stype = 0.50, "bio_neutral"
+
+    elif ch == "CH5":  # Text Input - 언어 의미 신호
+        if not t or "(none)" in tl or "(없음)" in tl or "(입력 없음)" in tl:
+            act, stype = 0.0, "text_absent"
+        else:
+            act = score_kw(t, HIGH_INTENT_KW, [], 0.5)
+            stype = "text_task" if act > 0.6 else ("text_note" if len(t) > 10 else "text_brief")
+
+    elif ch == "CH6":  # Device Interactions - 상호작용 강도
+        min_m = _re.search(r"(\d+)\s*(분|min)", tl)
+        sec_m = _re.search(r"(\d+)\s*(초|sec\b)", tl)
+        if any(k in tl for k in ["없음","none","터치 없","no touch","idle"]):
+            act, stype = 0.05, "device_idle"
+        elif min_m:
+            mins = int(min_m.group(1))
+            act = min(0.3 + mins/20.0, 1.0)
+            stype = "device_sustained"
+        elif sec_m:
+            secs = int(sec_m.group(1))
+            act = min(0.2 + secs/60.0, 0.8)
+            stype = "device_brief"
+        else:
+            act = min(len(t) / 40.0, 1.0) * 0.5 + 0.2
+            stype = "device_active"
+
+    elif ch == "CH7":  # User Mode / Context — 현재 사용자 상태·모드 (가장 직접적 신호)
+        if any(k in tl for k in ["회복","recovery","휴식","rest","이완 모드","recovery mode","쉬는","쉬고","쉼"]):
+            act, stype = 0.92, "mode_recovery"
+        elif any(k in tl for k in ["학습","study","learn","공부","이해","지식","읽으며","정리 중"]):
+            act, stype = 0.88, "mode_learning"
+        elif any(k in tl for k in ["집중","focus","deep","깊은","몰입","완전 집중"]):
+            act, stype = 0.88, "mode_focus"
+        elif any(k in tl for k in ["회의","meeting","발표","presentation","토론","discussion","논의"]):
+            act, stype = 0.85, "mode_social"
+        elif any(k in tl for k in ["완수","달성","목표","goal","실행","execute","완료","complete","업무 완수","핵심"]):
+            act, stype = 0.85, "mode_task"
+        elif any(k in tl for k in ["출근","commute","이동","transit","준비","prepare","가는","향하는"]):
+            act, stype = 0.72, "mode_transit"
+        else:
+            act = score_kw(t, HIGH_INTENT_KW + POSITIVE_KW, NEGATIVE_KW, 0.5)
+            stype = "mode_general"
+
+    elif ch == "CH8":  # Environmental Attributes - 환경 적합성
+        lux_m  = _re.search(r"(\d+)\s*lux", tl)
+        db_m   = _re.search(r"(\d+)\s*db", tl)
+        temp_m = _re.search(r"(\d+)\s*[°c℃]", tl)
+        score = 0.5
+        if lux_m:
+            lux = int(lux_m.group(1))
+            score += 0.15 if 200 <= lux <= 600 else -0.10
+        if db_m:
+            db = int(db_m.group(1))
+            score += 0.20 if db < 45 else (0.0 if db < 65 else -0.15)
+        if temp_m:
+            temp = int(temp_m.group(1))
+            score += 0.10 if 18 <= temp <= 24 else -0.05
+        act = round(max(0.1, min(score, 1.0)), 3)
+        stype = "env_optimal" if act > 0.7 else ("env_moderate" if act > 0.4 else "env_suboptimal")
+    else:
+        act, stype = 0.50, "unknown"
+
+    return {"activation": round(act, 3), "signal_type": stype, "raw": t}
+
+
+# ── 4단계: M축 합성 (핵심) ───────────────────
+MODES = {
+    "deep_focus":     {"label": "Deep Focus",     "label_ko": "깊은 집중",   "color": "#00E5FF"},
+    "active_social":  {"label": "Active Social",  "label_ko": "사회적 활성", "color": "#76FF03"},
+    "learning":       {"label": "Learning",       "label_ko": "학습 모드",   "color": "#FFD740"},
+    "rest_recovery":  {"label": "Rest & Recovery","label_ko": "휴식·회복",   "color": "#CE93D8"},
+    "task_execution": {"label": "Task Execution", "label_ko": "과제 실행",   "color": "#FF6D00"},
+    "alert_standby":  {"label": "Alert Standby",  "label_ko": "경계 대기",   "color": "#FF4444"},
+    "ambient":        {"label": "Ambient",         "label_ko": "배경 모드",   "color": "#3A5060"},
+}
+
+def synthesize_m(t, c, i, e, metas, raws) -> Dict:
+    act = {ch: metas[ch]["activation"]  for ch in CHANNELS}
+    sig = {ch: metas[ch]["signal_type"] for ch in CHANNELS}
+
+    intent  = i.get("intensity", 0.5)
+    valence = e.get("valence",   0.5)
+    m8      = sig["CH8"]
+    audio   = sig["CH2"]
+    # 환경 조용함 여부 (CH8 환경 + CH2 음성)
+    db_quiet = act["CH8"] > 0.5 or "silent" in audio or "music" in audio
+
+    # CH7 = User Mode (가장 직접적인 사용자 모드 신호)
+    ch7 = sig["CH7"]
+    is_recovery = "recovery" in ch7
+    is_learning  = "learning" in ch7
+    is_focus     = "focus"    in ch7
+    is_social    = "social"   in ch7
+    is_task      = "task"     in ch7
+    is_transit   = "transit"  in ch7
+    ch7_known    = any([is_recovery, is_learning, is_focus, is_social, is_task, is_transit])
+
+    # 백서 #06 기준: CH7(사용자모드)=1차 결정자, 나머지 7채널=보조 신호
+    # CH7이 명확할수록 해당 모드에 압도적 가중치
+    scores: Dict[str, float] = {
+        # 깊은 집중: CH7=focus(1차) + CH4생체각성 + CH6기기지속 + CH5텍스트 + CH3정적
+        "deep_focus":     (0.92 if is_focus else 0.0 if is_recovery else 0.08) * 0.55
+            + act["CH4"]*0.15 + act["CH6"]*0.15 + act["CH5"]*0.10 + (1-act["CH3"])*0.05,
+        # 사회 활성: CH7=social(1차) + CH2음성 + CH6기기
+        "active_social":  (0.92 if is_social else 0.0 if is_recovery else 0.08) * 0.55
+            + (0.85 if "speech" in audio else 0.1)*0.25 + act["CH6"]*0.20,
+        # 학습: CH7=learning(1차) + CH5텍스트 + CH1영상 + CH3정적
+        "learning":       (0.92 if is_learning else 0.0 if is_recovery else 0.08) * 0.55
+            + act["CH5"]*0.20 + act["CH1"]*0.15 + (1-act["CH3"])*0.10,
+        # 휴식·회복: CH7=recovery(1차) + CH4이완 + CH2음악/무음 + CH6비활성
+        "rest_recovery":  (0.92 if is_recovery else 0.0 if ch7_known else 0.08) * 0.55
+            + (1-act["CH4"])*0.20 + (0.85 if "music" in audio or "silent" in audio else 0.1)*0.15 + (1-act["CH6"])*0.10,
+        # 과제 실행: CH7=task(1차) + CH5텍스트 + CH6기기
+        "task_execution": (0.92 if is_task else 0.0 if is_recovery else 0.08) * 0.55
+            + act["CH5"]*0.25 + act["CH6"]*0.20,
+        # 경계 대기: CH4고각성 + CH8환경불량 + CH3이동 (CH7 미지정 시)
+        "alert_standby":  (0.0 if ch7_known else 1.0) * (
+            act["CH4"]*0.40 + (1-act["CH8"])*0.35 + (0.8 if "mobile" in sig["CH3"] else 0.1)*0.25),
+        # 배경: CH7 미지정 + 전체 활성 낮음
+        "ambient":        (0.0 if ch7_known else 1.0) *
+            max(0.0, 0.55 - sum(act.values())/len(act)) * 1.5,
+    }
+
+    best  = max(scores, key=lambda k: scores[k])
+    info  = MODES[best]
+    avg_a = sum(act.values()) / len(act)
+
+    # 한/영 서술 생성
+    narr  = _narrative(best, act, sig, intent, valence)
+
+    return {
+        "status":               "synthesized",
+        "cognitive_mode":       best,
+        "mode_label":           info["label"],
+        "mode_label_ko":        info["label_ko"],
+        "mode_color":           info["color"],
+        "mode_score":           round(scores[best], 3),
+        "mode_scores":          {k: round(v, 3) for k, v in scores.items()},
+        "channel_activations":  {ch: {"activation": act[ch], "signal_type": sig[ch]} for ch in CHANNELS},
+        "narrative":            narr,
+        "source":               "all_8_channels",
+        "synthesis_basis": {
+            "intent_intensity": intent,
+            "emotion_valence":  valence,
+            "social_active":    act["CH6"] > 0.6,
+            "body_state":       sig["CH5"],
+            "audio_type":       audio,
+            "meta_context":     m8,
+            "avg_activation":   round(avg_a, 3),
+        },
+    }
+
+def _narrative(mode, act, sig, intent, valence) -> Dict[str, str]:
+    a = act
+    s = sig
+    T = {
+        "deep_focus":     {
+            "en": f"High intent (CH7={a['CH7']:.2f}) with suppressed social input (CH6={a['CH6']:.2f}) and {s['CH2']} auditory environment. Cognitive resources consolidated for sustained attention.",
+            "ko": f"강한 의도 신호(CH7={a['CH7']:.2f})와 낮은 사회 입력(CH6={a['CH6']:.2f}). 청각={s['CH2']}. 인지 자원이 지속 주의에 집중됨."},
+        "active_social":  {
+            "en": f"Strong social activation (CH6={a['CH6']:.2f}) with {s['CH2']} audio. Positive valence ({valence:.2f}) supports interpersonal engagement.",
+            "ko": f"사회 채널 강활성(CH6={a['CH6']:.2f}), 청각={s['CH2']}. 긍정 감정(valence={valence:.2f})이 대인 상호작용 지지."},
+        "learning":       {
+            "en": f"Meta-context signals {s['CH8']}. Language active (CH3={a['CH3']:.2f}), visual intake (CH1={a['CH1']:.2f}). Knowledge construction in progress.",
+            "ko": f"메타맥락={s['CH8']}. 언어 활성(CH3={a['CH3']:.2f}), 시각 흡수(CH1={a['CH1']:.2f}). 지식 구성 진행 중."},
+        "rest_recovery":  {
+            "en": f"Recovery meta-signal ({s['CH8']}) with body state={s['CH5']}. Intent pressure low ({intent:.2f}). System in restoration mode.",
+            "ko": f"회복 메타신호({s['CH8']}), 신체={s['CH5']}. 의도 압력 낮음({intent:.2f}). 시스템 복원 모드 진입."},
+        "task_execution": {
+            "en": f"High intent (CH7={a['CH7']:.2f}) with strong language output (CH3={a['CH3']:.2f}). Goal-directed behaviour sequence detected.",
+            "ko": f"높은 의도(CH7={a['CH7']:.2f}), 언어 출력(CH3={a['CH3']:.2f}). 목표 지향 행동 시퀀스 감지."},
+        "alert_standby":  {
+            "en": f"Negative valence ({valence:.2f}) with body tension ({s['CH5']}). Low intent ({intent:.2f}) suggests unresolved state.",
+            "ko": f"부정 감정(valence={valence:.2f}), 신체 긴장({s['CH5']}). 낮은 의도({intent:.2f}) — 미해결 상태."},
+        "ambient":        {
+            "en": f"All channels below threshold (avg={sum(act.values())/len(act):.2f}). No dominant mode. Background processing.",
+            "ko": f"전채널 활성 임계 이하(avg={sum(act.values())/len(act):.2f}). 우세 모드 없음. 배경 처리 상태."},
+    }
+    return T.get(mode, {"en": "Unknown mode.", "ko": "알 수 없는 모드."})
@@ -0,0 +1,30 @@
+import os
+import sys
+
+# 모듈은 패키지 없이 서비스 디렉터리에 평평하게 놓여 있다 (uvicorn app:app과 같은 import 경로)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def client():
+    # lifespan(백그라운드 워커·세그먼터)는 띄우지 않는다 — 필요한 테스트가 직접 시작한다
+    from fastapi.testclient import TestClient
+    from app import app
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def register_seu(client):
+    """8채널 raw 등록 함수. texts = {channel_id: raw_ref}로 일부 채널 원문을 바꾸고, fields는 모든 채널 요청에 더한다."""
+    from app import CHANNELS
+
+    def register(seu_id: str, texts=None, **fields) -> None:
+        texts = texts or {}
+        for ch in CHANNELS:
+            body = {"seu_id": seu_id, "channel_id": ch, "ts_start": "2026-10-17T09:00:00",
+                    "ts_end": "2026-10-17T09:01:00", "raw_ref": texts.get(ch, f"{ch} 기본 입력 72 bpm"), **fields}
+            r = client.post("/channel/raw", json=body)
+            assert r.status_code == 200, r.text
+    return register
@@ -0,0 +1,107 @@
+"""
+비동기 빌드 큐 — 대기 중인 같은 seu_id 요청은 한 작업으로 합치고(실행 중인 작업에는 합치지 않는다),
+큐가 차면 QueueFull → POST /cube/build?async=true가 429 + Retry-After로 돌려준다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+import threading
+import time
+
+import pytest
+
+import app as A
+from jobs import BuildQueue, QueueFull
+
+
+class GatedRun:
+    """release()까지 빌드를 붙잡아 두는 run — 작업을 running / queued 상태에 고정한다."""
+
+    def __init__(self):
+        self.gate    = threading.Event()
+        self.started = threading.Event()
+        self.batches: List[List[str]] = []
+
+    def __call__(self, seu_ids: List[str], job_ids: List[str]) -> List[Dict[str, Any]]:
+        self.batches.append(list(seu_ids))
+        self.started.set()
+        assert self.gate.wait(10)
+        return [{"seu_id": s, "status": "cube_written"} for s in seu_ids]
+
+
+def _wait(job, status: str) -> None:
+    deadline = time.time() + 10
+    while job.status != status and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.status == status
+
+
+@pytest.fixture
+def gated():
+    """워커 1개·배치 1 — 첫 작업이 실행 중에 붙잡히면 뒤 작업은 대기열에 남는다. capacity는 인자로."""
+    made = []
+
+    def make(capacity: int = 1):
+        run = GatedRun()
+        q   = BuildQueue(run, capacity=capacity, workers=1, batch=1)
+        made.append((run, q))
+        return run, q
+    yield make
+    for run, q in made:
+        run.gate.set()
+        q.shutdown()
+
+
+def test_pending_duplicates_coalesce(gated):
+    run, q = gated(capacity=4)
+    first = q.submit("a")
+    assert run.started.wait(10)                          # a 실행 중 — 워커가 붙잡혀 있다
+    queued = q.submit("b")
+    assert q.submit("b") is queued and q.submit("b") is queued
+    again = q.submit("a")                                # 실행 중인 작업에는 합치지 않는다
+    assert again is not first and again.seu_id == "a"
+    run.gate.set()
+    for job in (first, queued):
+        _wait(job, "done")
+    assert queued.coalesced == 2 and first.coalesced == 0
+    assert run.batches.count(["b"]) == 1
+    assert q.stats()["coalesced"] == 2
+
+
+def test_full_queue_raises_with_retry_after(gated):
+    run, q = gated()
+    q.submit("a")
+    assert run.started.wait(10)
+    q.submit("b")
+    with pytest.raises(QueueFull) as err:
+        q.submit("c")
+    assert err.value.retry_after >= 1
+    assert q.submit("b").seu_id == "b"                   # 가득 차도 대기 중인 같은 seu_id는 합쳐진다
+    assert q.stats()["rejected"] == 1
+
+
+def test_retry_after_tracks_batch_time():
+    q = BuildQueue(lambda seu_ids, job_ids: [{"status": "cube_written"}] * len(seu_ids),
+                   capacity=10, workers=2, batch=3)
+    q._batch_secs = 1.5
+    q._queue.extend([None] * 7)                          # ceil(7 / (2*3)) = 2 라운드
+    assert q._retry_after() == 3
+
+
+def test_async_build_returns_429_with_retry_after(client, register_seu, gated, monkeypatch):
+    run, q = gated()
+    monkeypatch.setattr(A, "BUILD_QUEUE", q)
+    for seu_id in ("q1", "q2", "q3"):
+        register_seu(seu_id)
+    r1 = client.post("/cube/build?async=true", json={"seu_id": "q1"})
+    assert r1.status_code == 202 and run.started.wait(10)
+    r2 = client.post("/cube/build?async=true", json={"seu_id": "q2"})
+    dup = client.post("/cube/build?async=true", json={"seu_id": "q2"})
+    assert r2.status_code == dup.status_code == 202
+    assert dup.json()["job_id"] == r2.json()["job_id"] and dup.json()["coalesced"] == 1
+    r3 = client.post("/cube/build?async=true", json={"seu_id": "q3"})
+    assert r3.status_code == 429
+    assert int(r3.headers["Retry-After"]) >= 1
+    run.gate.set()
+    _wait(q.get(r2.json()["job_id"]), "done")
+    assert client.get(f"/cube/jobs/{r2.json()['job_id']}").json()["status"] == "done"
@@ -0,0 +1,40 @@
+"""
+큐브 뷰 — summary는 full을 CUBE_SUMMARY_FIELDS로 투영한 것과 같고, 저장본(compact)은 뷰로 내보내지 않으며,
+orjson이 없을 때의 json.dumps 대체 경로도 같은 JSON을 낸다.
+"""
+from __future__ import annotations
+
+import json
+
+import app as A
+
+TEXTS = {"CH1": "심박 95 bpm 긴장", "CH3": "소음 70 dB 카페", "CH5": "목표: 보고서 마감 집중"}
+
+
+def test_summary_has_full_shape(client, register_seu):
+    client.post("/seu", json={"seu_id": "view_a", "device_id": "dev_view", "time": {
+        "ts_start": "2026-10-17T09:00:00", "ts_end": "2026-10-17T09:01:00", "duration_ms": 60000}})
+    register_seu("view_a", TEXTS)
+    built = client.post("/cube/build", json={"seu_id": "view_a"}).json()["cube"]
+    full  = client.get("/cube/view_a").json()
+    assert full == built
+    assert client.get("/cube/view_a", params={"view": "summary"}).json() == A.project(full, A.CUBE_SUMMARY_FIELDS)
+    listed = client.get("/cubes", params={"device_id": "dev_view"}).json()["items"]
+    assert listed == [A.project(full, A.CUBE_SUMMARY_FIELDS)]
+    fields = "m.cognitive_mode,pai.channel_versions,c.evidence_refs"
+    assert client.get("/cube/view_a", params={"fields": fields}).json() == A.project(full, fields.split(","))
+
+
+def test_compact_view_is_not_served(client, register_seu):
+    register_seu("view_b")
+    client.post("/cube/build", json={"seu_id": "view_b"})
+    assert client.get("/cube/view_b", params={"view": "compact"}).status_code == 422
+
+
+def test_json_fallback_matches_orjson(client, register_seu, monkeypatch):
+    register_seu("view_c", TEXTS)
+    client.post("/cube/build", json={"seu_id": "view_c"})
+    with_orjson = client.get("/cube/view_c").content
+    monkeypatch.setattr(A, "orjson", None)
+    fallback = client.get("/cube/view_c").content
+    assert json.loads(fallback) == json.loads(with_orjson)
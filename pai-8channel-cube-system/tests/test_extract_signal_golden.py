@@ -0,0 +1,83 @@
+"""
+extract_signal 골든 출력 — 단일 패스 매처(KeywordMatcher)가 기준 구현(tests/baseline.py, `kw in tl` 검사)과
+모든 채널·텍스트에서 같은 출력을 내는지.
+
+코퍼스는 체크인하지 않고 여기서 결정적으로 만든다 (기대값 = 기준 구현의 출력). 텍스트 종류:
+키워드 하나 / 꼬리·머리가 겹치게 붙인 키워드 쌍·사슬 / 구분자로 이은 키워드 / 구분자 없이 붙인 키워드 /
+붙인 키워드를 임의로 자른 조각 / 대소문자·공백 변형 / 수치(bpm·dB·lux·°C·분·초·GPS)와 섞은 것 / 빈 입력·(none) 표기.
+"""
+from __future__ import annotations
+
+from typing import List
+import inspect
+import random
+import re
+
+import pytest
+
+import baseline
+from app import extract_signal
+
+CHANNELS = [f"CH{i}" for i in range(1, 9)] + ["CH9"]    # CH9 = 미등록 채널
+SEED     = 20261017
+
+EXTRA = ["72 bpm", "88bpm", "60 bpm", "79 BPM", "45 dB", "70db", "30 dB", "400 lux", "900lux", "22°C", "30℃", "15c",
+         "12 min", "5분", "30초", "40 sec", "40 secs", "37.56, 126.97", "(none)", "(없음)", "(입력 없음)",
+         "RGB 카페", "Focus", "DEEP work", "İstanbul", "ÉCOLE", "rested", "keyboard", "restless", "터치 없음"]
+
+
+def keywords() -> List[str]:
+    # extract_signal 안의 채널별 키워드 리터럴 + 모듈 수준 키워드 목록
+    inline = re.findall(r'"([^"]{1,20})"', inspect.getsource(baseline.extract_signal))
+    return sorted(set(inline) | set(baseline.POSITIVE_KW + baseline.NEGATIVE_KW + baseline.HIGH_INTENT_KW
+                                    + baseline.SOCIAL_KW + baseline.RELAX_KW + baseline.TENSE_KW))
+
+
+def overlaps(kws: List[str]) -> List[str]:
+    """
+    꼬리가 다른 키워드의 머리와 겹치게 붙인 쌍과, 그런 쌍 앞에 하나 더 겹쳐 붙인 3단 사슬.
+    예: "없음" + "음악" → "없음악", "터치 없" + "없음악" → "터치 없음악" — 가장 긴 키워드를 먼저 소비하는
+    스캔이 숨은 키워드를 놓치기 쉬운 경우라 무작위로 이어 붙여서는 거의 나오지 않는다.
+    """
+    pairs = sorted({a + b[len(a) - i:] for a in kws for b in kws for i in range(1, len(a))
+                    if a != b and b.startswith(a[i:]) and len(b) > len(a) - i})
+    chains = sorted({a + m[len(a) - i:] for a in kws for m in pairs for i in range(1, len(a))
+                     if m.startswith(a[i:]) and len(m) > len(a) - i})
+    return pairs + chains
+
+
+def texts() -> List[str]:
+    kws = keywords()
+    rng = random.Random(SEED)
+    out: List[str] = ["", "   ", "\t", *kws, *EXTRA, *overlaps(kws)]
+    for _ in range(900):                                  # 구분자로 이은 키워드 + 수치
+        parts = rng.sample(kws, rng.randint(1, 4)) + rng.sample(EXTRA, rng.randint(0, 2))
+        rng.shuffle(parts)
+        out.append(rng.choice([" ", ", ", " · ", "\n"]).join(parts))
+    for _ in range(900):                                  # 구분자 없이 붙인 키워드
+        out.append("".join(rng.choice(kws) for _ in range(rng.randint(2, 5))))
+    for _ in range(900):                                  # 붙인 키워드의 임의 조각 — 키워드 경계가 잘린다
+        s = "".join(rng.choice(kws) for _ in range(rng.randint(2, 6)))
+        i = rng.randint(0, len(s))
+        out.append(s[i:rng.randint(i, len(s))])
+    for _ in range(300):                                  # 대소문자·앞뒤 공백
+        s = " ".join(rng.sample(kws, rng.randint(1, 3)) + rng.sample(EXTRA, 1))
+        out.append(rng.choice([s.upper(), s.title(), f"  {s}  "]))
+    return list(dict.fromkeys(out))
+
+
+@pytest.fixture(scope="module")
+def corpus() -> List[str]:
+    return texts()
+
+
+def test_corpus_has_overlap_cases(corpus: List[str]):
+    assert len(corpus) > 5000
+    assert {"없음악", "터치 없음악"} <= set(corpus)
+
+
+@pytest.mark.parametrize("ch", CHANNELS)
+def test_extract_signal_matches_baseline(ch: str, corpus: List[str]):
+    diffs = [(t, want, got) for t in corpus
+             for want, got in [(baseline.extract_signal(ch, t), extract_signal(ch, t))] if want != got]
+    assert not diffs, f"{len(diffs)} mismatches, first: {diffs[:3]}"
@@ -0,0 +1,63 @@
+"""
+추출기 레지스트리 — process 정책 워커(spawn)가 app.py를 다시 import하지 않는지, timeout이 난 풀을 새 풀로 바꾸는지.
+spawn 워커는 추출기 함수의 모듈(이 파일)을 다시 import하므로 여기서는 app을 import하지 않는다.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+import sys
+import time
+
+import pytest
+
+import signals
+from extractors import ExtractorRegistry
+
+
+def _probe(t: str, tl: str) -> Tuple[float, str]:
+    return 1.0 if "app" in sys.modules else 0.0, ",".join(sorted(m for m in ("app", "storage", "journal")
+                                                                if m in sys.modules)) or "clean"
+
+
+def _sleep(t: str, tl: str) -> Tuple[float, str]:
+    time.sleep(float(t))
+    return 0.99, "slept"
+
+
+@pytest.fixture
+def registry():
+    reg = ExtractorRegistry(signals.SIGNAL_EXTRACTORS, threads=1, processes=1, default_timeout=20.0)
+    yield reg
+    reg.shutdown()
+
+
+def test_builtin_heuristics_pickle_from_side_effect_free_module(registry):
+    registry.load_spec("CH1=@process,CH2=@thread")
+    assert registry.extractors["CH1"].fn.__module__ == "signals"
+    got = registry.run_many([("CH1", "카페 화면 밝음"), ("CH2", "jazz")])
+    assert [r[0] for r in got] == [signals._ex_ch1("카페 화면 밝음", "카페 화면 밝음"), (0.65, "music")]
+    assert all(r[1] is None for r in got)
+
+
+def test_process_worker_does_not_import_app(registry):
+    registry.register("CH1", _probe, "process")
+    ((act, loaded), reason, _), = registry.run_many([("CH1", "")])
+    assert reason is None and (act, loaded) == (0.0, "clean")
+
+
+@pytest.mark.parametrize("policy", ["process", "thread"])
+def test_timed_out_pool_is_replaced(registry, policy):
+    registry.register("CH1", _sleep, policy, timeout=0.3)
+    registry.warm()
+    pool  = registry._pool(policy)
+    procs = list((getattr(pool, "_processes", None) or {}).values())
+    ((_, stype), reason, _), = registry.run_many([("CH1", "3")])
+    assert (stype, reason) == ("scene_sparse", "timeout")
+    assert registry.recycled[policy] == 1 and registry._pool(policy) is not pool
+    for proc in procs:
+        proc.join(5)
+        assert not proc.is_alive()
+    # 풀 크기 1 — 멈춘 작업이 슬롯을 쥐고 있었다면 이 작업도 timeout
+    (res, reason, _), = registry.run_many([("CH1", "0")])
+    assert (res, reason) == ((0.99, "slept"), None)
+    assert registry.stats()["pools_recycled"][policy] == 1
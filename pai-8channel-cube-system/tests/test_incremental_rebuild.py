@@ -0,0 +1,29 @@
+"""
+증분 재빌드 — raw가 바뀌었는지는 서버가 읽는 raw_ref로 판단한다 (클라이언트 raw_hash가 그대로여도).
+"""
+from __future__ import annotations
+
+import app as A
+
+
+def test_edit_with_unchanged_hash_recomputes_meta(client, register_seu):
+    register_seu("inc_a", {"CH5": "짧은 메모"}, raw_hash="client-hash")
+    assert client.post("/cube/build", json={"seu_id": "inc_a"}).json()["recomputed"]["channels"] == A.CHANNELS
+    assert A.META_STORE[A.key("inc_a", "CH5")].signal_type == "text_brief"
+
+    r = client.post("/channel/raw", json={"seu_id": "inc_a", "channel_id": "CH5", "ts_start": "2026-10-17T09:00:00",
+                                          "ts_end": "2026-10-17T09:01:00", "raw_hash": "client-hash",
+                                          "raw_ref": "핵심 목표 달성을 위한 전략 실행"})
+    assert r.status_code == 200
+    assert A.get_raw("inc_a", "CH5").version == 2
+    out = client.post("/cube/build", json={"seu_id": "inc_a"}).json()
+    assert out["recomputed"]["channels"] == ["CH5"]
+    assert A.META_STORE[A.key("inc_a", "CH5")].signal_type == "text_task"
+
+
+def test_unchanged_raw_recomputes_nothing(client, register_seu):
+    register_seu("inc_b")
+    client.post("/cube/build", json={"seu_id": "inc_b"})
+    register_seu("inc_b")
+    assert A.get_raw("inc_b", "CH1").version == 1
+    assert client.post("/cube/build", json={"seu_id": "inc_b"}).json()["recomputed"]["channels"] == []
@@ -0,0 +1,28 @@
+"""
+signal·메타 메모 키 — 클라이언트가 보낸 raw_hash가 같아도 raw_ref(서버가 읽는 원문)가 다르면 다른 SEU의 결과를 돌려주지 않는다.
+"""
+from __future__ import annotations
+
+import app as A
+
+
+def test_same_client_hash_does_not_share_signal(client, register_seu):
+    register_seu("memo_a", {"CH5": "비밀 A: 목표 달성 전략"}, raw_hash="same-hash")
+    register_seu("memo_b", {"CH5": "다른 SEU 메모"}, raw_hash="same-hash")
+    for seu_id in ("memo_a", "memo_b"):
+        assert client.post("/cube/build", json={"seu_id": seu_id}).status_code == 200
+    feat = A.FEATURE_STORE[A.key("memo_b", "CH5")]
+    meta = A.META_STORE[A.key("memo_b", "CH5")]
+    assert feat["signal"]["raw"] == "다른 SEU 메모"
+    assert meta.raw_ref == "다른 SEU 메모"
+    assert A.META_STORE[A.key("memo_a", "CH5")].signal_type == "text_task"
+    assert meta.signal_type != "text_task"
+
+
+def test_identical_payload_hits_memo(client, register_seu):
+    register_seu("memo_c", {"CH5": "공유되는 같은 원문"})
+    client.post("/cube/build", json={"seu_id": "memo_c"})
+    hits = A.SIGNAL_MEMO.hits
+    register_seu("memo_d", {"CH5": "공유되는 같은 원문"})
+    client.post("/cube/build", json={"seu_id": "memo_d"})
+    assert A.SIGNAL_MEMO.hits >= hits + len(A.CHANNELS)
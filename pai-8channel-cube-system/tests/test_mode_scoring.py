@@ -0,0 +1,47 @@
+"""
+M축 모드 점수 — 배치(score_modes, NumPy)와 단일 SEU(_score_one) 경로가 기준 스칼라 구현(tests/baseline.py)과
+SEU마다 같은 결과(모드·점수·서술)인지. 벤치 생성기 SEU 6000개에는 1e-9 안쪽 근소 동점이 여럿 들어 있다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+import baseline
+import bench
+from app import score_modes, synthesize_m, synthesize_m_batch
+
+N_SEUS = 6000
+
+
+@pytest.fixture(scope="module")
+def prepared() -> List[Dict[str, Any]]:
+    return bench._prepare(bench.gen_seus(N_SEUS))
+
+
+@pytest.fixture(scope="module")
+def expected(prepared: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [baseline.synthesize_m(None, None, p["i"], p["e"], {ch: m.to_dict() for ch, m in p["metas"].items()},
+                                  p["raws"]) for p in prepared]
+
+
+def test_corpus_has_near_ties(prepared: List[Dict[str, Any]]):
+    # 1·2위 점수 차가 0보다 크고 1e-9 이하인 SEU — 반올림한 뒤 고르면 모드가 갈리는 경우
+    top = np.sort(score_modes([p["metas"] for p in prepared])["scores"], axis=1)[:, -2:]
+    gap = top[:, 1] - top[:, 0]
+    assert ((gap > 0) & (gap <= 1e-9)).sum() >= 2
+
+
+def test_batch_matches_scalar(prepared: List[Dict[str, Any]], expected: List[Dict[str, Any]]):
+    got   = synthesize_m_batch([p["metas"] for p in prepared], [p["i"] for p in prepared], [p["e"] for p in prepared])
+    diffs = [(n, want["cognitive_mode"], g["cognitive_mode"]) for n, (want, g) in enumerate(zip(expected, got))
+             if want != g]
+    assert not diffs, f"{len(diffs)} mismatches, first: {diffs[:5]}"
+
+
+def test_single_matches_scalar(prepared: List[Dict[str, Any]], expected: List[Dict[str, Any]]):
+    diffs = [(n, want["cognitive_mode"], g["cognitive_mode"]) for n, (p, want) in enumerate(zip(prepared, expected))
+             for g in [synthesize_m(None, None, p["i"], p["e"], p["metas"], p["raws"])] if want != g]
+    assert not diffs, f"{len(diffs)} mismatches, first: {diffs[:5]}"
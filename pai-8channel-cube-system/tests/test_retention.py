@@ -0,0 +1,83 @@
+"""
+보존 정책 축출 — 만기 순서(ttl은 최초 기록 순, max_seus는 오래된 것부터), keep_cube 뒤에도 남은 큐브를
+DELETE /seu/{seu_id}로 지울 수 있는지, 축출한 raw의 signal·메타 메모가 비워지는지.
+"""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+import app as A
+
+
+@pytest.fixture
+def policies():
+    A.RETENTION.register("t_ttl", ttl=60)
+    A.RETENTION.register("t_keep", ttl=60, keep_cube=True)
+    A.RETENTION.register("t_cap", max_seus=2)
+    yield
+    for name in ("t_ttl", "t_keep", "t_cap"):
+        A.RETENTION.policies.pop(name, None)
+
+
+def _memo_keys(seu_id: str):
+    raws = [A.RAW_STORE[r] for r in A.SEU_RECORDS[seu_id]["raw_ids"]]
+    return ([A._signal_memo_key(r) for r in raws],
+            [A._meta_memo_key(r.channel_id, r.raw_ref, r.raw_hash) for r in raws])
+
+
+def test_ttl_evicts_in_first_record_order(client, register_seu, policies):
+    for seu_id in ("ttl_1", "ttl_2", "ttl_3"):
+        register_seu(seu_id, retention_policy_id="t_ttl")
+        time.sleep(0.01)
+    due = A.SEU_RECORDS["ttl_1"]["at"] + 60
+    assert A.RETENTION.sweep(now=due, budget=10) == 1    # ttl_2·ttl_3은 아직 기한 전
+    assert "ttl_1" not in A.SEU_RECORDS and {"ttl_2", "ttl_3"} <= set(A.SEU_RECORDS)
+    assert A.RETENTION.sweep(now=due + 3600, budget=1) == 1
+    assert "ttl_2" not in A.SEU_RECORDS and "ttl_3" in A.SEU_RECORDS
+    assert A.RETENTION.sweep(now=due + 3600) == 1 and "ttl_3" not in A.SEU_RECORDS
+
+
+def test_max_seus_evicts_oldest_first(client, register_seu, policies):
+    for seu_id in ("cap_1", "cap_2", "cap_3", "cap_4"):
+        register_seu(seu_id, retention_policy_id="t_cap")
+    assert A.RETENTION.sweep(now=time.time()) == 2
+    assert {"cap_1", "cap_2"}.isdisjoint(A.SEU_RECORDS) and {"cap_3", "cap_4"} <= set(A.SEU_RECORDS)
+
+
+def test_kept_cube_can_be_deleted(client, register_seu, policies):
+    register_seu("keep_1", {"CH5": "보존 테스트 원문 keep_1"}, retention_policy_id="t_keep")
+    assert client.post("/cube/build", json={"seu_id": "keep_1"}).status_code == 200
+    signal_keys, meta_keys = _memo_keys("keep_1")
+    assert all(k in A.SIGNAL_MEMO for k in signal_keys) and all(k in A.META_MEMO for k in meta_keys)
+
+    assert A.RETENTION.sweep(now=time.time() + 120) >= 1
+    assert A.SEU_RECORDS["keep_1"]["evicted"] and not A.SEU_RECORDS["keep_1"]["raw_ids"]
+    assert not any(k in A.SIGNAL_MEMO for k in signal_keys) and not any(k in A.META_MEMO for k in meta_keys)
+    assert client.get("/cube/keep_1").status_code == 200
+
+    r = client.delete("/seu/keep_1")
+    assert r.status_code == 200 and r.json()["reclaimed_bytes"]["cube"] > 0
+    assert client.get("/cube/keep_1").status_code == 404
+    assert "keep_1" not in A.SEU_RECORDS
+    assert client.delete("/seu/keep_1").status_code == 404
+
+
+def test_new_raw_after_keep_cube_is_tracked_again(client, register_seu, policies):
+    register_seu("keep_2", retention_policy_id="t_keep")
+    client.post("/cube/build", json={"seu_id": "keep_2"})
+    assert client.delete("/seu/keep_2", params={"keep_cube": True}).status_code == 200
+    assert A.SEU_RECORDS["keep_2"]["evicted"]
+    register_seu("keep_2", retention_policy_id="t_keep")
+    rec = A.SEU_RECORDS["keep_2"]
+    assert not rec.get("evicted") and len(rec["raw_ids"]) == len(A.CHANNELS)
+    assert A.RETENTION._entries["keep_2"][2] == rec["gen"]
+
+
+def test_cube_without_record_can_be_deleted(client, register_seu):
+    register_seu("orphan_1")
+    client.post("/cube/build", json={"seu_id": "orphan_1"})
+    del A.SEU_RECORDS["orphan_1"]                        # 묘비 이전에 keep_cube로 축출된 SEU
+    assert client.delete("/seu/orphan_1").status_code == 200
+    assert client.get("/cube/orphan_1").status_code == 404
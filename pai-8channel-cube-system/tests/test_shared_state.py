@@ -0,0 +1,59 @@
+"""
+공유 상태 모드(PAI_SHARED_STATE_DIR) — 프로세스별 상태를 쓰는 기능은 단일 워커 모드에서만 켜지고, 단일 워커는 잠금 파일로 강제된다.
+환경 변수는 import 시점에 읽히므로 각 경우를 별도 프로세스로 띄운다.
+"""
+from __future__ import annotations
+
+from typing import Dict
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time, warnings
+warnings.filterwarnings("ignore")
+from fastapi.testclient import TestClient
+import app as A
+try:
+    with TestClient(A.app) as c:
+        codes = [c.post("/cube/build?async=true", json={"seu_id": "x"}).status_code,
+                 c.post("/stream/frames", json={"frames": []}).status_code]
+        print("started", *codes, flush=True)
+        time.sleep(float(sys.argv[1]))
+except RuntimeError as err:
+    print("refused", err, flush=True)
+"""
+
+
+def _env(state_dir: str, **extra: str) -> Dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("PAI_")}
+    return {**env, "PAI_SHARED_STATE_DIR": state_dir, **extra}
+
+
+def _probe(env: Dict[str, str], hold: float = 0.0) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", PROBE, str(hold)], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+
+def test_per_process_features_disabled_with_several_workers(tmp_path):
+    out, _ = _probe(_env(str(tmp_path))).communicate(timeout=60)
+    assert out.split() == ["started", "409", "409"]
+
+
+def test_bounded_retention_refuses_to_start(tmp_path):
+    out, _ = _probe(_env(str(tmp_path), PAI_RETENTION_POLICIES="short=ttl:60")).communicate(timeout=60)
+    assert out.startswith("refused")
+
+
+def test_single_worker_is_enforced(tmp_path):
+    env   = _env(str(tmp_path), PAI_SHARED_SINGLE_WORKER="1")
+    first = _probe(env, hold=20)
+    try:
+        assert first.stdout.readline().split() == ["started", "400", "200"]   # 비동기 빌드·스트림 사용 가능
+        out, _ = _probe(env).communicate(timeout=60)
+        assert out.startswith("refused") and "single-worker.lock" in out
+    finally:
+        first.kill()
+        first.communicate()
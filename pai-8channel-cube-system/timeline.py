@@ -0,0 +1,115 @@
+"""
+디바이스별 인지 모드 타임라인 롤업.
+
+큐브가 하나 기록될 때마다 디바이스 상태를 O(1)로 갱신한다 (윈도 크기·모드 수는 상수):
+- EWMA      : 채널 활성도·mode_scores의 지수 감쇠 평균 (alpha)
+- 슬라이딩 윈도 : 최근 window개 큐브 (조회 시 평균·모드 분포 계산)
+- 우세 모드   : EWMA mode_scores 최댓값 — 바뀌면 전이 횟수·체류 시간을 기록하고 transition을 돌려준다
+
+상태는 JSON으로 직렬화 가능한 dict라 저장소 테이블에 그대로 넣는다. 가장 최근 SEU가 다시 빌드되면
+직전 상태(prev)에서 다시 접어 넣어 중복 집계를 피한다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TimelineRollup:
+
+    def __init__(self, channels: List[str], modes: List[str], window: int = 20, alpha: float = 0.3):
+        self.channels = list(channels)
+        self.modes    = list(modes)
+        self.window   = window
+        self.alpha    = alpha
+
+    def new_state(self, device_id: str) -> Dict[str, Any]:
+        return {"device_id": device_id, "count": 0, "first_ts": None, "last_ts": None, "last_seu_id": None,
+                "mode": None, "since": None, "run_ms": 0, "dwell_ms": {}, "transitions": {},
+                "mode_counts": {}, "ewma": None, "window": [], "prev": None}
+
+    @staticmethod
+    def _copy(state: Dict[str, Any]) -> Dict[str, Any]:
+        # 중첩이 얕고 크기가 모드 수·윈도 크기로 묶여 있어 수동 복사로 충분
+        out = dict(state)
+        out["dwell_ms"]    = dict(state["dwell_ms"])
+        out["transitions"] = {a: dict(b) for a, b in state["transitions"].items()}
+        out["mode_counts"] = dict(state["mode_counts"])
+        out["window"]      = list(state["window"])
+        out["prev"]        = None
+        return out
+
+    def fold(self, state: Optional[Dict[str, Any]], device_id: str, seu_id: str, ts: str, duration_ms: int,
+             mode: str, activation: List[float], mode_scores: List[float],
+             replaced: bool = False) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        큐브 하나를 접어 넣은 새 상태와 우세 모드 전이(없으면 None)를 돌려준다.
+        replaced=True(이미 집계된 SEU의 재빌드)면 가장 최근 SEU일 때만 직전 상태에서 다시 계산하고, 아니면 무시.
+        """
+        if state is not None and replaced:
+            if state["last_seu_id"] != seu_id:
+                return state, None
+            state = state["prev"]
+        base = state if state is not None else self.new_state(device_id)
+        s = self._copy(base)
+
+        a = self.alpha
+        if s["ewma"] is None:
+            s["ewma"] = {"activation": list(activation), "mode_scores": list(mode_scores)}
+        else:
+            s["ewma"] = {"activation":  [a * x + (1 - a) * e for x, e in zip(activation, s["ewma"]["activation"])],
+                         "mode_scores": [a * x + (1 - a) * e for x, e in zip(mode_scores, s["ewma"]["mode_scores"])]}
+        s["window"].append([mode, list(activation), list(mode_scores)])
+        if len(s["window"]) > self.window:
+            del s["window"][0]
+        s["mode_counts"][mode] = s["mode_counts"].get(mode, 0) + 1
+
+        ew = s["ewma"]["mode_scores"]
+        dominant   = self.modes[max(range(len(ew)), key=ew.__getitem__)]
+        transition = None
+        if s["mode"] is not None and dominant != s["mode"]:
+            row = s["transitions"].setdefault(s["mode"], {})
+            row[dominant] = row.get(dominant, 0) + 1
+            transition = {"device_id": device_id, "seu_id": seu_id, "from": s["mode"], "to": dominant,
+                          "ts": ts, "previous_since": s["since"], "previous_run_ms": s["run_ms"]}
+        if dominant != s["mode"]:
+            s["mode"], s["since"], s["run_ms"] = dominant, ts, 0
+        s["run_ms"] += duration_ms
+        s["dwell_ms"][dominant] = s["dwell_ms"].get(dominant, 0) + duration_ms
+
+        s["count"]      += 1
+        s["first_ts"]    = s["first_ts"] or ts
+        s["last_ts"]     = ts
+        s["last_seu_id"] = seu_id
+        s["prev"]        = {**base, "prev": None} if base["count"] else None
+        return s, transition
+
+    def view(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        win = state["window"]
+        n   = len(win)
+        win_modes: Dict[str, int] = {}
+        for m, _, _ in win:
+            win_modes[m] = win_modes.get(m, 0) + 1
+        mean = lambda col, names: {k: round(sum(w[col][j] for w in win) / n, 3) for j, k in enumerate(names)}
+        ew = state["ewma"]
+        return {
+            "device_id":  state["device_id"],
+            "cubes":      state["count"],
+            "first_ts":   state["first_ts"],
+            "last_ts":    state["last_ts"],
+            "dominant":   {"mode": state["mode"], "since": state["since"], "run_ms": state["run_ms"]},
+            "dwell_ms":    state["dwell_ms"],
+            "transitions": state["transitions"],
+            "mode_counts": state["mode_counts"],
+            "ewma": {
+                "alpha":       self.alpha,
+                "activation":  {ch: round(v, 3) for ch, v in zip(self.channels, ew["activation"])} if ew else {},
+                "mode_scores": {m: round(v, 3) for m, v in zip(self.modes, ew["mode_scores"])} if ew else {},
+            },
+            "window": {
+                "size":        self.window,
+                "cubes":       n,
+                "mode_counts": win_modes,
+                "activation":  mean(1, self.channels) if n else {},
+                "mode_scores": mean(2, self.modes) if n else {},
+            },
+        }